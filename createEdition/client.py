@@ -0,0 +1,93 @@
+"""
+    에디션 생성 데몬 client
+
+    main.py 와 같은 -k / -v / -i / -o 파라미터를 데몬에 job으로 전달하고 완료될 때까지 기다린다.
+    빠르게 실행되도록 표준 라이브러리만 사용한다. (requests, PIL 등 import 없음)
+
+    $ python3 client.py -k edition=eth totalSupply=20 title=데몬테스트 -v
+    $ python3 client.py --socket /tmp/create-nft.sock -k edition=btc krw=1000 pay=bank
+    $ python3 client.py --timeout 120 -k edition=eth
+"""
+import argparse
+import http.client
+import json
+import socket
+import sys
+import time
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    Unix socket으로 연결하는 HTTP connection
+    """
+    def __init__(self, socket_path, timeout=30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def call(args, method, path, body=None):
+    """
+    데몬 API 호출
+
+    :param args: client 파라미터
+    :param method: HTTP method
+    :param path: 요청 경로
+    :param body: 요청 dict
+    :return: (status code, 응답 dict)
+    """
+    if args.socket:
+        conn = UnixHTTPConnection(args.socket)
+    else:
+        conn = http.client.HTTPConnection(args.host, args.port, timeout=30)
+    encoded = json.dumps(body, ensure_ascii=False).encode("utf-8") if body else None
+    conn.request(method, path, body=encoded, headers={"content-type": "application/json"})
+    response = conn.getresponse()
+    result = response.status, json.loads(response.read().decode("utf-8"))
+    conn.close()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-k", nargs="*", default=[], help="key=value edition parameters")
+    parser.add_argument("-v", help="add video option", action="store_true")
+    parser.add_argument("-i", help="add intalk only option", action="store_true")
+    parser.add_argument("-o", help="add offline option", action="store_true")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="daemon unix socket path")
+    parser.add_argument("--no-wait", help="return right after submit", action="store_true")
+    parser.add_argument(
+        "--timeout", help="seconds to wait for the job to finish", type=float, default=600
+    )
+    client_args = parser.parse_args()
+
+    job = dict(
+        k=dict(value.split("=", 1) for value in client_args.k),
+        v=client_args.v,
+        i=client_args.i,
+        o=client_args.o,
+    )
+    status, state = call(client_args, "POST", "/jobs", job)
+    if status != 202:
+        sys.exit(f"job 등록에 실패했습니다: {state.get('message')}")
+    print(f"job {state['id']} 등록 완료")
+
+    deadline = time.monotonic() + client_args.timeout
+    while not client_args.no_wait and state["status"] in ("queued", "running"):
+        if time.monotonic() > deadline:
+            sys.exit(
+                f"job {state['id']}이 {client_args.timeout:g}초 안에 끝나지 않았습니다. "
+                f"(상태: {state['status']})"
+            )
+        time.sleep(0.2)
+        _, state = call(client_args, "GET", f"/jobs/{state['id']}")
+    if state["status"] == "done":
+        print(f"생성된 에디션 링크는 다음과 같습니다.: {state['url']} ({state['elapsed']}s)")
+    elif state["status"] == "failed":
+        sys.exit(f"에디션 생성에 실패했습니다: {state['error']}")
@@ -0,0 +1,28 @@
+"""
+    에디션 생성 데몬 실행
+
+    HTTP 세션, 작가 조회 결과, 이미지/영상 데이터, static.json, shortener를 유지한 채로
+    로컬 API(TCP 또는 Unix socket)로 생성 요청을 받아 처리한다. 요청은 client.py 로 보낸다.
+    공통 옵션(--backoffice, --compress 등)은 main.py 와 동일하게 입력한다.
+
+    $ python3 daemon.py --port 8765 --backoffice http://127.0.0.1:8090/
+    $ python3 daemon.py --socket /tmp/create-nft.sock --warm-video
+"""
+import argparse
+
+from lib.creator_daemon import CreatorDaemon, serve
+from lib.metadata_handler import MetadataHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", help="daemon bind address", default="127.0.0.1")
+    parser.add_argument("--port", help="daemon bind port", type=int, default=8765)
+    parser.add_argument("--socket", help="unix socket path (instead of tcp)")
+    parser.add_argument("--out", help="daemon output directory", default="daemon")
+    parser.add_argument("--warm-video", help="pre-download video set", action="store_true")
+    daemon_args, common_argv = parser.parse_known_args()
+
+    daemon = CreatorDaemon(MetadataHandler.parsing(common_argv), daemon_args.out)
+    daemon.warm_up(video=daemon_args.warm_video)
+    serve(daemon, daemon_args.host, daemon_args.port, daemon_args.socket)
@@ -0,0 +1,46 @@
+"""
+    예약 에디션 LIVE 변경
+
+    --draft-only 옵션으로 DRAFT 상태까지만 생성해서 예약 파일에 등록한 에디션들을 목표 시각에 한꺼번에 LIVE로 변경한다.
+    동시 요청 수(--workers)만큼 커넥션을 미리 연결해두고 목표 시각에 동시에 요청하며, 실패 시 --retries 만큼 재시도한다.
+    첫 번째 ~ 마지막 LIVE 변경 간격 및 목표 시각 대비 지연을 리포트한다.
+    --record / --replay 옵션은 main.py 와 같으며, 커넥션 미리 연결 및 LIVE 변경 요청을 기록/재생한다.
+
+    $ python3 main.py -k edition=eth future=2026-11-01 --draft-only
+    $ python3 golive.py --list
+    $ python3 golive.py --at "2026-11-01 00:00:00" --workers 32 --backoffice http://127.0.0.1:8090/
+"""
+import argparse
+import functools
+import json
+
+from lib.http_cassette import add_cassette_arguments, cassette_session
+from lib.live_scheduler import LiveSchedule, LiveScheduler, parse_utc
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--schedule", help="go-live schedule file path",
+                        default="golive_schedule.jsonl")
+    parser.add_argument("--at",
+                        help="target time in UTC (%%Y-%%m-%%d %%H:%%M:%%S), default openAt")
+    parser.add_argument("--workers", help="concurrent status requests", type=int, default=16)
+    parser.add_argument("--retries", help="retries per edition", type=int, default=3)
+    parser.add_argument("--backoffice",
+                        help="backoffice admin API base url (ex. local mock server)")
+    parser.add_argument("--report", help="report json file path", default="golive_report.json")
+    parser.add_argument("--list", help="print pending editions only", action="store_true")
+    add_cassette_arguments(parser)
+    golive_args = parser.parse_args()
+
+    schedule = LiveSchedule(golive_args.schedule)
+    if golive_args.list:
+        for entry in schedule.pending:
+            print(f"- {entry['edition']} {entry['nftid']} (openAt {entry['openAt']})")
+    else:
+        results, report = LiveScheduler(
+            schedule, golive_args.backoffice, golive_args.workers, golive_args.retries,
+            session_factory=functools.partial(cassette_session, golive_args),
+        ).run(parse_utc(golive_args.at) if golive_args.at else None)
+        with open(golive_args.report, "w", encoding="utf-8") as file:
+            json.dump(dict(report=report, results=results), file, ensure_ascii=False, indent=2)
@@ -0,0 +1,33 @@
+"""
+    메타데이터 json 직렬화 벤치마크
+
+    에디션 하나의 생성 요청 바디를 만드는 시간을 이전 방식, 표준 json, 설치된 백엔드(orjson, msgspec)별로 측정한다.
+    --payload 를 입력하지 않으면 static.json 과 임의 이미지/영상으로 만든 메타데이터를 사용한다.
+
+    $ python3 json_bench.py --repeat 30
+    $ python3 json_bench.py --image-kb 4000 --video-kb 20000
+    $ python3 json_bench.py --payload senddata.json
+"""
+import argparse
+import json
+
+from lib.encode_benchmark import print_results, run_benchmark, sample_payload, share_static
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payload", help="metadata json file to encode (default: sample payload)")
+    parser.add_argument("--static", help="static.json path", default="static.json")
+    parser.add_argument("--image-kb", help="sample hi-res image size in KB", type=int, default=1500)
+    parser.add_argument("--video-kb", help="sample hi-res video size in KB", type=int, default=0)
+    parser.add_argument("--repeat", help="encodes per method", type=int, default=20)
+    bench_args = parser.parse_args()
+
+    with open(bench_args.static, "r", encoding="utf-8") as static_file:
+        static = json.load(static_file)
+    if bench_args.payload:
+        with open(bench_args.payload, "r", encoding="utf-8") as payload_file:
+            data = share_static(json.load(payload_file), static)
+    else:
+        data = sample_payload(static, bench_args.image_kb, bench_args.video_kb)
+    print_results(run_benchmark(data, static, bench_args.repeat))
@@ -0,0 +1,175 @@
+"""
+조합 테스트 매트릭스 모듈
+
+에디션 유형 x 금액 x 결제 수단 x 옵션 flag 등 축(axis) 정의를 입력받아 카테시안 곱으로 조합을 펼친 뒤,
+main.py 와 같은 -k 파라미터 검사(check_edition_kwargs)로 유효하지 않은 조합은 제외하고 실행한다.
+작가 조회, 이미지/영상 다운로드, static.json 로드는 매트릭스 전체에서 한 번씩만 수행한다.
+
+축 정의 파일 예시 (matrix_axes.json 참고)
+{
+    "base": {"totalSupply": 20},
+    "axes": {
+        "edition": ["eth", "btc", "auction"],
+        "price": [{}, {"coin": 1, "krw": 1000}, {"krw": 1000}],
+        "pay": [null, "coinmobile", "coinbank", "mobile", "bank"],
+        "v": [false, true]
+    }
+}
+- v, i, o 축은 flag 옵션 (-v, -i, -o)
+- 값이 dict이면 -k 파라미터에 그대로 합쳐지고, null이면 해당 축 파라미터를 입력하지 않은 것으로 본다.
+"""
+import argparse
+import itertools
+import json
+import os
+
+from lib.edition_runner import EditionRunner
+from lib.metadata_handler import check_edition_kwargs, is_airdrop
+from lib.shared_resources import SharedResources
+
+# 토글 flag로 처리되는 축
+FLAG_AXES = ("v", "i", "o")
+
+
+def build_cell(base, axis_values):
+    """
+    축별 값 하나씩을 모아 -k 파라미터와 flag 조합으로 변환
+    커맨드라인 입력과 동일하게 -k 파라미터 값은 모두 문자열로 변환한다.
+
+    :param base: 모든 조합에 공통으로 들어가는 -k 파라미터
+    :param axis_values: (축 이름, 값) 리스트
+    :return: (-k 파라미터 dict, flag dict)
+    """
+    kwargs = {key: str(value) for key, value in base.items()}
+    flags = {flag: False for flag in FLAG_AXES}
+    for axis, value in axis_values:
+        if axis in FLAG_AXES:
+            flags[axis] = bool(value)
+        elif isinstance(value, dict):
+            kwargs.update({key: str(val) for key, val in value.items()})
+        elif value is not None:
+            kwargs[axis] = str(value)
+    return kwargs, flags
+
+
+def check_combination(kwargs, flags):
+    """
+    매트릭스 조합 유효성 검사
+
+    - -k 파라미터는 main.py 와 같은 규칙으로 검사 (check_edition_kwargs)
+    - 인톡 only(-i) 옵션은 에어드롭 QR 생성에만 영향이 있으므로 그 외 조합에서는 중복 조합으로 제외
+
+    :param kwargs: -k 파라미터 dict
+    :param flags: flag dict
+    :return: 제외 사유, 유효한 조합이면 None
+    """
+    reason = check_edition_kwargs(kwargs)
+    if reason:
+        return reason
+    if flags["i"] and not is_airdrop(kwargs):
+        return "인톡 only 옵션은 에어드롭에서만 의미 있음"
+    return None
+
+
+def expand_matrix(definition):
+    """
+    축 정의를 카테시안 곱으로 펼친 뒤 유효한 조합만 중복 없이 리턴
+
+    :param definition: {"base": {...}, "axes": {축 이름: [값, ...]}}
+    :return: (유효한 조합 리스트, 제외된 조합 리스트)
+    """
+    base = definition.get("base", {})
+    axes = definition["axes"]
+    cells, skipped, seen = [], [], set()
+    for values in itertools.product(*axes.values()):
+        kwargs, flags = build_cell(base, zip(axes.keys(), values))
+        key = (tuple(sorted(kwargs.items())), tuple(sorted(flags.items())))
+        if key in seen:
+            continue
+        seen.add(key)
+        reason = check_combination(kwargs, flags)
+        if reason:
+            skipped.append(dict(k=kwargs, flags=flags, reason=reason))
+        else:
+            cells.append(dict(k=kwargs, flags=flags))
+    return cells, skipped
+
+
+class MatrixRunner:
+    """
+    펼쳐진 조합을 순서대로 생성하는 클래스
+    조합마다 개별 저널/메타데이터 파일을 가지므로 --resume 으로 실패한 조합부터 이어서 실행할 수 있다.
+    """
+    def __init__(self, base_args, cells, out_dir="matrix"):
+        """
+        :param base_args: 공통 파라미터 (--backoffice, --compress 등, MetadataHandler.parsing 결과)
+        :param cells: expand_matrix 로 펼친 유효한 조합 리스트
+        :param out_dir: 조합별 저널, 메타데이터 json, 리포트 저장 폴더
+        """
+        self.base_args = base_args
+        self.cells = cells
+        self.out_dir = out_dir
+        self.shared = SharedResources.from_args(base_args, os.path.join(out_dir, "media_cache"))
+        if not os.path.exists(out_dir):
+            os.makedirs(out_dir)
+
+    def cell_args(self, index, cell):
+        """
+        조합 하나의 실행 파라미터 생성 (공통 파라미터 + 조합의 -k/flag + 조합별 저널 경로)
+
+        :param index: 조합 순번
+        :param cell: 조합
+        :return: argparse.Namespace
+        """
+        args = argparse.Namespace(**vars(self.base_args))
+        args.k = dict(cell["k"])
+        args.v, args.i, args.o = cell["flags"]["v"], cell["flags"]["i"], cell["flags"]["o"]
+        args.journal = os.path.join(self.out_dir, f"cell_{index:03d}.jsonl")
+        # 이어서 실행 시 저널이 없는 조합(아직 시작하지 않은 조합)은 처음부터 실행
+        args.resume = self.base_args.resume and os.path.exists(args.journal)
+        return args
+
+    def run(self):
+        """
+        전체 조합 실행, 실패한 조합이 있어도 나머지 조합은 계속 진행한 뒤 리포트를 저장한다.
+
+        :return: 조합별 실행 결과 리스트
+        """
+        results = []
+        for index, cell in enumerate(self.cells):
+            print(f"\n[{index + 1}/{len(self.cells)}] -k {cell['k']} flags {cell['flags']}")
+            runner = EditionRunner(
+                self.cell_args(index, cell),
+                payload_path=os.path.join(self.out_dir, f"senddata_{index:03d}.json"),
+                shared=self.shared,
+            )
+            result = dict(index=index, k=cell["k"], flags=cell["flags"])
+            try:
+                nft_id = runner.run()
+                result.update(
+                    status="ok", nftid=nft_id, edition=runner.handler.session.edition,
+                    url=runner.handler.session.nft_url,
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                # 조합 하나의 예상하지 못한 오류로 나머지 조합이 중단되지 않도록 실패로 기록
+                print(f"조합 실행에 실패했습니다: {error!r}")
+                result.update(status="failed", error=str(error))
+            results.append(result)
+
+        report = dict(cells=results, visibility=None)
+        if self.shared.probe:
+            # 조합별 노출 시간을 결과에 합치고 전체 분포를 리포트에 기록
+            measured = {(x["edition"], x["nftid"]): x for x in self.shared.probe.wait()}
+            for result in results:
+                result.update(measured.get((result.get("edition"), result.get("nftid")), {}))
+            report["visibility"] = self.shared.probe.print_summary()
+        report_path = os.path.join(self.out_dir, "report.json")
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        succeeded = len([x for x in results if x["status"] == "ok"])
+        print(
+            f"\n매트릭스 실행 완료: 성공 {succeeded} / 전체 {len(results)}, "
+            f"작가 조회 {len(self.shared.verified_authors)}회, "
+            f"이미지/영상 세트 다운로드 {len(self.shared.media)}회, 리포트: {report_path}"
+        )
+        return results
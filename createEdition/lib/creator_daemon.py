@@ -0,0 +1,291 @@
+"""
+에디션 생성 데몬 모듈
+
+한 번 띄워두면 HTTP 세션(백오피스/Pixabay), 작가 ID 확인 결과, 이미지/영상 데이터, static.json, bit.ly shortener를
+계속 유지한 채로 로컬 HTTP(또는 Unix socket) API로 생성 요청(job)을 받아 처리한다.
+인터프리터 기동, 모듈 import, TLS 핸드셰이크, 작가 조회가 매번 반복되지 않으므로 에디션당 소요 시간은 생성 요청 + 상태 변경 수준이 된다.
+
+API
+- POST /jobs  {"k": {"edition": "eth", ...}, "v": false, "i": false, "o": false}
+  -> 202 {"id": job ID}
+- GET /jobs/<job ID> -> job 상태 (queued | running | done | failed) 및 결과
+- GET /health -> 대기 job 수, 공유 자원 상태
+
+job별 저널, 메타데이터 json 파일은 job이 끝나면 삭제하고 결과만 jobs.jsonl 에 한 줄씩 남긴다.
+"""
+import argparse
+import itertools
+import json
+import os
+import queue
+import re
+import socketserver
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from lib.edition_runner import EditionRunner
+from lib.http_service import JsonRequestHandler, serve_until_interrupted
+from lib.metadata_handler import (
+    MetadataHandler, check_edition_kwargs, get_shortener, load_static_data
+)
+from lib.session_request import SessionRequest
+from lib.shared_resources import SharedResources
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket 기반 HTTP 서버 (로컬 사용자만 접근 가능하도록 TCP 포트 대신 사용)
+    """
+    daemon_threads = True
+
+
+class CreatorDaemon:
+    """
+    생성 job 큐 및 처리 스레드
+    같은 작가의 NFT ID가 꼬이지 않도록 job은 처리 스레드 하나에서 순서대로 처리한다.
+    """
+    def __init__(self, base_args, out_dir="daemon"):
+        """
+        :param base_args: 공통 파라미터 (--backoffice, --compress 등, MetadataHandler.parsing 결과)
+        :param out_dir: job별 저널, 메타데이터 json, job 결과 파일(jobs.jsonl) 저장 폴더
+        """
+        self.base_args = base_args
+        self.out_dir = out_dir
+        self.shared = SharedResources.from_args(base_args, os.path.join(out_dir, "media_cache"))
+        self.jobs = {}
+        self.pending = queue.Queue()
+        self.job_ids = itertools.count(1)
+        self.lock = threading.Lock()
+        if not os.path.exists(out_dir):
+            os.makedirs(out_dir)
+
+    def warm_up(self, editions=("eth", "btc"), video=False):
+        """
+        기동 시 공유 자원을 미리 준비 (static.json, shortener, 기본 작가/셀러 확인, 이미지/영상 세트)
+
+        :param editions: 미리 확인할 에디션 유형 (기본 작가/셀러 ID 기준)
+        :param video: 영상 세트까지 미리 다운로드할지 여부
+        :return:
+        """
+        started = time.perf_counter()
+        load_static_data()
+        if not self.base_args.replay:
+            # 재생 시에는 cassette에 기록된 축약 결과를 사용하므로 bit.ly 에 연결하지 않음
+            get_shortener()
+        for edition in editions:
+            self.shared.verify_author(
+                SessionRequest(
+                    edition=edition,
+                    addr=self.base_args.backoffice,
+                    http_session=self.shared.http_session,
+                )
+            )
+        self.shared.get_media(video)
+        print(f"공유 자원 준비 완료 ({time.perf_counter() - started:.1f}s)")
+
+    def job_args(self, job_id, job):
+        """
+        job 하나의 실행 파라미터 생성 (공통 파라미터 + job의 -k/flag + job별 저널 경로)
+
+        :param job_id: job ID
+        :param job: 요청 바디
+        :return: argparse.Namespace
+        """
+        args = argparse.Namespace(**vars(self.base_args))
+        args.k = {key: str(value) for key, value in job["k"].items()}
+        args.v, args.i, args.o = bool(job.get("v")), bool(job.get("i")), bool(job.get("o"))
+        args.journal = os.path.join(self.out_dir, f"job_{job_id:05d}.jsonl")
+        args.resume = False
+        return args
+
+    def submit(self, job):
+        """
+        생성 요청 job 등록 (규칙에 맞지 않는 조합은 등록하지 않음)
+
+        :param job: {"k": {...}, "v": bool, "i": bool, "o": bool}
+        :return: 등록된 job 상태 dict
+        """
+        if not isinstance(job.get("k"), dict) or not job["k"].get("edition"):
+            raise ValueError("k 파라미터에 edition 값이 필요합니다.")
+        kwargs = {key: str(value) for key, value in job["k"].items()}
+        flags = {flag: bool(job.get(flag)) for flag in ("v", "i", "o")}
+        reason = check_edition_kwargs(kwargs)
+        if reason:
+            raise ValueError(f"유효하지 않은 조합입니다: {reason}")
+
+        job_id = next(self.job_ids)
+        state = dict(id=job_id, status="queued", k=kwargs, flags=flags, submittedAt=time.time())
+        with self.lock:
+            self.jobs[job_id] = state
+        self.pending.put((job_id, job))
+        return state
+
+    def get(self, job_id):
+        """
+        job 상태 조회
+
+        :param job_id: job ID
+        :return: job 상태 dict, 없으면 None
+        """
+        with self.lock:
+            state = dict(self.jobs[job_id]) if job_id in self.jobs else None
+        if state and state.get("nftid") and self.shared.probe:
+            # --probe 옵션 시 노출 시간 측정 결과 (측정 중이면 아직 측정되지 않은 항목은 없음)
+            state["visibility"] = self.shared.probe.result(state["edition"], state["nftid"])
+        return state
+
+    def run_job(self, job_id, job):
+        """
+        job 하나 실행 후 job별 저널, 메타데이터 json 파일 삭제
+        어떤 예외가 발생해도 실패 결과로 리턴하므로 처리 스레드는 다음 job을 계속 처리한다.
+
+        :param job_id: job ID
+        :param job: 요청 바디
+        :return: 결과 dict
+        """
+        runner = None
+        try:
+            runner = EditionRunner(
+                self.job_args(job_id, job),
+                payload_path=os.path.join(self.out_dir, f"senddata_{job_id:05d}.json"),
+                shared=self.shared,
+            )
+            nft_id = runner.run()
+            result = dict(
+                status="done", nftid=nft_id, edition=runner.handler.session.edition,
+                url=runner.handler.session.nft_url,
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            result = dict(status="failed", error=str(error) or repr(error))
+            if runner and runner.journal.done("posted"):
+                # 생성 요청까지 끝난 에디션은 정리(teardown.py) 대상이 되도록 NFT ID 기록
+                reserved = runner.journal.get("reserved")
+                result.update(nftid=reserved["nftid"], edition=reserved["edition"])
+        if runner:
+            for path in (runner.args.journal, runner.payload_path):
+                MetadataHandler.remove_json_file(path)
+        return result
+
+    def record_job(self, state):
+        """
+        끝난 job 결과를 jobs.jsonl 에 한 줄 기록 (기록 직후 fsync)
+
+        :param state: job 상태 dict
+        :return:
+        """
+        try:
+            with open(os.path.join(self.out_dir, "jobs.jsonl"), "a", encoding="utf-8") as file:
+                file.write(json.dumps(state, ensure_ascii=False) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError as error:
+            print(f"[job {state['id']}] 결과 기록에 실패했습니다: {error}")
+
+    def process_forever(self):
+        """
+        큐에 쌓인 job을 순서대로 처리 (별도 스레드에서 실행)
+
+        :return:
+        """
+        while True:
+            job_id, job = self.pending.get()
+            with self.lock:
+                self.jobs[job_id].update(status="running", startedAt=time.time())
+            result = self.run_job(job_id, job)
+            with self.lock:
+                state = self.jobs[job_id]
+                state.update(result, finishedAt=time.time())
+                state["elapsed"] = round(state["finishedAt"] - state["startedAt"], 3)
+                finished = dict(state)
+            self.record_job(finished)
+            print(f"[job {job_id}] {result}")
+
+    @property
+    def health(self):
+        """
+        데몬 상태 (대기 job 수, 확인된 작가 수, 준비된 이미지/영상 세트)
+
+        :return: dict
+        """
+        return dict(
+            pending=self.pending.qsize(),
+            jobs=len(self.jobs),
+            verifiedAuthors=len(self.shared.verified_authors),
+            mediaSets=sorted(self.shared.media.keys()),
+            visibility=self.shared.probe.summary if self.shared.probe else None,
+        )
+
+
+def make_handler(daemon):
+    """
+    데몬 객체를 참조하는 HTTP 요청 처리 클래스 생성
+
+    :param daemon: CreatorDaemon 객체
+    :return: BaseHTTPRequestHandler 하위 클래스
+    """
+    class DaemonRequestHandler(JsonRequestHandler):
+        """
+        job 등록/조회 API 처리 클래스
+        """
+        def do_GET(self):  # pylint: disable=invalid-name
+            """
+            job 상태 및 데몬 상태 조회
+
+            :return:
+            """
+            if self.path == "/health":
+                self.send_json(200, daemon.health)
+                return
+            match = re.fullmatch(r"/jobs/(\d+)", self.path)
+            state = daemon.get(int(match.group(1))) if match else None
+            if state is None:
+                self.send_json(404, {"message": "not found"})
+            else:
+                self.send_json(200, state)
+
+        def do_POST(self):  # pylint: disable=invalid-name
+            """
+            생성 job 등록
+
+            :return:
+            """
+            if self.path != "/jobs":
+                self.send_json(404, {"message": "not found"})
+                return
+            try:
+                body = self.rfile.read(int(self.headers.get("content-length", 0)))
+                state = daemon.submit(json.loads(body.decode("utf-8")))
+            except ValueError as error:
+                self.send_json(400, {"message": str(error)})
+                return
+            self.send_json(202, state)
+
+    return DaemonRequestHandler
+
+
+def serve(daemon, host="127.0.0.1", port=8765, socket_path=None):
+    """
+    job 처리 스레드 시작 후 API 서버 실행 (Ctrl+C로 종료)
+
+    :param daemon: CreatorDaemon 객체
+    :param host: TCP 바인딩 주소
+    :param port: TCP 바인딩 포트
+    :param socket_path: Unix socket 경로 (입력 시 TCP 대신 사용)
+    :return:
+    """
+    threading.Thread(target=daemon.process_forever, daemon=True).start()
+    handler = make_handler(daemon)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, handler)
+        print(f"생성 데몬이 실행되었습니다: unix:{socket_path}")
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        print(f"생성 데몬이 실행되었습니다: http://{host}:{port}/")
+    try:
+        serve_until_interrupted(server)
+    finally:
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,224 @@
+"""
+에디션 생성 흐름 실행 모듈
+
+NFT ID 확보 -> 이미지/영상 다운로드 -> 메타데이터 json 생성 -> 생성 요청 -> LIVE 변경 -> URL 축약 -> QR 생성
+각 단계를 완료할 때마다 단계 저널에 기록하고, 재실행 시 이미 완료된 단계는 건너뛴다.
+"""
+import os
+
+from lib.live_scheduler import LiveSchedule
+from lib.metadata_handler import MetadataHandler
+from lib.payload_writer import read_open_at
+from lib.stage_journal import StageJournal
+from lib.visibility_probe import VisibilityProbe
+
+
+class EditionRunner:
+    """
+    에디션 한 건의 생성 흐름을 단계별로 실행하는 클래스
+    """
+    def __init__(self, args, payload_path="senddata.json", media_dir="media_cache", shared=None):
+        """
+        :param args: 파싱된 파라미터 (MetadataHandler.parsing)
+        :param payload_path: 메타데이터 json 파일 경로
+        :param media_dir: 이미지/영상 캐시 폴더
+        :param shared: 여러 에디션이 공유하는 자원 (SharedResources), 없으면 에디션마다 새로 준비
+        """
+        self.args = args
+        self.payload_path = payload_path
+        self.media_dir = media_dir
+        self.shared = shared
+        self.journal = StageJournal(args.journal, resume=args.resume)
+        self.handler = None
+        # 여러 에디션을 생성하는 경우 공유 자원의 측정 객체 사용, 단건 실행이면 직접 생성해서 마지막에 출력
+        self.probe = shared.probe if shared else VisibilityProbe.from_args(args)
+
+    def restore_args(self):
+        """
+        재실행 시 최초 실행 때 저널에 기록한 에디션 파라미터로 복원 (--resume 만 입력해도 이어서 진행 가능)
+
+        :return: 저널에 기록된 NFT ID, 기록이 없으면 None
+        """
+        reserved = self.journal.get("reserved")
+        if not reserved:
+            return None
+        self.args.k = reserved["k"]
+        self.args.v, self.args.i, self.args.o = reserved["v"], reserved["i"], reserved["o"]
+        print(
+            f"저널의 마지막 완료 단계({self.journal.last_stage}) 다음부터 이어서 진행합니다. "
+            f"NFT ID: {reserved['nftid']}"
+        )
+        return reserved["nftid"]
+
+    def reserve(self):
+        """
+        작가/셀러 ID 존재 여부 확인 후 NFT ID 확보 (재실행 시 저널의 ID 사용, 작가 조회 생략)
+
+        :return:
+        """
+        self.handler = MetadataHandler(
+            args=self.args,
+            nft_id=self.restore_args(),
+            http_session=self.shared.http_session if self.shared else None,
+        )
+        if self.journal.done("reserved"):
+            return
+        reqsession = self.handler.session
+        if self.shared:
+            # 이미 확인된 작가/셀러 ID면 조회 생략
+            self.shared.verify_author(reqsession)
+        else:
+            # 작가 리스트 조회
+            authorlist, total_count = reqsession.get_authors
+            # 작가 ID 존재 여부 조회
+            reqsession.get_authorid_exist(authorlist, total_count)
+        self.journal.record(
+            "reserved",
+            nftid=self.handler.nft_id,
+            edition=reqsession.edition,
+            authorSellerId=reqsession.author_seller_id,
+            k=self.args.k,
+            v=self.args.v,
+            i=self.args.i,
+            o=self.args.o,
+        )
+
+    def fetch_media(self):
+        """
+        이미지/영상 다운로드 후 캐시 파일에 저장 (재실행 시 캐시 파일에서 불러옴)
+
+        :return:
+        """
+        built = self.journal.get("payload_built")
+        if built and os.path.exists(built["payloadPath"]):
+            # 메타데이터 json 까지 만들어진 경우 이미지/영상 데이터를 다시 메모리에 올릴 필요 없음
+            return
+        fetched = self.journal.get("media_fetched")
+        if fetched and os.path.exists(fetched["cachePath"]):
+            self.handler.load_media(fetched["cachePath"])
+            return
+        if self.shared:
+            self.handler.media, cache_path = self.shared.get_media(self.args.v)
+        else:
+            cache_path = os.path.join(
+                self.media_dir, f"{self.handler.session.edition}_{self.handler.nft_id}.json"
+            )
+            self.handler.fetch_media()
+            self.handler.save_media(cache_path)
+        self.journal.record("media_fetched", cachePath=cache_path)
+
+    def build_payload(self):
+        """
+        static + dynamic 데이터 dict에 업데이트 후 json 파일에 저장
+
+        :return:
+        """
+        built = self.journal.get("payload_built")
+        if built and os.path.exists(built["payloadPath"]):
+            self.payload_path = built["payloadPath"]
+            return
+        # json 파일이 있을 경우 삭제 처리
+        self.handler.remove_json_file(self.payload_path)
+        self.handler.update_metadata_dict()
+        # LIVE 예약 시 json 에 기록된 것과 같은 오픈 시각을 등록하도록 저널에 같이 기록 (기록 후 dict가 비워질 수 있음)
+        open_at = self.handler.jsondict["openAt"]
+        self.handler.write_dict_data_to_json(self.payload_path)
+        self.journal.record("payload_built", payloadPath=self.payload_path, openAt=open_at)
+
+    def remove_media_cache(self):
+        """
+        메타데이터 json 생성 후 에디션별 이미지/영상 캐시 파일 삭제
+        (재실행 시에는 메타데이터 json 을 사용하므로 필요 없음, 여러 에디션이 공유하는 캐시 파일은 유지)
+
+        :return:
+        """
+        fetched = self.journal.get("media_fetched")
+        if self.shared or not fetched or not self.journal.done("payload_built"):
+            return
+        self.handler.remove_json_file(fetched["cachePath"])
+
+    def create(self):
+        """
+        NFT 생성 요청 (DRAFT) 후 LIVE 상태로 변경
+        --draft-only 옵션이 있으면 DRAFT 상태로 두고 LIVE 예약 파일에 등록 (golive.py 로 한꺼번에 LIVE 변경)
+
+        :return:
+        """
+        reqsession = self.handler.session
+        if not self.journal.done("posted"):
+            # 요청을 보낸 뒤에는 에러를 내면 재실행 시 중복 생성되므로 예산 초과는 리포트에만 표시
+            with self.handler.memory.stage("create_nft", enforce=False):
+                reqsession.post_nft(self.payload_path, stream=bool(self.args.max_memory))
+            self.journal.record("posted", nftid=self.handler.nft_id)
+            if self.probe:
+                self.probe.watch(reqsession, "posted")
+        if self.args.draft_only:
+            if not self.journal.done("scheduled"):
+                self.schedule_live()
+            return
+        if not self.journal.done("live"):
+            reqsession.set_live()
+            self.journal.record("live", url=reqsession.nft_url)
+            if self.probe:
+                self.probe.watch(reqsession, "live")
+        print(f"생성된 에디션 링크는 다음과 같습니다.: {reqsession.nft_url}")
+
+    def schedule_live(self):
+        """
+        DRAFT 상태로 생성된 에디션을 오픈 시각과 함께 LIVE 예약 파일에 등록
+
+        :return:
+        """
+        built = self.journal.get("payload_built")
+        # 메타데이터 json 에 기록된 오픈 시각 사용 (openAt 을 저널에 기록하기 전 실행분은 json 파일에서 읽음)
+        open_at = built.get("openAt") or read_open_at(built["payloadPath"])
+        reqsession = self.handler.session
+        LiveSchedule(self.args.schedule).register(reqsession.edition, reqsession.nftid, open_at)
+        self.journal.record("scheduled", schedule=self.args.schedule)
+
+    def shorten_and_render_qr(self):
+        """
+        에어드롭 작품인 경우 URL 축약 후 QR 이미지 생성
+
+        :return:
+        """
+        shortened = self.journal.get("shortened")
+        if not shortened:
+            result = self.handler.get_shortening_url()
+            shortened = self.journal_shortened(result)
+        if shortened.get("shortUrl") and not self.journal.done("qr_rendered"):
+            self.handler.make_qrcode_and_download(shortened["shortUrl"], shortened["originUrl"])
+            self.journal.record(
+                "qr_rendered",
+                aos=f"./QR/aos_QR_{self.handler.nft_id}.png",
+                ios=f"./QR/ios_QR_{self.handler.nft_id}.png",
+            )
+
+    def journal_shortened(self, result):
+        """
+        URL 축약 결과 저널 기록 (에어드롭이 아닌 경우 축약 URL 없이 기록)
+
+        :param result: (축약 URL, 원본 URL) 또는 None
+        :return: 기록한 데이터
+        """
+        short_url, origin_url = result if result else (None, None)
+        self.journal.record("shortened", shortUrl=short_url, originUrl=origin_url)
+        return self.journal.get("shortened")
+
+    def run(self):
+        """
+        전체 생성 흐름 실행
+
+        :return: 생성된 NFT ID
+        """
+        self.reserve()
+        self.fetch_media()
+        self.build_payload()
+        self.remove_media_cache()
+        self.create()
+        self.shorten_and_render_qr()
+        self.handler.memory.print_report()
+        if self.probe and not self.shared:
+            self.probe.wait()
+            self.probe.print_summary()
+        return self.handler.nft_id
@@ -0,0 +1,311 @@
+"""
+테스트 에디션 일괄 정리 모듈
+
+이전 실행(단계 저널, 매트릭스 리포트, job 큐, LIVE 예약 파일)에 생성 요청까지 끝난 것으로 기록된 NFT ID 또는
+작가/셀러별로 조회한 NFT ID를 생성 시 사용하는 상태 변경 엔드포인트(/{eth|btc}/{id}/status)로 DROPPED 상태로 변경한다.
+생성 요청 전 ID 확보만 기록된 NFT ID는 다른 사용자가 같은 ID로 생성했을 수 있으므로 목록만 따로 리턴한다.
+제한된 동시 요청 수와 초당 요청 수 안에서 처리하며, 처리한 에디션은 로그 파일에 기록해서 재실행 시 건너뛴다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from lib.session_request import SessionRequest
+from lib.stage_journal import read_records
+
+# 백오피스 에디션 상태 코드 (1: DRAFT, 3: LIVE, 4: DROPPED)
+DROPPED_STATUS = 4
+# 실행 기록 폴더 탐색 시 제외할 폴더 (이미지/영상 캐시)
+SKIP_DIRS = ("media_cache", "spill")
+# 생성 요청까지 끝난 것으로 판단하는 단계 저널 단계
+CREATED_STAGES = ("posted", "scheduled", "live")
+
+
+def iter_records(data):
+    """
+    json 데이터 안에서 edition, nftid 값을 모두 가진 dict를 재귀적으로 탐색
+
+    :param data: json 데이터
+    :return: generator of dict
+    """
+    if isinstance(data, dict):
+        if data.get("edition") in ("eth", "btc") and int(data.get("nftid") or 0) > 0:
+            yield data
+        for value in data.values():
+            yield from iter_records(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from iter_records(value)
+
+
+def split_journal(records):
+    """
+    단계 저널의 NFT ID를 생성 여부로 분리
+    reserved 단계에 기록된 ID는 posted/scheduled/live 단계까지 기록된 경우에만 생성된 것으로 판단한다.
+
+    :param records: 단계 저널 기록 리스트
+    :return: (생성된 {(에디션 유형, NFT ID)}, ID 확보만 기록된 {(에디션 유형, NFT ID)})
+    """
+    reserved = {
+        (record["edition"], int(record["nftid"]))
+        for record in iter_records([x for x in records if x.get("stage") == "reserved"])
+    }
+    if any(record.get("stage") in CREATED_STAGES for record in records):
+        return reserved, set()
+    return set(), reserved
+
+
+def split_queue_results(results):
+    """
+    job 큐 결과의 NFT ID를 생성 여부로 분리
+    job 큐는 생성 요청 전에 ID를 먼저 저장하므로 posted 가 기록된 결과만 생성된 것으로 판단한다.
+
+    :param results: job 결과 dict 리스트
+    :return: (생성된 {(에디션 유형, NFT ID)}, ID 확보만 기록된 {(에디션 유형, NFT ID)})
+    """
+    created, reserved = set(), set()
+    for result in iter_records(results):
+        (created if result.get("posted") else reserved).add(
+            (result["edition"], int(result["nftid"]))
+        )
+    return created, reserved - created
+
+
+def read_recorded(path):
+    """
+    실행 기록 파일 하나에서 (에디션 유형, NFT ID) 추출
+    .jsonl: 단계 저널, LIVE 예약 파일, 데몬 결과 / .json: 매트릭스·LIVE 변경 리포트 / .db: job 큐
+    단계 저널, job 큐 외의 기록은 생성 요청이 끝난 뒤에만 ID를 기록하므로 모두 생성된 것으로 판단한다.
+
+    :param path: 실행 기록 파일 경로
+    :return: (생성된 {(eth | btc, NFT ID)}, ID 확보만 기록된 {(eth | btc, NFT ID)})
+    """
+    records = []
+    if path.endswith(".db"):
+        conn = sqlite3.connect(path)
+        try:
+            results = [json.loads(row[0]) for row in conn.execute("SELECT result FROM jobs")]
+        finally:
+            conn.close()
+        return split_queue_results(results)
+    if path.endswith(".jsonl"):
+        records = list(read_records(path))
+        if any(isinstance(record, dict) and "stage" in record for record in records):
+            return split_journal(records)
+    elif path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                records = json.load(file)
+            except ValueError:
+                return set(), set()
+    return {(record["edition"], int(record["nftid"])) for record in iter_records(records)}, set()
+
+
+def collect_recorded(paths):
+    """
+    실행 기록 파일/폴더에서 (에디션 유형, NFT ID) 수집
+    폴더는 하위 파일까지 탐색하되 이미지/영상 캐시 폴더, 메타데이터 json 파일(senddata*)은 제외한다.
+
+    :param paths: 파일 또는 폴더 경로 리스트
+    :return: (생성된 {(eth | btc, NFT ID)}, 다른 기록에도 없이 ID 확보만 기록된 {(eth | btc, NFT ID)})
+    """
+    targets, reserved = set(), set()
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [name for name in dirs if name not in SKIP_DIRS]
+                files += [
+                    os.path.join(root, name) for name in names if not name.startswith("senddata")
+                ]
+        elif os.path.exists(path):
+            files.append(path)
+    for path in files:
+        created, reserved_only = read_recorded(path)
+        targets |= created
+        reserved |= reserved_only
+    return targets, reserved - targets
+
+
+def scan_author(edition, author_seller_id, addr=None, count=100):
+    """
+    작가/셀러별 NFT ID 조회
+    사용 가능한 다음 NFT ID부터 count 개의 이전 ID를 컨트랙트 사용 여부 엔드포인트로 확인해서 사용 중인 ID만 리턴한다.
+    사용 중인 ID는 다른 사용자가 생성한 에디션일 수도 있으므로 merge_scanned 로 실행 기록과 비교해서 사용한다.
+
+    :param edition: eth | btc
+    :param author_seller_id: 작가/셀러 ID
+    :param addr: 백오피스 Admin API 주소
+    :param count: 확인할 이전 ID 수
+    :return: {(eth | btc, NFT ID)}
+    """
+    reqsession = SessionRequest(edition=edition, author_seller_id=author_seller_id, addr=addr)
+    next_id = reqsession.nftid
+    return {
+        (reqsession.edition, nft_id)
+        for nft_id in range(next_id - 1, max(next_id - 1 - count, 0), -1)
+        if reqsession.get_used_nft_id(nft_id)["isExisting"]
+    }
+
+
+def merge_scanned(targets, scanned, scan_all=False):
+    """
+    작가/셀러별로 조회한 ID를 정리 대상에 합치기
+    실행 기록에 없는 ID(ID 확보만 기록된 ID 포함)는 목록만 출력하고, scan_all 인 경우에만 정리 대상에 포함한다.
+
+    :param targets: 실행 기록에서 수집한 {(에디션 유형, NFT ID)}
+    :param scanned: 작가/셀러별로 조회한 {(에디션 유형, NFT ID)}
+    :param scan_all: 실행 기록에 없는 ID도 정리 대상에 포함할지 여부
+    :return: (정리 대상 set, 실행 기록에 없는 ID 리스트)
+    """
+    unrecorded = sorted(set(scanned) - set(targets))
+    if unrecorded:
+        print(f"실행 기록에 없는 작가/셀러 에디션 {len(unrecorded)}개 (다른 사용자가 생성했을 수 있음)")
+        for edition, nft_id in unrecorded:
+            print(f"- {edition} {nft_id}")
+    if not scan_all:
+        if unrecorded:
+            print("--scan-all 옵션이 없으므로 실행 기록에 있는 에디션만 정리합니다.")
+        return set(targets), unrecorded
+    return set(targets) | set(scanned), unrecorded
+
+
+class RateLimiter:
+    """
+    여러 스레드가 공유하는 초당 요청 수 제한 (요청 간 최소 간격 유지)
+    """
+    def __init__(self, rate=None):
+        """
+        :param rate: 초당 최대 요청 수, 없으면 제한 없음
+        """
+        self.interval = 1 / rate if rate else 0
+        self.next_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        다음 요청 가능 시각까지 대기
+
+        :return:
+        """
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait_until = max(self.next_at, now)
+            self.next_at = wait_until + self.interval
+        time.sleep(max(wait_until - now, 0))
+
+
+class EditionTeardown:
+    """
+    에디션 일괄 상태 변경 클래스 (worker 스레드마다 별도 requests 세션 사용)
+    """
+    def __init__(self, addr=None, workers=8, rate=None, log_path="teardown_log.jsonl"):
+        """
+        :param addr: 백오피스 Admin API 주소
+        :param workers: 동시 요청 수
+        :param rate: 초당 최대 요청 수
+        :param log_path: 처리 완료 로그 파일 경로 (재실행 시 건너뛸 에디션)
+        """
+        self.addr = addr
+        self.workers = workers
+        self.limiter = RateLimiter(rate)
+        self.log_path = log_path
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.progress = dict(done=0, started=0.0, printed=0.0)
+
+    @property
+    def finished(self):
+        """
+        이전 실행에서 처리 완료된 (에디션 유형, NFT ID) (파싱할 수 없는 줄은 경고 후 건너뜀)
+
+        :return: set
+        """
+        if not os.path.exists(self.log_path):
+            return set()
+        return {
+            (record["edition"], record["nftid"])
+            for record in read_records(self.log_path, warn=True)
+        }
+
+    def drop(self, target, status):
+        """
+        에디션 하나의 상태 변경 (없는 에디션(404)은 이미 정리된 것으로 간주)
+
+        :param target: (에디션 유형, NFT ID)
+        :param status: 변경할 상태 코드
+        :return: 결과 dict
+        """
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        edition, nft_id = target
+        result = dict(edition=edition, nftid=nft_id)
+        self.limiter.wait()
+        try:
+            response = SessionRequest(
+                edition=edition, addr=self.addr, nftid=nft_id, http_session=self.local.session
+            ).set_status(status)
+            result["status"] = {200: "dropped", 404: "missing"}.get(response.status_code, "failed")
+            result["statusCode"] = response.status_code
+        except requests.RequestException as error:
+            result.update(status="failed", error=str(error))
+        self.record(result)
+        return result
+
+    def record(self, result):
+        """
+        처리 결과 로그 기록 및 진행 상황 출력 (1초 간격)
+
+        :param result: 결과 dict
+        :return:
+        """
+        with self.lock:
+            if result["status"] != "failed":
+                with open(self.log_path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            self.progress["done"] += 1
+            now = time.monotonic()
+            if now - self.progress["printed"] >= 1:
+                self.progress["printed"] = now
+                elapsed = now - self.progress["started"]
+                print(
+                    f"진행 {self.progress['done']} / {self.progress['total']} "
+                    f"({self.progress['done'] / elapsed if elapsed else 0:.1f} 건/s)"
+                )
+
+    def run(self, targets, status=DROPPED_STATUS):
+        """
+        대상 에디션 전체 상태 변경 (이전 실행에서 처리 완료된 에디션 제외)
+
+        :param targets: {(에디션 유형, NFT ID)}
+        :param status: 변경할 상태 코드
+        :return: (에디션별 결과 리스트, 리포트 dict)
+        """
+        remaining = sorted(set(targets) - self.finished)
+        skipped = len(targets) - len(remaining)
+        self.progress.update(done=0, total=len(remaining), started=time.monotonic())
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(lambda target: self.drop(target, status), remaining))
+        elapsed = time.monotonic() - self.progress["started"]
+        report = dict(
+            total=len(targets),
+            skipped=skipped,
+            dropped=len([x for x in results if x["status"] == "dropped"]),
+            missing=len([x for x in results if x["status"] == "missing"]),
+            failed=len([x for x in results if x["status"] == "failed"]),
+            seconds=round(elapsed, 2),
+            throughput=round(len(results) / elapsed, 1) if elapsed else None,
+        )
+        print(
+            f"정리 완료: 대상 {report['total']}개 (이전 실행에서 처리 {report['skipped']}개 제외), "
+            f"변경 {report['dropped']}, 없음 {report['missing']}, 실패 {report['failed']}, "
+            f"{report['seconds']}s ({report['throughput']} 건/s)"
+        )
+        return results, report
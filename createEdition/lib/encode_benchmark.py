@@ -0,0 +1,160 @@
+"""
+메타데이터 json 직렬화 벤치마크 모듈
+
+에디션 하나의 메타데이터 dict를 생성 요청 바디(json bytes)로 만드는 시간을 방식별로 측정한다.
+- legacy: 이전 방식 (json.dumps 로 dict 전체 직렬화 후 생성 요청 시 json.load, requests 에서 다시 json.dumps)
+- stdlib-dumps: json.dumps(ensure_ascii=False) 로 dict 전체 직렬화
+- <백엔드>-whole: 설치된 백엔드로 dict 전체 직렬화
+- <백엔드>-writer: payload_writer (static.json 필드 미리 직렬화, 이미지/영상 data URI bytes 그대로 기록)
+방식별 결과를 다시 파싱해서 원본 dict와 같은지도 확인한다.
+"""
+import base64
+import json
+import os
+import statistics
+import time
+
+from lib.json_codec import available_backends, get_encoder, select_backend
+from lib.payload_writer import encode_field, iter_payload
+
+
+def sample_payload(static, image_kb=1500, video_kb=0):
+    """
+    static.json 과 임의 bytes 이미지/영상으로 에디션 하나의 메타데이터 dict 생성
+    static.json 값 객체를 그대로 사용하므로 실제 실행과 같이 미리 직렬화한 필드를 사용할 수 있다.
+
+    :param static: static.json dict
+    :param image_kb: 고해상도 이미지 크기 (KB), 일반 이미지는 절반
+    :param video_kb: 영상 크기 (KB), 0이면 영상 없음
+    :return: 메타데이터 dict
+    """
+    def media(mime, kb, width, height):
+        encoded = base64.b64encode(os.urandom(kb * 1024)).decode("ascii")
+        return dict(
+            file=f"data:{mime};base64,{encoded}",
+            name="sample",
+            size=dict(width=width, height=height),
+        )
+
+    data = dict(static)
+    data.update(
+        title="벤치마크 에디션",
+        id=1000,
+        openAt="2026-01-01 00:00:00",
+        sellType=2,
+        price=10000,
+        mainImage=media("image/jpeg", image_kb // 2, 1280, 720),
+        mainImageHiRes=media("image/jpeg", image_kb, 1920, 1080),
+    )
+    data["bannerImage"] = data["mainImageHiRes"]
+    if video_kb:
+        data["mainVideo"] = media("video/mp4", video_kb // 2, 1280, 720)
+        data["mainVideoHiRes"] = media("video/mp4", video_kb, 1920, 1080)
+    return data
+
+
+def share_static(data, static):
+    """
+    파일에서 읽은 메타데이터 중 static.json 과 같은 값을 static.json 값 객체로 교체 (미리 직렬화한 필드 사용)
+
+    :param data: 메타데이터 dict
+    :param static: static.json dict
+    :return: 메타데이터 dict
+    """
+    return {
+        key: static[key] if key in static and static[key] == value else value
+        for key, value in data.items()
+    }
+
+
+def legacy(data):
+    """
+    이전 방식 직렬화 (파일 기록 후 생성 요청 시 다시 파싱/직렬화)
+
+    :param data: 메타데이터 dict
+    :return: 전송 bytes
+    """
+    text = json.dumps(data, ensure_ascii=False)
+    return json.dumps(json.loads(text)).encode("utf-8")
+
+
+def methods(static):
+    """
+    측정할 직렬화 방식
+
+    :param static: static.json dict
+    :return: [(방식 이름, 직렬화 전 준비 함수, 직렬화 함수 (bytes 또는 bytes 청크 리스트 리턴))]
+    """
+    fragments = {}
+
+    def writer(backend):
+        def prepare():
+            select_backend(backend)
+            fragments.clear()
+            fragments.update(
+                {key: (value, encode_field(key, value)) for key, value in static.items()}
+            )
+        # 파일에 청크 단위로 기록하는 것과 같이 이어붙이지 않고 청크 리스트로 측정
+        return prepare, lambda data: list(iter_payload(data, fragments))
+
+    result = [
+        ("legacy", None, legacy),
+        ("stdlib-dumps", None, lambda data: json.dumps(data, ensure_ascii=False).encode("utf-8")),
+    ]
+    for backend in available_backends():
+        prepare, run = writer(backend)
+        if backend != "json":
+            result.append((f"{backend}-whole", None, get_encoder(backend)))
+        result.append((f"{backend}-writer", prepare, run))
+    return result
+
+
+def run_benchmark(data, static, repeat=20):
+    """
+    방식별로 repeat 번 직렬화하며 에디션당 시간 측정 (static.json 미리 직렬화는 프로세스당 한 번이므로 측정에서 제외)
+
+    :param data: 메타데이터 dict
+    :param static: static.json dict
+    :param repeat: 반복 횟수
+    :return: 방식별 결과 리스트
+    """
+    results = []
+    for name, prepare, encode in methods(static):
+        if prepare:
+            prepare()
+        body = encode(data)
+        body = b"".join(body) if isinstance(body, list) else body
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            encode(data)
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append(
+            dict(
+                method=name,
+                bytes=len(body),
+                meanMs=round(statistics.mean(timings), 3),
+                medianMs=round(statistics.median(timings), 3),
+                minMs=round(min(timings), 3),
+                identical=json.loads(body) == data,
+            )
+        )
+    baseline = results[0]["medianMs"]
+    for result in results:
+        result["speedup"] = round(baseline / result["medianMs"], 1) if result["medianMs"] else None
+    return results
+
+
+def print_results(results):
+    """
+    방식별 결과 출력
+
+    :param results: 방식별 결과 리스트
+    :return:
+    """
+    for result in results:
+        print(
+            f"{result['method']:>16}: median {result['medianMs']}ms / mean {result['meanMs']}ms / "
+            f"min {result['minMs']}ms, {result['bytes']} bytes, legacy 대비 x{result['speedup']}"
+            f"{'' if result['identical'] else ' (결과 불일치)'}"
+        )
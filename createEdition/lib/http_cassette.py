@@ -0,0 +1,385 @@
+"""
+HTTP 요청 기록/재생(cassette) 모듈
+
+백오피스 Admin API(SessionRequest), Pixabay(ImageHandler), 노출 시간 측정(VisibilityProbe),
+예약 LIVE 변경(LiveScheduler) 세션에 requests transport adapter를 연결해서
+--record 옵션이면 실제 요청/응답을 cassette 폴더에 기록하고, --replay 옵션이면 네트워크 없이 기록된 응답을 돌려준다.
+bit.ly URL 축약은 bitlyshortener 라이브러리 자체 세션을 사용하므로 adapter 대신 축약 결과만
+{"method": "SHORTEN", "url": 원본 URL, "body": 축약 URL} 한 줄로 기록/재생한다. (shorten_url 참고)
+
+cassette 폴더 구조
+- interactions.jsonl: 요청 한 건당 한 줄
+  {"method", "url", "status", "headers", "body" | "bodyRef",
+   "requestBytes", "requestHash", "elapsedMs"}
+- bodies/<sha256>: 큰 응답 바디(이미지/영상, 검색 결과 등)는 내용 해시 파일로 한 번만 저장
+  (stream 요청의 응답 바디는 메모리에 올리지 않고 읽는 대로 청크 단위로 파일에 같이 기록)
+
+재생 시 (method, url) 별로 기록된 순서대로 응답하고, 기록보다 많이 요청하면 마지막 응답을 반복한다.
+요청 바디(생성 요청 메타데이터 등)는 날짜 등이 매번 달라지므로 매칭에 사용하지 않고 bytes 수, 해시만 기록한다.
+"""
+import functools
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+# 응답 바디를 interactions.jsonl 에 바로 기록할 최대 bytes (utf-8 텍스트인 경우만)
+INLINE_MAX_BYTES = 4096
+# 기록하지 않는 응답 헤더 (바디는 압축 해제된 상태로 기록하므로 재생 시 다시 해제하지 않도록 제외)
+SKIP_HEADERS = ("content-encoding", "transfer-encoding", "content-length", "connection")
+# URL 축약 결과 기록의 method 값
+SHORTEN_METHOD = "SHORTEN"
+
+
+def parse_latency(value):
+    """
+    --replay-latency 옵션 파싱
+
+    :param value: recorded (기록된 응답 시간) | ms 단위 숫자
+    :return: "recorded" | 초 단위 float
+    """
+    if value == "recorded":
+        return value
+    return float(value) / 1000
+
+
+class HttpCassette:
+    """
+    cassette 폴더 기록/재생 클래스 (여러 세션, 스레드가 공유)
+    """
+    def __init__(self, path, mode="replay", latency=None):
+        """
+        기록 모드면 interactions.jsonl 을 새로 쓰고 (bodies 는 재사용), 재생 모드면 기록을 불러온다.
+
+        :param path: cassette 폴더 경로
+        :param mode: record | replay
+        :param latency: 재생 시 응답 지연, "recorded" 면 기록된 응답 시간, 숫자면 고정 지연 (초)
+        """
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.index_path = os.path.join(path, "interactions.jsonl")
+        self.lock = threading.Lock()
+        self.interactions, self.played = {}, {}
+        if mode == "record":
+            os.makedirs(os.path.join(path, "bodies"), exist_ok=True)
+            with open(self.index_path, "w", encoding="utf-8"):
+                pass
+            return
+        if not os.path.exists(self.index_path):
+            raise ValueError(f"재생할 cassette 파일이 없습니다: {self.index_path}")
+        with open(self.index_path, "r", encoding="utf-8") as file:
+            for line in filter(str.strip, file):
+                entry = json.loads(line)
+                self.interactions.setdefault((entry["method"], entry["url"]), []).append(entry)
+        count = sum(map(len, self.interactions.values()))
+        print(f"cassette 재생: 요청 {count}건 ({self.path})")
+
+    @staticmethod
+    def make_entry(request, response, elapsed):
+        """
+        요청/응답 한 건의 기록 dict (응답 바디 제외)
+
+        :param request: requests.PreparedRequest
+        :param response: requests.Response
+        :param elapsed: 요청 전송 ~ 응답 바디 수신 완료 시간 (초)
+        :return: 기록 dict
+        """
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        return dict(
+            method=request.method,
+            url=request.url,
+            status=response.status_code,
+            headers={
+                key: value for key, value in response.headers.items()
+                if key.lower() not in SKIP_HEADERS
+            },
+            requestBytes=len(body) if isinstance(body, bytes) else None,
+            requestHash=hashlib.sha256(body).hexdigest() if isinstance(body, bytes) else None,
+            elapsedMs=round(elapsed * 1000, 2),
+        )
+
+    def record(self, request, response, elapsed):
+        """
+        요청/응답 한 건 기록 (stream 요청이 아닌 경우, 응답 바디는 이미 메모리에 있음)
+
+        :param request: requests.PreparedRequest
+        :param response: requests.Response
+        :param elapsed: 요청 전송 ~ 응답 바디 수신 완료 시간 (초)
+        :return:
+        """
+        content = response.content
+        entry = self.make_entry(request, response, elapsed)
+        text = None
+        if len(content) <= INLINE_MAX_BYTES:
+            try:
+                text = content.decode("utf-8")
+            except UnicodeDecodeError:
+                text = None
+        if text is None:
+            entry["bodyRef"] = self.store(content)
+        else:
+            entry["body"] = text
+        self.append(entry)
+
+    def append(self, entry):
+        """
+        interactions.jsonl 에 기록 한 줄 추가
+
+        :param entry: 기록 dict
+        :return:
+        """
+        with self.lock, open(self.index_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def temp_path(self):
+        """
+        응답 바디 임시 파일 경로 (동시에 같은 바디를 기록하는 경우를 위해 임시 파일에 쓴 뒤 교체)
+
+        :return: 임시 파일 경로
+        """
+        return os.path.join(self.path, "bodies", f"{threading.get_ident()}.{time.time_ns()}.tmp")
+
+    def commit_body(self, temp_path, digest):
+        """
+        임시 파일을 내용 해시 파일로 교체 (이미 있으면 임시 파일만 삭제)
+
+        :param temp_path: 임시 파일 경로
+        :param digest: sha256 해시
+        :return: sha256 해시
+        """
+        body_path = os.path.join(self.path, "bodies", digest)
+        if os.path.exists(body_path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, body_path)
+        return digest
+
+    def store(self, content):
+        """
+        큰 응답 바디 또는 바이너리를 내용 해시 파일로 저장 (같은 내용은 한 번만 저장)
+
+        :param content: 응답 바디
+        :return: sha256 해시
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        if not os.path.exists(os.path.join(self.path, "bodies", digest)):
+            temp_path = self.temp_path()
+            with open(temp_path, "wb") as file:
+                file.write(content)
+            self.commit_body(temp_path, digest)
+        return digest
+
+    def next_entry(self, request):
+        """
+        요청에 해당하는 다음 기록 (같은 요청은 기록된 순서대로, 다 쓰면 마지막 기록 반복)
+
+        :param request: requests.PreparedRequest
+        :return: 기록 dict
+        """
+        key = (request.method, request.url)
+        with self.lock:
+            entries = self.interactions.get(key)
+            if not entries:
+                raise requests.ConnectionError(
+                    f"cassette에 기록되지 않은 요청입니다: {request.method} {request.url}",
+                    request=request,
+                )
+            played = self.played.get(key, 0)
+            self.played[key] = played + 1
+        return entries[min(played, len(entries) - 1)]
+
+    def body(self, entry):
+        """
+        기록된 응답 바디
+
+        :param entry: 기록 dict
+        :return: bytes
+        """
+        if "bodyRef" not in entry:
+            return entry["body"].encode("utf-8")
+        with open(os.path.join(self.path, "bodies", entry["bodyRef"]), "rb") as file:
+            return file.read()
+
+
+class TeeReader:
+    """
+    stream 응답 바디를 호출하는 쪽이 읽는 대로 cassette 임시 파일에 같이 기록하는 response.raw 래퍼
+    바디를 끝까지 읽으면 내용 해시 파일로 교체하고 interactions.jsonl 에 기록한다.
+    (끝까지 읽지 않고 닫은 응답은 기록하지 않음)
+    """
+    def __init__(self, raw, cassette, entry, started):
+        """
+        :param raw: urllib3 HTTPResponse
+        :param cassette: HttpCassette 객체
+        :param entry: 응답 바디를 제외한 기록 dict
+        :param started: 요청 전송 시각 (perf_counter)
+        """
+        self.raw = raw
+        self.cassette = cassette
+        self.entry = entry
+        self.started = started
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        """
+        응답 바디를 청크 단위로 yield 하면서 임시 파일에 기록 (requests iter_content 에서 호출)
+
+        :param amt: 청크 크기
+        :param decode_content: 압축 해제 여부
+        :return: bytes generator
+        """
+        temp_path = self.cassette.temp_path()
+        digest = hashlib.sha256()
+        with open(temp_path, "wb") as file:
+            for chunk in self.raw.stream(amt, decode_content=decode_content):
+                file.write(chunk)
+                digest.update(chunk)
+                yield chunk
+        self.entry["elapsedMs"] = round((time.perf_counter() - self.started) * 1000, 2)
+        self.entry["bodyRef"] = self.cassette.commit_body(temp_path, digest.hexdigest())
+        self.cassette.append(self.entry)
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    cassette 기록/재생 transport adapter (세션의 http://, https:// 에 연결)
+    """
+    def __init__(self, cassette):
+        """
+        :param cassette: HttpCassette 객체
+        """
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """
+        기록 모드: 실제 요청 후 기록 / 재생 모드: 기록된 응답 리턴
+
+        :param request: requests.PreparedRequest
+        :param kwargs: stream, timeout 등 HTTPAdapter.send 파라미터
+        :return: requests.Response
+        """
+        if self.cassette.mode == "record":
+            started = time.perf_counter()
+            response = super().send(request, **kwargs)
+            if kwargs.get("stream"):
+                entry = self.cassette.make_entry(request, response, 0)
+                response.raw = TeeReader(response.raw, self.cassette, entry, started)
+                return response
+            _ = response.content
+            self.cassette.record(request, response, time.perf_counter() - started)
+            return response
+        entry = self.cassette.next_entry(request)
+        latency = self.cassette.latency
+        if latency:
+            time.sleep(entry["elapsedMs"] / 1000 if latency == "recorded" else latency)
+        raw = HTTPResponse(
+            body=io.BytesIO(self.cassette.body(entry)),
+            headers=entry["headers"],
+            status=entry["status"],
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+@functools.lru_cache(maxsize=None)
+def load_cassette(path, mode, latency=None):
+    """
+    cassette 객체를 프로세스당 한 번만 생성해서 모든 세션이 공유
+
+    :param path: cassette 폴더 경로
+    :param mode: record | replay
+    :param latency: 재생 시 응답 지연
+    :return: CassetteAdapter
+    """
+    return CassetteAdapter(HttpCassette(path, mode, latency))
+
+
+def add_cassette_arguments(parser):
+    """
+    --record / --replay / --replay-latency 옵션 추가 (main.py 공통 옵션, golive.py 에서 같이 사용)
+
+    :param parser: argparse.ArgumentParser
+    :return:
+    """
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", help="record HTTP interactions to a cassette directory")
+    cassette.add_argument("--replay", help="replay HTTP interactions from a cassette directory")
+    parser.add_argument(
+        "--replay-latency", type=parse_latency,
+        help="delay per replayed response: milliseconds or 'recorded'",
+    )
+
+
+def cassette_session(args):
+    """
+    --record / --replay 옵션이 있으면 cassette adapter를 연결한 새 requests 세션
+    (스레드마다 세션을 만드는 VisibilityProbe, LiveScheduler 의 세션 생성 함수로 사용)
+
+    :param args: 파싱된 파라미터
+    :return: requests.Session
+    """
+    return attach_cassette(args, requests.Session())
+
+
+def attach_cassette(args, http_session=None):
+    """
+    --record / --replay 옵션이 있으면 세션에 cassette adapter 연결
+
+    :param args: 파싱된 파라미터
+    :param http_session: 연결할 requests 세션, 없고 옵션이 있으면 새로 생성
+    :return: 세션 (옵션이 없으면 입력받은 세션 그대로)
+    """
+    if not args.record and not args.replay:
+        return http_session
+    if args.record:
+        adapter = load_cassette(args.record, "record")
+    else:
+        adapter = load_cassette(args.replay, "replay", args.replay_latency)
+    http_session = http_session if http_session else requests.Session()
+    http_session.mount("http://", adapter)
+    http_session.mount("https://", adapter)
+    return http_session
+
+
+def shorten_url(args, origin_url, shorten):
+    """
+    URL 축약 결과 기록/재생 (bit.ly 는 라이브러리 자체 세션을 사용하므로 adapter 대신 결과만 기록)
+    --record 옵션이면 축약 결과를 interactions.jsonl 에 원본 URL 기준으로 한 줄 추가하고,
+    --replay 옵션이면 shorten 을 호출하지 않고 기록된 축약 URL을 리턴한다.
+
+    :param args: 파싱된 파라미터
+    :param origin_url: 원본 URL
+    :param shorten: 원본 URL -> 축약 URL 함수 (--replay 가 아닐 때만 호출)
+    :return: 축약 URL, 재생 시 기록이 없으면 None
+    """
+    if args.replay:
+        cassette = load_cassette(args.replay, "replay", args.replay_latency).cassette
+        try:
+            entry = cassette.next_entry(requests.Request(SHORTEN_METHOD, origin_url))
+        except requests.ConnectionError:
+            return None
+        return entry["body"]
+    started = time.perf_counter()
+    short_url = shorten(origin_url)
+    if args.record:
+        load_cassette(args.record, "record").cassette.append(
+            dict(
+                method=SHORTEN_METHOD,
+                url=origin_url,
+                status=200,
+                headers={},
+                body=short_url,
+                elapsedMs=round((time.perf_counter() - started) * 1000, 2),
+            )
+        )
+    return short_url
@@ -0,0 +1,50 @@
+"""
+로컬 HTTP 서버 공통 모듈
+
+mock 백오피스 서버와 생성 데몬이 같이 사용하는 json 응답 처리 클래스와 서버 실행 함수
+"""
+import json
+from http.server import BaseHTTPRequestHandler
+
+
+class JsonRequestHandler(BaseHTTPRequestHandler):
+    """
+    json 응답 전송 및 keep-alive(HTTP/1.1)를 지원하는 요청 처리 기본 클래스
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """
+        요청마다 출력되는 기본 access log 생략
+        (부하 검증 시 콘솔 출력이 병목이 되지 않도록, Unix socket 사용 시 client 주소가 없어 기본 log 포맷 사용 불가)
+        """
+
+    def send_json(self, status, body):
+        """
+        json 응답 전송
+
+        :param status: HTTP status code
+        :param body: 응답 dict
+        :return:
+        """
+        encoded = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json;charset=UTF-8")
+        self.send_header("content-length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+def serve_until_interrupted(server):
+    """
+    서버 실행 (Ctrl+C로 종료), 종료 시 소켓 정리
+
+    :param server: socketserver 서버 객체
+    :return:
+    """
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,88 +3,214 @@
 고해상도/저해상도 이미지/영상 데이터를 dictionary 형태로 리턴 제공해준다.
 """
 import base64
-import random
+import hashlib
+import os
 from collections import defaultdict
 import requests
 from PIL import Image, ImageFile
 
+from lib.memory_tracker import read_rss
+from lib.rendition_index import (
+    IMAGE_SLOTS, VIDEO_SLOTS, RenditionIndex, image_renditions, url_name, video_renditions
+)
+
+# 원본 bytes 대비 동시에 메모리에 올라가는 배수 (응답 content, base64 문자열, data: 접두어 연결, json 직렬화 문자열 등)
+MEMORY_FACTOR = 5
+
 
 class ImageHandler:
     """
     Pixabay 이미지/비디오 데이터 처리 클래스
     Full API 접근 가능한 개인 API Key를 가지고 최고해상도 이미지/영상 데이터를 가져와 메타데이터 형태로 처리가능하도록 dict 리턴
     """
-    def __init__(self):
+    def __init__(self, max_memory=None, spill_dir="media_cache/spill", seed=None):
+        """
+        :param max_memory: 메모리 예산 (bytes), 입력 시 예산 안에 들어오는 검색 결과를 고르고 넘는 데이터는 디스크에 저장
+        :param spill_dir: 예산을 넘는 이미지/영상을 저장할 폴더
+        :param seed: 검색 결과 랜덤 선택 seed (인덱스별 random.Random 객체에만 적용, 전역 random 은 그대로)
+        """
         # 지정해주지 않으면 에러 발생 (PIL.Image.DecompressionBombError 방지용)
         Image.MAX_IMAGE_PIXELS = None
         self.session = requests.Session()
+        self.max_memory = max_memory
+        self.spill_dir = spill_dir
+        self.reserved = 0
+        self.seed = seed
+        self.indexes = {}
 
-    def get_all_images(self):
+    def reset_budget(self):
         """
-        pixabay API를 호출하여 이미지 데이터를 얻어온 뒤 dictionary 리턴
-        1920 해상도 이상인 이미지를 찾아 랜덤하게 하나를 선택, 그 이미지로 저해상도/고해상도 이미지 메타데이터를 리턴해준다.
+        에디션 하나의 이미지/영상 처리를 시작할 때 예산 사용량 초기화
 
-        imageURL : 원래 이미지의 URL (최고해상도)
-        imageWidth, imageHeight : 최고해상도의 원래 이미지 가로, 세로 길이
-        largeImageURL : width가 1280인 이미지의 URL (저해상도용)
+        :return:
+        """
+        self.reserved = 0
+
+    def fits_budget(self, size):
+        """
+        원본 크기(bytes)의 데이터를 메모리에서 base64 처리해도 예산 안에 들어오는지 여부
+        추정 사용량(reserved)과 실제 측정한 프로세스 RSS 모두 예산 안에 들어와야 메모리에서 처리한다.
+
+        :param size: 원본 bytes (Pixabay 메타데이터 기준)
+        :return: bool
+        """
+        if not self.max_memory:
+            return True
+        if size is None:
+            return False
+        needed = size * MEMORY_FACTOR
+        return max(self.reserved, read_rss()[0]) + needed <= self.max_memory
+
+    def get_base64(self, url, mime, size=None):
+        """
+        URL의 데이터를 받아서 data URI(base64) 형태로 리턴
+        예산이 있고 예산을 넘는 경우에는 메모리에 올리지 않고 디스크에 저장한 뒤 저장 위치 정보를 리턴한다.
+        (메타데이터 json 파일을 쓸 때 파일에서 읽어 base64 인코딩하며 바로 기록)
+
+        :param url: 이미지/영상 URL
+        :param mime: image/jpeg | video/mp4
+        :param size: 원본 bytes (모르면 None)
+        :return: data URI 문자열 또는 {"spillPath": 저장 경로, "mime": mime}
+        """
+        if not self.fits_budget(size):
+            return self.spill(url, mime)
+        if size:
+            self.reserved += size * MEMORY_FACTOR
+        content = self.session.request(url=url, method="GET").content
+        return f"data:{mime};base64," + base64.b64encode(content).decode("utf-8")
+
+    def spill(self, url, mime):
+        """
+        데이터를 청크 단위로 받아서 디스크에 바로 저장 (메모리에 전체 데이터를 올리지 않음)
+
+        :param url: 이미지/영상 URL
+        :param mime: image/jpeg | video/mp4
+        :return: {"spillPath": 저장 경로, "mime": mime}
+        """
+        if not os.path.exists(self.spill_dir):
+            os.makedirs(self.spill_dir)
+        path = os.path.join(self.spill_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+        response = self.session.request(url=url, method="GET", stream=True)
+        with open(path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                file.write(chunk)
+        print(f"메모리 예산을 넘어 디스크에 저장 후 처리합니다: {path}")
+        return {"spillPath": path, "mime": mime}
+
+    @property
+    def remaining_bytes(self):
+        """
+        남은 예산으로 메모리에서 처리 가능한 원본 bytes (예산이 없으면 None)
+        추정 사용량과 실제 측정한 프로세스 RSS 중 큰 값을 사용 중인 메모리로 본다.
+
+        :return: bytes
+        """
+        if not self.max_memory:
+            return None
+        return max(self.max_memory - max(self.reserved, read_rss()[0]), 0) // MEMORY_FACTOR
+
+    def get_index(self, kind):
+        """
+        Pixabay 검색 결과 인덱스 조회 (검색 요청 및 인덱스 생성은 객체당 한 번)
 
         api key : pixabay full api 접근 가능용 개인키
         pixabay API 문서 참조 : https://pixabay.com/api/docs/
 
-        :return: dict
+        :param kind: image | video
+        :return: RenditionIndex
         """
-        # 이미지 리스트 리턴 (200개)
-        image_hits = (
-            self.session.request(
-                url="https://pixabay.com/api/" +
-                    "?key=25876342-aa505c23cebd2518dd1680797" +
-                    "&min_width=1920&order=popular&per_page=200",
-                method="GET",
+        if kind not in self.indexes:
+            # 이미지/비디오 리스트 리턴 (200개)
+            hits = (
+                self.session.request(
+                    url="https://pixabay.com/api/" +
+                        ("videos/" if kind == "video" else "") +
+                        "?key=25876342-aa505c23cebd2518dd1680797" +
+                        "&min_width=1920&order=popular&per_page=200",
+                    method="GET",
+                )
+                .json()
+                .get("hits")
             )
-            .json()
-            .get("hits")
-        )
+            if kind == "video":
+                self.indexes[kind] = RenditionIndex(
+                    hits, video_renditions, VIDEO_SLOTS, seed=self.seed
+                )
+            else:
+                self.indexes[kind] = RenditionIndex(
+                    hits, image_renditions, IMAGE_SLOTS, seed=self.seed
+                )
+        return self.indexes[kind]
+
+    def get_rendition(self, rendition, mime):
+        """
+        선택한 해상도 데이터를 data URI(base64) 형태로 받아오고 실제 w/h 리턴
+        w/h가 추정값인 축소 이미지는 다운로드 후 PIL 라이브러리 통해 feeding 해서 실제 w/h를 알아낸다.
+        축소 이미지도 예산을 넘으면 디스크에 저장하고, 저장한 파일의 헤더만 읽어서 실제 w/h를 알아낸다.
 
-        # random pick one
-        pick_one = random.choice(list(image_hits))
-        # 고해상도 이미지 URL
-        hires_image_url = pick_one.get("imageURL")
-        # 저해상도 이미지 URL
-        common_image_url = pick_one.get("largeImageURL")
-        # 저해상도 이미지의 w/h를 알기 위해 content 데이터 get
-        image_response = self.session.request(
-            url=common_image_url, method="GET"
-        ).content
-        # largeImageURL 링크는 가져오지만 해당 저해상도 이미지의 w/h를 알 수 없어 PIL 라이브러리 통해 feeding 후 알아내기
+        :param rendition: RenditionIndex 에서 선택한 데이터
+        :param mime: image/jpeg | video/mp4
+        :return: (data URI 문자열 또는 디스크 저장 위치 정보, width, height)
+        """
+        if rendition["exact"]:
+            encoded = self.get_base64(rendition["url"], mime, rendition["size"])
+            return encoded, rendition["width"], rendition["height"]
+        if not self.fits_budget(rendition["size"]):
+            spilled = self.spill(rendition["url"], mime)
+            with Image.open(spilled["spillPath"]) as image:
+                return spilled, image.width, image.height
+        content = self.session.request(url=rendition["url"], method="GET").content
+        if self.max_memory:
+            self.reserved += len(content) * MEMORY_FACTOR
         parse_image = ImageFile.Parser()
-        parse_image.feed(image_response)
-        # base64 인코딩 (시스템 업로드용)
-        common_image_base64 = "data:image/jpeg;base64," + \
-                              base64.b64encode(image_response).decode("utf-8")
-        hires_image_response = self.session.request(
-            url=hires_image_url, method="GET"
-        ).content
-        hires_image_base64 = "data:image/jpeg;base64," + \
-                             base64.b64encode(hires_image_response).decode("utf-8")
+        parse_image.feed(content)
+        encoded = f"data:{mime};base64," + base64.b64encode(content).decode("utf-8")
+        return encoded, parse_image.image.width, parse_image.image.height
+
+    def get_renditions(self, picks, mime):
+        """
+        슬롯별 선택 데이터를 받아오기 (여러 슬롯이 같은 URL을 고른 경우 한 번만 받아서 같이 사용)
+
+        :param picks: {슬롯: RenditionIndex 에서 선택한 데이터}
+        :param mime: image/jpeg | video/mp4
+        :return: {슬롯: (data URI 문자열 또는 디스크 저장 위치 정보, width, height)}
+        """
+        fetched = {}
+        for pick in picks.values():
+            if pick["url"] not in fetched:
+                fetched[pick["url"]] = self.get_rendition(pick, mime)
+        return {slot: fetched[pick["url"]] for slot, pick in picks.items()}
+
+    def get_all_images(self):
+        """
+        pixabay API를 호출하여 이미지 데이터를 얻어온 뒤 dictionary 리턴
+        1920 해상도 이상인 이미지 중 랜덤하게 하나를 선택, 그 이미지로 저해상도/고해상도 이미지 메타데이터를 리턴해준다.
+
+        해상도별 이미지 중 슬롯별 최소 해상도를 만족하는 가장 작은 이미지를 사용한다.
+        imageURL : 원래 이미지의 URL (최고해상도)
+        fullHDURL : 긴 변이 1920인 이미지의 URL
+        largeImageURL : 긴 변이 1280인 이미지의 URL
+
+        :return: dict
+        """
+        pick_one, picks = self.get_index("image").pick(self.remaining_bytes)
+        fetched = self.get_renditions(picks, "image/jpeg")
+        common_image_base64, image_width, image_height = fetched["mainImage"]
+        hires_image_base64, hires_width, hires_height = fetched["mainImageHiRes"]
+        image_name = pick_one.get("pageURL").split("https://pixabay.com/")[1].split("/")[1] + ".jpg"
 
         # return dict
         image_dict = defaultdict(dict)
         image_dict.update(
             dict(
-                imageName=pick_one.get("pageURL")
-                    .split("https://pixabay.com/")[1]
-                    .split("/")[1]
-                    + ".jpg",
+                imageName=image_name,
                 imageBase64=common_image_base64,
-                imageWidth=parse_image.image.width,
-                imageHeight=parse_image.image.height,
-                imageHiresName=pick_one.get("pageURL")
-                    .split("https://pixabay.com/")[1]
-                    .split("/")[1]
-                    + ".jpg",
+                imageWidth=image_width,
+                imageHeight=image_height,
+                imageHiresName=image_name,
                 imageHiresBase64=hires_image_base64,
-                imageHiresWidth=pick_one.get("imageWidth"),
-                imageHiresHeight=pick_one.get("imageHeight"),
+                imageHiresWidth=hires_width,
+                imageHiresHeight=hires_height,
             )
         )
         return image_dict
@@ -92,89 +218,31 @@ class ImageHandler:
     def get_all_videos(self):
         """
         pixabay API를 호출하여 비디오 데이터를 얻어온 뒤 dictionary 리턴
-        1920 해상도 이상인 이미지를 찾아 랜덤하게 하나를 선택, 그 이미지로 저해상도/고해상도 영상 메타데이터를 리턴해준다.
-
-        랜덤 선택 후 videos key의 value 값에는 4가지 유형의 비디오를 리턴한다. [large, medium, small, tiny]
-        4가지 유형 중 필요한 데이터 (고해상도/저해상도에 해당하는 비디오의 URL 및 width/height)를 획득 후 dict로 리턴해준다.
-
-        1920 해상도 기준으로 저해상도/고해상도 영상을 구분한다.
-        ex. 3840x2160, 1920x1080, 640x360, 150x150 -> 고해상도 w/h : 3840x2160, 저해상도 w/h : 1920x1080
-        ex. 1920x1080, 1280x720, 640x360, 150x10 -> 고/저해상도 w/h : 1920x1080
+        1920 해상도 이상인 영상 중 랜덤하게 하나를 선택, 그 영상으로 저해상도/고해상도 영상 메타데이터를 리턴해준다.
 
-        api key : pixabay full api 접근 가능용 개인키
-        pixabay API 문서 참조 : https://pixabay.com/api/docs/
+        videos key의 value 값에는 4가지 유형의 비디오가 있다. [large, medium, small, tiny]
+        해상도, bytes 순으로 정렬한 뒤 슬롯별 최소 해상도를 만족하는 가장 작은 영상을 사용한다.
+        ex. 3840x2160, 1920x1080, 1280x720, 640x360 -> 고해상도 w/h : 1920x1080, 저해상도 w/h : 1280x720
 
         :return: dict
         """
-        # 비디오 리스트 리턴 (200개)
-        response = (
-            self.session.request(
-                url="https://pixabay.com/api/videos/" +
-                "?key=25876342-aa505c23cebd2518dd1680797" +
-                "&min_width=1920&order=popular&per_page=200",
-                method="GET",
-            )
-            .json()
-            .get("hits")
-        )
+        _, picks = self.get_index("video").pick(self.remaining_bytes)
+        hires, common = picks["mainVideoHiRes"], picks["mainVideo"]
+        fetched = self.get_renditions(picks, "video/mp4")
+        video_hires_base64, video_base64 = fetched["mainVideoHiRes"][0], fetched["mainVideo"][0]
 
-        # random pick one
-        pick_one = random.choice(list(response))
-        # 필요 로컬 변수 초기화
-        width_hires_video, height_hires_video, width_video, height_video = 0, 0, 0, 0
-        hires_video_url, video_url = "", ""
-
-        # 고해상도 데이터 할당
-        for one in pick_one.get("videos"):
-            if pick_one["videos"].get(one)["width"] >= 1920:
-                hires_video_url = pick_one["videos"].get(one)["url"]
-                width_hires_video, height_hires_video = (
-                    pick_one["videos"].get(one)["width"],
-                    pick_one["videos"].get(one)["height"],
-                )
-                break
-        # 저해상도 데이터 할당
-        for one in pick_one.get("videos"):
-            if pick_one["videos"].get(one)["width"] <= 1920:
-                video_url = pick_one["videos"].get(one)["url"]
-                width_video, height_video = (
-                    pick_one["videos"].get(one)["width"],
-                    pick_one["videos"].get(one)["height"],
-                )
-                break
-
-        # base64 인코딩을 위한 작업
-        hires_video_response = self.session.request(
-            url=hires_video_url, method="GET"
-        ).content
-
-        video_response = self.session.request(url=video_url, method="GET").content
-
-        # base64 인코딩
-        video_hires_base64 = "data:video/mp4;base64," + base64.b64encode(
-            hires_video_response
-        ).decode("utf-8")
-        video_base64 = "data:video/mp4;base64," + base64.b64encode(
-            video_response
-        ).decode("utf-8")
         # return dict
         video_dict = defaultdict(dict)
         video_dict.update(
             dict(
-                videoName=pick_one.get("videos")["large"]["url"]
-                    .split("https://cdn.pixabay.com/vimeo/")[1]
-                    .split("/")[1]
-                    .split("?")[0],
+                videoName=url_name(common["url"]),
                 videoBase64=video_base64,
-                videoWidth=width_video,
-                videoHeight=height_video,
-                videoHiresName=pick_one.get("videos")["large"]["url"]
-                    .split("https://cdn.pixabay.com/vimeo/")[1]
-                    .split("/")[1]
-                    .split("?")[0],
+                videoWidth=common["width"],
+                videoHeight=common["height"],
+                videoHiresName=url_name(hires["url"]),
                 videoHiresBase64=video_hires_base64,
-                videoHiresWidth=width_hires_video,
-                videoHiresHeight=height_hires_video,
+                videoHiresWidth=hires["width"],
+                videoHiresHeight=hires["height"],
             )
         )
 
@@ -0,0 +1,257 @@
+"""
+SQLite 기반 생성 job 큐 모듈
+
+생성 흐름을 build(이미지/영상 + 메타데이터 json) -> create(NFT ID 확보, 생성 요청, LIVE 변경)
+-> shorten(URL 축약, QR) 단계로 나누고 여러 worker 프로세스(같은 파일시스템을 공유하는 여러 호스트 포함)가
+job을 lease 하여 처리한다.
+
+- lease: worker가 job을 가져가면 만료 시각(lease_expires)을 기록하고, 처리 중에는 heartbeat로 만료 시각을 연장한다.
+- 재처리: worker가 죽어서 heartbeat가 끊기면 만료된 lease는 다른 worker가 다시 가져간다.
+  단계별 최대 시도 횟수를 모두 사용한 job의 lease가 만료되면 다시 가져가지 않고 failed 로 처리한다.
+- 작가 lock: create 단계는 (에디션 유형, 작가/셀러 ID)별 lock을 잡은 worker만 진행하므로
+  같은 작가의 NFT ID 확보~생성 요청은 직렬로 처리된다.
+"""
+import json
+import sqlite3
+import time
+
+# 단계 순서 (마지막 단계를 마치면 done)
+STAGES = ("build", "create", "shorten")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    params TEXT NOT NULL,
+    author_key TEXT NOT NULL,
+    stage TEXT NOT NULL DEFAULT 'build',
+    state TEXT NOT NULL DEFAULT 'ready',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, stage);
+CREATE TABLE IF NOT EXISTS author_locks (
+    author_key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class JobQueue:
+    """
+    job 큐 클래스 (프로세스마다 별도 객체/커넥션을 생성해서 사용)
+
+    jobs.state: ready(대기) | leased(처리 중) | done(완료) | failed(재시도 횟수 초과)
+    jobs.result: 단계를 거치며 누적되는 데이터 (payloadPath, nftid, posted 등)
+    """
+    def __init__(self, path="queue.db", lease_seconds=60, max_attempts=3, wal=True):
+        """
+        :param path: SQLite 파일 경로
+        :param lease_seconds: lease 만료 시간 (heartbeat가 이 시간 동안 없으면 재처리 대상)
+        :param max_attempts: 단계별 최대 시도 횟수
+        :param wal: WAL 모드 사용 여부 (여러 호스트가 네트워크 파일시스템으로 공유하는 경우 False)
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.conn.executescript(SCHEMA)
+
+    def transaction(self):
+        """
+        쓰기 lock을 바로 잡는 트랜잭션 시작 (여러 worker가 같은 job을 동시에 가져가지 않도록)
+
+        :return: 커넥션 (with 문에서 commit/rollback 처리)
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def enqueue(self, params, author_key, count=1):
+        """
+        생성 job 등록
+
+        :param params: {"k": {...}, "v": bool, "i": bool, "o": bool}
+        :param author_key: 작가 lock 키 ("eth:100" 형태)
+        :param count: 같은 파라미터로 등록할 job 수
+        :return: 등록된 job ID 리스트
+        """
+        job_ids = []
+        with self.transaction() as conn:
+            for _ in range(count):
+                cursor = conn.execute(
+                    "INSERT INTO jobs (params, author_key, updated_at) VALUES (?, ?, ?)",
+                    (json.dumps(params, ensure_ascii=False), author_key, time.time()),
+                )
+                job_ids.append(cursor.lastrowid)
+        return job_ids
+
+    def lease(self, owner):
+        """
+        처리할 job 하나를 lease (대기 중이거나 시도 횟수가 남은 lease 만료 job 중 가장 오래된 것)
+        create 단계 job은 다른 worker가 해당 작가 lock을 잡고 있지 않을 때만 가져간다.
+        시도 횟수를 모두 사용한 job의 lease가 만료되었으면 (처리 중 worker 종료 반복) 먼저 failed 로 처리한다.
+
+        :param owner: worker 식별자 (호스트명:pid)
+        :return: job dict, 처리할 job이 없으면 None
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                "error = COALESCE(error, ?), updated_at = ? "
+                "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                ("lease 만료 (최대 시도 횟수 초과)", now, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (state = 'ready' "
+                "OR (state = 'leased' AND lease_expires < ? AND attempts < ?)) "
+                "AND NOT (stage = 'create' AND author_key IN "
+                "(SELECT author_key FROM author_locks WHERE expires >= ? AND owner != ?)) "
+                "ORDER BY id LIMIT 1",
+                (now, self.max_attempts, now, owner),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["stage"] == "create" and not self._lock_author(row["author_key"], owner, now):
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (owner, now + self.lease_seconds, now, row["id"]),
+            )
+            job = dict(row)
+            job.update(
+                lease_owner=owner,
+                attempts=row["attempts"] + 1,
+                params=json.loads(row["params"]),
+                result=json.loads(row["result"]),
+            )
+            return job
+
+    def _lock_author(self, author_key, owner, now):
+        """
+        작가 lock 획득 (비어있거나, 만료되었거나, 이미 같은 worker가 잡고 있는 경우)
+        lease 트랜잭션 안에서 호출한다.
+
+        :param author_key: 작가 lock 키
+        :param owner: worker 식별자
+        :param now: 현재 시각
+        :return: 획득 여부
+        """
+        cursor = self.conn.execute(
+            "INSERT INTO author_locks (author_key, owner, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(author_key) DO UPDATE SET "
+            "owner = excluded.owner, expires = excluded.expires "
+            "WHERE author_locks.expires < ? OR author_locks.owner = excluded.owner",
+            (author_key, owner, now + self.lease_seconds, now),
+        )
+        return cursor.rowcount == 1
+
+    def release_author(self, author_key, owner):
+        """
+        작가 lock 해제 (NFT 생성 요청이 끝나 ID가 사용된 이후)
+
+        :param author_key: 작가 lock 키
+        :param owner: worker 식별자
+        :return:
+        """
+        self.conn.execute(
+            "DELETE FROM author_locks WHERE author_key = ? AND owner = ?", (author_key, owner)
+        )
+
+    def heartbeat(self, job_id, owner, author_key=None):
+        """
+        처리 중인 job의 lease 및 작가 lock 만료 시각 연장
+
+        :param job_id: job ID
+        :param owner: worker 식별자
+        :param author_key: 잡고 있는 작가 lock 키
+        :return:
+        """
+        expires = time.time() + self.lease_seconds
+        self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ?",
+            (expires, job_id, owner),
+        )
+        if author_key:
+            self.conn.execute(
+                "UPDATE author_locks SET expires = ? WHERE author_key = ? AND owner = ?",
+                (expires, author_key, owner),
+            )
+
+    def save_result(self, job_id, result):
+        """
+        단계 진행 중 중간 결과 저장 (생성 요청 성공 후 LIVE 변경 전 등, 재처리 시 중복 생성 방지)
+
+        :param job_id: job ID
+        :param result: 누적 결과 dict
+        :return:
+        """
+        self.conn.execute(
+            "UPDATE jobs SET result = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(result, ensure_ascii=False), time.time(), job_id),
+        )
+
+    def complete(self, job, result):
+        """
+        현재 단계 완료 처리 후 다음 단계로 넘김 (마지막 단계면 done)
+
+        :param job: lease 했던 job dict
+        :param result: 누적 결과 dict
+        :return:
+        """
+        index = STAGES.index(job["stage"])
+        next_stage = STAGES[index + 1] if index + 1 < len(STAGES) else job["stage"]
+        state = "ready" if index + 1 < len(STAGES) else "done"
+        self.conn.execute(
+            "UPDATE jobs SET stage = ?, state = ?, result = ?, attempts = 0, lease_owner = NULL, "
+            "lease_expires = NULL, error = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (
+                next_stage, state, json.dumps(result, ensure_ascii=False), time.time(),
+                job["id"], job["lease_owner"],
+            ),
+        )
+
+    def fail(self, job, error):
+        """
+        현재 단계 실패 처리, 최대 시도 횟수 이내면 다시 대기 상태로 돌린다.
+
+        :param job: lease 했던 job dict
+        :param error: 에러 메시지
+        :return:
+        """
+        state = "failed" if job["attempts"] >= self.max_attempts else "ready"
+        self.conn.execute(
+            "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (state, error, time.time(), job["id"], job["lease_owner"]),
+        )
+
+    @property
+    def has_pending(self):
+        """
+        아직 처리되지 않은 (대기 중이거나 처리 중인) job 존재 여부
+
+        :return: bool
+        """
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN ('ready', 'leased')"
+        ).fetchone()
+        return row[0] > 0
+
+    @property
+    def summary(self):
+        """
+        단계/상태별 job 수
+
+        :return: {"stage/state": count}
+        """
+        rows = self.conn.execute(
+            "SELECT stage, state, COUNT(*) FROM jobs GROUP BY stage, state"
+        ).fetchall()
+        return {f"{row[0]}/{row[1]}": row[2] for row in rows}
@@ -0,0 +1,85 @@
+"""
+json 직렬화 백엔드 모듈
+
+orjson, msgspec 이 설치되어 있으면 사용하고 없으면 표준 json 모듈을 사용한다.
+백엔드와 관계없이 같은 bytes가 나오도록 공백 없는 구분자(",", ":"), utf-8 (ensure_ascii=False) 로 직렬화한다.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # 선택 설치 모듈, 없으면 다음 백엔드 사용
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 선택 설치 모듈, 없으면 다음 백엔드 사용
+    msgspec = None
+
+# 백엔드 우선순위
+BACKENDS = ("orjson", "msgspec", "json")
+# 현재 선택된 백엔드 (프로세스 전체에서 공유)
+CURRENT = {}
+
+
+def stdlib_encode(value):
+    """
+    표준 json 모듈 직렬화
+
+    :param value: 직렬화할 값
+    :return: utf-8 bytes
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def available_backends():
+    """
+    설치된 백엔드 (우선순위 순)
+
+    :return: 백엔드 이름 리스트
+    """
+    modules = dict(orjson=orjson, msgspec=msgspec, json=json)
+    return [name for name in BACKENDS if modules[name] is not None]
+
+
+def get_encoder(backend=None):
+    """
+    백엔드별 직렬화 함수
+
+    :param backend: orjson | msgspec | json, 입력하지 않으면 설치된 백엔드 중 우선순위가 가장 높은 것
+    :return: 값을 utf-8 bytes로 직렬화하는 함수
+    """
+    backend = backend or available_backends()[0]
+    if backend not in available_backends():
+        raise ValueError(
+            f"{backend} 백엔드를 사용하려면 {backend} 모듈을 설치해주세요. (pip3 install {backend})"
+        )
+    if backend == "orjson":
+        return orjson.dumps  # pylint: disable=no-member
+    if backend == "msgspec":
+        return msgspec.json.Encoder().encode
+    return stdlib_encode
+
+
+def select_backend(backend=None):
+    """
+    프로세스에서 사용할 백엔드 선택
+
+    :param backend: orjson | msgspec | json, 입력하지 않으면 설치된 백엔드 중 우선순위가 가장 높은 것
+    :return: 선택된 백엔드 이름
+    """
+    backend = backend or available_backends()[0]
+    CURRENT.update(name=backend, encode=get_encoder(backend))
+    return backend
+
+
+def encode(value):
+    """
+    선택된 백엔드로 직렬화 (선택 전이면 기본 백엔드 선택)
+
+    :param value: 직렬화할 값
+    :return: utf-8 bytes
+    """
+    if not CURRENT:
+        select_backend()
+    return CURRENT["encode"](value)
@@ -0,0 +1,269 @@
+"""
+예약 LIVE 변경 모듈
+
+--draft-only 옵션으로 DRAFT 상태까지만 생성한 에디션을 로컬 예약 파일에 등록해두고,
+목표 시각에 등록된 에디션 전체를 제한된 동시 요청 수로 한꺼번에 LIVE 상태로 변경한다.
+판매 오픈 부하 테스트는 LIVE 변경이 얼마나 몰려서 일어났는지에 좌우되므로 첫 번째 ~ 마지막 LIVE 변경 간격을 리포트한다.
+
+예약 파일은 json line 한 줄에 하나씩 {"event": "registered" | "live", "edition", "nftid", ...} 형태로 append 한다.
+이미 LIVE로 변경된 에디션은 다시 변경하지 않으므로 재실행해도 남은 에디션만 처리한다.
+"""
+import calendar
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from lib.session_request import SessionRequest
+from lib.stage_journal import read_records
+
+
+def parse_utc(value):
+    """
+    "%Y-%m-%d %H:%M:%S" 형태의 UTC 시각 문자열을 timestamp로 변환
+
+    :param value: UTC 시각 문자열
+    :return: timestamp
+    """
+    return calendar.timegm(datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timetuple())
+
+
+def percentile(values, rate):
+    """
+    정렬된 값 리스트의 백분위 값 (nearest-rank)
+
+    :param values: 오름차순 정렬된 값 리스트
+    :param rate: 0 ~ 100
+    :return: 백분위 값, 값이 없으면 None
+    """
+    if not values:
+        return None
+    index = max(int(round(rate / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class LiveSchedule:
+    """
+    예약 파일 클래스 (append-only json line)
+    """
+    def __init__(self, path="golive_schedule.jsonl"):
+        """
+        :param path: 예약 파일 경로
+        """
+        self.path = path
+        self.lock = threading.Lock()
+
+    def append(self, record):
+        """
+        예약 파일에 한 줄 기록 (기록 직후 fsync)
+
+        :param record: 기록할 dict
+        :return:
+        """
+        record["at"] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        with self.lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def register(self, edition, nftid, open_at):
+        """
+        DRAFT 상태로 생성된 에디션 등록
+
+        :param edition: eth | btc
+        :param nftid: NFT ID
+        :param open_at: 에디션 오픈 시각 (UTC 문자열)
+        :return:
+        """
+        self.append(dict(event="registered", edition=edition, nftid=nftid, openAt=open_at))
+        print(f"에디션 {nftid} 을(를) DRAFT 상태로 두고 LIVE 예약 파일에 등록했습니다: {self.path}")
+
+    def mark_live(self, entry):
+        """
+        LIVE 변경 완료 기록
+
+        :param entry: 예약 에디션 dict
+        :return:
+        """
+        self.append(dict(event="live", edition=entry["edition"], nftid=entry["nftid"]))
+
+    @property
+    def pending(self):
+        """
+        등록 후 아직 LIVE로 변경되지 않은 에디션 리스트 (오픈 시각 순)
+
+        :return: [{"edition", "nftid", "openAt"}, ...]
+        """
+        if not os.path.exists(self.path):
+            return []
+        registered, live = {}, set()
+        for record in read_records(self.path):
+            key = (record["edition"], record["nftid"])
+            if record["event"] == "registered":
+                registered[key] = dict(
+                    edition=record["edition"], nftid=record["nftid"], openAt=record["openAt"]
+                )
+            else:
+                live.add(key)
+        entries = [entry for key, entry in registered.items() if key not in live]
+        return sorted(entries, key=lambda x: (x["openAt"], x["nftid"]))
+
+
+class LiveScheduler:
+    """
+    목표 시각에 예약 에디션을 동시에 LIVE로 변경하는 클래스
+
+    worker 스레드마다 별도 requests 세션을 사용하며, 목표 시각 전에 커넥션을 미리 연결해두고 기다렸다가 동시에 요청한다.
+    목표 시각을 지정하지 않으면 에디션별로 예약 파일에 기록된 오픈 시각(openAt)에 요청한다.
+    """
+    def __init__(  # pylint: disable=too-many-arguments
+        self, schedule, addr=None, workers=16, retries=3, *, session_factory=requests.Session
+    ):
+        """
+        :param schedule: LiveSchedule 객체
+        :param addr: 백오피스 Admin API 주소
+        :param workers: 동시 요청 수
+        :param retries: 에디션별 재시도 횟수
+        :param session_factory: worker 스레드별 requests 세션 생성 함수 (cassette 연결 시 변경)
+        """
+        self.schedule = schedule
+        self.addr = addr
+        self.workers = workers
+        self.retries = retries
+        self.session_factory = session_factory
+        self.local = threading.local()
+
+    def thread_session(self, entry):
+        """
+        현재 스레드의 requests 세션 (처음 사용 시 컨트랙트 조회로 커넥션을 미리 연결)
+        미리 연결에 실패하면 세션을 저장하지 않으므로 다음 호출에서 다시 연결한다.
+
+        :param entry: 예약 에디션 dict
+        :return: requests.Session
+        """
+        if not hasattr(self.local, "session"):
+            http_session = self.session_factory()
+            self.make_request(entry, http_session).get_used_nft_id(entry["nftid"])
+            self.local.session = http_session
+        return self.local.session
+
+    def make_request(self, entry, http_session):
+        """
+        예약 에디션의 SessionRequest 생성 (NFT ID를 넘겨주므로 ID 조회 없음)
+
+        :param entry: 예약 에디션 dict
+        :param http_session: requests 세션
+        :return: SessionRequest
+        """
+        return SessionRequest(
+            edition=entry["edition"], addr=self.addr, nftid=entry["nftid"],
+            http_session=http_session,
+        )
+
+    def retry(self, call):
+        """
+        실패 시 지수 backoff 로 최대 retries 번 재시도하며 호출
+
+        :param call: 호출할 함수
+        :return: (리턴값, 시도 횟수, 마지막 에러), 성공하면 에러는 None
+        """
+        error = None
+        for attempt in range(self.retries + 1):
+            try:
+                return call(), attempt + 1, None
+            except (ValueError, requests.RequestException) as caught:
+                error = caught
+                if attempt < self.retries:
+                    time.sleep(min(0.1 * 2 ** attempt, 2))
+        return None, self.retries + 1, error
+
+    def flip(self, entry, target=None):
+        """
+        목표 시각까지 기다린 뒤 LIVE로 변경 (커넥션 미리 연결, LIVE 변경 모두 실패 시 재시도)
+
+        :param entry: 예약 에디션 dict
+        :param target: 목표 시각 timestamp, 없으면 에디션의 오픈 시각(openAt)
+        :return: 결과 dict
+        """
+        target = target if target else parse_utc(entry["openAt"])
+        result = dict(entry, attempts=0, target=target)
+        reqsession, _, error = self.retry(
+            lambda: self.make_request(entry, self.thread_session(entry))
+        )
+        if error:
+            return dict(result, status="failed", error=f"warm-up: {error}")
+        delay = target - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        def send():
+            result["sentAt"] = time.time()
+            reqsession.set_live()
+
+        _, result["attempts"], error = self.retry(send)
+        if error:
+            result.update(status="failed", error=str(error))
+            return result
+        result.update(status="live", liveAt=time.time(), error=None)
+        self.schedule.mark_live(entry)
+        return result
+
+    def run(self, target=None):
+        """
+        예약 에디션 전체 LIVE 변경
+
+        :param target: 목표 시각 timestamp, 없으면 에디션별로 기록된 오픈 시각(openAt)
+        :return: (에디션별 결과 리스트, 리포트 dict)
+        """
+        entries = self.schedule.pending
+        if not entries:
+            print("LIVE로 변경할 예약 에디션이 없습니다.")
+            return [], {}
+        at = (
+            datetime.utcfromtimestamp(target).strftime("%Y-%m-%d %H:%M:%S") if target
+            else f"{entries[0]['openAt']} ~ {entries[-1]['openAt']} (openAt)"
+        )
+        print(
+            f"예약 에디션 {len(entries)}개를 {at} (UTC)에 "
+            f"동시 {self.workers}개씩 LIVE로 변경합니다."
+        )
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(lambda entry: self.flip(entry, target), entries))
+        return results, self.report(results)
+
+    @staticmethod
+    def report(results):
+        """
+        LIVE 변경 결과 리포트 (에디션별 목표 시각 대비 지연, 첫 번째 ~ 마지막 LIVE 변경 간격)
+
+        :param results: 에디션별 결과 리스트
+        :return: 리포트 dict
+        """
+        live = sorted((x for x in results if x["status"] == "live"), key=lambda x: x["liveAt"])
+        live_at = [x["liveAt"] for x in live]
+        lags = sorted(round((x["liveAt"] - x["target"]) * 1000, 1) for x in live)
+        report = dict(
+            total=len(results),
+            live=len(live_at),
+            failed=len(results) - len(live_at),
+            retried=len([x for x in results if x["attempts"] > 1]),
+            spreadMs=round((live_at[-1] - live_at[0]) * 1000, 1) if live_at else None,
+            lagP50Ms=percentile(lags, 50),
+            lagP99Ms=percentile(lags, 99),
+            lagMaxMs=lags[-1] if lags else None,
+        )
+        print(
+            f"LIVE 변경 {report['live']} / 전체 {report['total']} (실패 {report['failed']}, "
+            f"재시도 {report['retried']})"
+        )
+        if live_at:
+            print(
+                f"첫 번째 ~ 마지막 LIVE 간격 {report['spreadMs']}ms, 목표 시각 대비 지연 "
+                f"p50 {report['lagP50Ms']}ms / p99 {report['lagP99Ms']}ms / "
+                f"max {report['lagMaxMs']}ms"
+            )
+        return report
@@ -0,0 +1,308 @@
+"""
+생성 엔드포인트 open-loop 부하 생성 모듈
+
+쉘 반복문으로 create_nft 를 호출하는 방식(closed-loop)은 응답이 느려지면 보내는 요청 수도 같이 줄어들어
+백오피스의 tail latency가 가려진다. (coordinated omission)
+이 모듈은 요청마다 예정 전송 시각을 미리 정해두고 (고정 또는 선형 증가 도착률), 응답 여부와 관계없이 예정 시각에 요청을 보낸다.
+지연 시간은 실제 전송 시각이 아닌 예정 전송 시각부터 측정해서 HDR 방식 히스토그램에 기록한다.
+
+메타데이터 json(바디)은 부하 생성 전에 NFT ID 자리 앞/뒤로 나눈 템플릿 하나만 만들어둔다.
+- 압축 옵션이 없으면 전송 스레드에서 템플릿에 NFT ID만 끼워넣으므로 메모리에는 템플릿과 전송 중인 바디만 올라간다.
+- 압축 옵션이 있으면 압축 CPU 시간이 전송 시각을 밀어내지 않도록 부하 시작 전에 요청 수만큼 미리 압축해두고,
+  전송한 바디부터 메모리에서 해제한다. (미리 압축한 바디 크기만큼 메모리 사용량이 요청 수에 비례)
+동시 요청 수가 최대치인 상태에서 예정 시각이 된 요청은 대기열에 쌓지 않고 누락(dropped)으로 기록한다.
+"""
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from lib.metadata_handler import MetadataHandler
+
+# 바디를 만들 때 NFT ID 자리에 넣어두는 자리표시 값
+ID_PLACEHOLDER = "@@nftid@@"
+
+
+class LatencyHistogram:
+    """
+    HDR 방식 지연 시간 히스토그램 (마이크로초 단위, 유효 숫자 precision_bits 비트 유지)
+    값 범위와 관계없이 버킷 수가 로그 단위로만 늘어나므로 요청 수가 많아도 메모리가 일정하다.
+    """
+    def __init__(self, precision_bits=7):
+        """
+        :param precision_bits: 버킷 내 유효 비트 수 (7 -> 상대 오차 1% 이내)
+        """
+        self.precision_bits = precision_bits
+        self.counts = {}
+        self.total = 0
+        self.max_value = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        """
+        지연 시간 기록
+
+        :param seconds: 지연 시간 (초)
+        :return:
+        """
+        value = max(int(seconds * 1_000_000), 0)
+        shift = max(value.bit_length() - self.precision_bits, 0)
+        bucket = (shift, value >> shift)
+        with self.lock:
+            self.counts[bucket] = self.counts.get(bucket, 0) + 1
+            self.total += 1
+            self.max_value = max(self.max_value, value)
+
+    def percentile(self, rate):
+        """
+        백분위 지연 시간 (버킷 상한값 기준)
+
+        :param rate: 0 ~ 100
+        :return: 지연 시간 (ms), 기록이 없으면 None
+        """
+        if not self.total:
+            return None
+        rank = max(math.ceil(rate / 100 * self.total), 1)
+        seen = 0
+        for shift, base in sorted(self.counts, key=lambda x: x[1] << x[0]):
+            seen += self.counts[(shift, base)]
+            if seen >= rank:
+                return round(min(((base + 1) << shift) - 1, self.max_value) / 1000, 2)
+        return round(self.max_value / 1000, 2)
+
+    @property
+    def summary(self):
+        """
+        p50/p90/p99/p99.9/max 요약 (ms)
+
+        :return: dict
+        """
+        return dict(
+            count=self.total,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+            p999=self.percentile(99.9),
+            max=round(self.max_value / 1000, 2),
+        )
+
+
+def arrival_offsets(rate, duration, ramp_to=None):
+    """
+    요청별 예정 전송 시각 (시작 시각 기준 초)
+    ramp_to 입력 시 도착률이 rate에서 ramp_to까지 duration 동안 선형으로 증가한다.
+
+    :param rate: 초당 요청 수 (시작 도착률)
+    :param duration: 부하 시간 (초)
+    :param ramp_to: 종료 시점 도착률
+    :return: 예정 전송 시각 리스트
+    """
+    if not ramp_to or ramp_to == rate:
+        return [index / rate for index in range(int(rate * duration))]
+    # 누적 요청 수 N(t) = rate * t + (ramp_to - rate) * t^2 / (2 * duration) 를 t에 대해 풀어서 계산
+    slope = (ramp_to - rate) / duration
+    total = int(rate * duration + slope * duration ** 2 / 2)
+    return [
+        (-rate + math.sqrt(rate ** 2 + 2 * slope * index)) / slope for index in range(total)
+    ]
+
+
+class LoadGenerator:  # pylint: disable=too-many-instance-attributes
+    """
+    생성 엔드포인트 open-loop 부하 생성 클래스
+    """
+    def __init__(self, args, max_inflight=64):
+        """
+        :param args: 파싱된 파라미터 (MetadataHandler.parsing, -k/-v/--backoffice/--compress 등)
+        :param max_inflight: 동시에 처리 중인 최대 요청 수 (가득 찬 상태에서 예정 시각이 된 요청은 누락으로 기록)
+        """
+        self.max_inflight = max_inflight
+        self.slots = threading.BoundedSemaphore(max_inflight)
+        self.handler = MetadataHandler(args=args)
+        self.local = threading.local()
+        self.histogram = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.errors = {}
+        self.lock = threading.Lock()
+
+    def build_template(self, path="loadgen_payload.json"):
+        """
+        NFT ID 자리를 기준으로 앞/뒤로 나눈 요청 바디 템플릿 생성
+
+        :param path: 바디 템플릿 json 파일 경로
+        :return: (NFT ID 앞 bytes, NFT ID 뒤 bytes)
+        """
+        self.handler.fetch_media()
+        self.handler.update_metadata_dict()
+        self.handler.jsondict["id"] = ID_PLACEHOLDER
+        self.handler.remove_json_file(path)
+        self.handler.write_dict_data_to_json(path)
+        with open(path, "rb") as file:
+            head, tail = file.read().split(json.dumps(ID_PLACEHOLDER).encode("utf-8"), 1)
+        return head, tail
+
+    def prepare_bodies(self, template, count):
+        """
+        요청 순번별 바디를 리턴하는 함수 준비 (사용 가능한 NFT ID부터 순서대로 사용, 부하 시작 전에 호출)
+        압축 옵션이 없으면 전송 시 템플릿에 NFT ID만 끼워넣고, 압축 옵션이 있으면 요청 수만큼 미리 압축해둔다.
+
+        :param template: (NFT ID 앞 bytes, NFT ID 뒤 bytes)
+        :param count: 요청 수
+        :return: 요청 순번 -> 요청 바디 함수 (미리 압축한 바디는 한 번 꺼내면 메모리에서 해제)
+        """
+        head, tail = template
+        first_id = self.handler.nft_id
+        print(
+            f"요청 바디 템플릿 {len(head) + len(tail)} bytes, "
+            f"NFT ID {first_id} ~ {first_id + count - 1}"
+        )
+
+        def splice(index):
+            return b"".join((head, str(first_id + index).encode("utf-8"), tail))
+
+        compressor = self.handler.session.compressor
+        if not compressor:
+            return splice
+        started = time.perf_counter()
+        compressed = [compressor.compress_bytes(splice(index)) for index in range(count)]
+        print(
+            f"{compressor.encoding} 압축 바디 {count}개 준비 완료 "
+            f"({sum(len(body) for body in compressed)} bytes, {time.perf_counter() - started:.1f}s)"
+        )
+
+        def take(index):
+            body, compressed[index] = compressed[index], None
+            return body
+
+        return take
+
+    def send(self, bodies, index, intended):
+        """
+        생성 요청 하나 전송 후 예정 전송 시각 기준 지연 시간 기록 (끝나면 동시 요청 슬롯 반환)
+
+        :param bodies: 요청 순번 -> 요청 바디 함수
+        :param index: 요청 순번
+        :param intended: 예정 전송 시각 (perf_counter 기준)
+        :return:
+        """
+        try:
+            if not hasattr(self.local, "session"):
+                self.local.session = requests.Session()
+                self.local.session.headers.update(self.handler.session.headers)
+            reqsession = self.handler.session
+            headers = {}
+            if reqsession.compressor:
+                headers["content-encoding"] = reqsession.compressor.encoding
+            body = bodies(index)
+            sent = time.perf_counter()
+            try:
+                response = self.local.session.request(
+                    method="POST", url=reqsession.edition_addr, data=body, headers=headers
+                )
+                error = None if response.status_code == 200 else f"HTTP {response.status_code}"
+            except requests.RequestException as exception:
+                error = type(exception).__name__
+            done = time.perf_counter()
+            self.histogram.record(done - intended)
+            self.service.record(done - sent)
+            if error:
+                self.count_error(error)
+        finally:
+            self.slots.release()
+
+    def count_error(self, error):
+        """
+        에러 유형별 건수 기록
+
+        :param error: 에러 유형 (HTTP 상태 코드, 예외 이름, dropped)
+        :return:
+        """
+        with self.lock:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def dispatch(self, offsets, bodies):
+        """
+        예정 전송 시각마다 요청 전송 (응답을 기다리지 않음)
+        동시 요청 슬롯이 모두 사용 중이면 대기열에 쌓지 않고 누락(dropped)으로 기록한다.
+
+        :param offsets: 예정 전송 시각 리스트 (시작 시각 기준 초)
+        :param bodies: 요청 순번 -> 요청 바디 함수
+        :return: (시작 시각, 전송 완료까지 걸린 시간, 예정 시각 대비 최대 전송 지연)
+        """
+        started = time.perf_counter()
+        lateness = 0.0
+        with ThreadPoolExecutor(max_workers=self.max_inflight) as executor:
+            for index, offset in enumerate(offsets):
+                intended = started + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lateness = max(lateness, -delay)
+                # 슬롯은 send 에서 요청이 끝나면 반환
+                if not self.slots.acquire(blocking=False):  # pylint: disable=consider-using-with
+                    # 미리 압축해둔 바디는 꺼내서 해제
+                    bodies(index)
+                    self.count_error("dropped")
+                    continue
+                executor.submit(self.send, bodies, index, intended)
+            dispatched = time.perf_counter() - started
+        return started, dispatched, lateness
+
+    def run(self, rate, duration, ramp_to=None):
+        """
+        부하 생성 후 리포트
+
+        :param rate: 초당 요청 수 (시작 도착률)
+        :param duration: 부하 시간 (초)
+        :param ramp_to: 종료 시점 도착률
+        :return: 리포트 dict
+        """
+        offsets = arrival_offsets(rate, duration, ramp_to)
+        bodies = self.prepare_bodies(self.build_template(), len(offsets))
+        print(f"{duration}s 동안 {rate} -> {ramp_to or rate} 건/s 로 {len(offsets)}건 전송합니다.")
+        started, dispatched, lateness = self.dispatch(offsets, bodies)
+        elapsed = time.perf_counter() - started
+
+        failed = sum(self.errors.values())
+        dropped = self.errors.get("dropped", 0)
+        report = dict(
+            requests=len(offsets),
+            dropped=dropped,
+            targetRate=round(len(offsets) / duration, 1),
+            sendRate=round((len(offsets) - dropped) / dispatched, 1) if dispatched else None,
+            achievedRate=round((len(offsets) - failed) / elapsed, 1),
+            errorRate=round(failed / len(offsets), 4) if offsets else 0,
+            errors=self.errors,
+            maxDispatchLagMs=round(lateness * 1000, 2),
+            latencyMs=self.histogram.summary,
+            serviceTimeMs=self.service.summary,
+        )
+        self.print_report(report)
+        return report
+
+    @staticmethod
+    def print_report(report):
+        """
+        부하 결과 출력
+
+        :param report: 리포트 dict
+        :return:
+        """
+        latency, service = report["latencyMs"], report["serviceTimeMs"]
+        print(
+            f"요청 {report['requests']}건 (누락 {report['dropped']}건), 목표 {report['targetRate']} 건/s, "
+            f"전송 {report['sendRate']} 건/s, 성공 처리 {report['achievedRate']} 건/s, "
+            f"에러율 {report['errorRate'] * 100:.2f}% {report['errors']}"
+        )
+        print(
+            f"지연 시간 (예정 전송 시각 기준) p50 {latency['p50']}ms / p99 {latency['p99']}ms / "
+            f"p99.9 {latency['p999']}ms / max {latency['max']}ms"
+        )
+        print(
+            f"서비스 시간 (실제 전송 시각 기준) p50 {service['p50']}ms / p99 {service['p99']}ms / "
+            f"p99.9 {service['p999']}ms / max {service['max']}ms"
+        )
@@ -0,0 +1,138 @@
+"""
+단계별 메모리 사용량 측정 모듈
+
+생성 흐름의 단계(get_all_videos, set_image_video, write_dict_data_to_json, create_nft 등)마다
+tracemalloc 기준 Python 할당 peak 와 프로세스 RSS peak 를 기록한다.
+
+RSS peak 는 Linux의 /proc/self/status (VmHWM) 값을 사용하며, 단계 시작 시 /proc/self/clear_refs 로 peak를 초기화한다.
+(초기화가 불가능한 환경에서는 프로세스 시작 이후 누적 peak 로 기록된다.)
+
+메모리 예산이 있으면 리포트 여부와 관계없이 단계마다 실제 RSS peak 를 측정해서 예산을 넘은 경우 에러를 발생시킨다.
+(peak 초기화가 불가능한 환경에서는 누적 peak 대신 단계 종료 시점의 RSS 로 확인)
+"""
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows 환경 (RSS peak 측정 생략)
+    resource = None
+
+MB = 1024 * 1024
+
+
+def read_rss():
+    """
+    현재 RSS, peak RSS 조회 (bytes)
+
+    :return: (현재 RSS, peak RSS)
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as status:
+            values = dict(line.split(":", 1) for line in status if ":" in line)
+        return int(values["VmRSS"].split()[0]) * 1024, int(values["VmHWM"].split()[0]) * 1024
+    except (OSError, KeyError, ValueError):
+        if resource is None:
+            return 0, 0
+        # Linux 외 환경: ru_maxrss 단위가 macOS는 bytes, 그 외는 KB
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = peak if sys.platform == "darwin" else peak * 1024
+        return peak, peak
+
+
+def reset_rss_peak():
+    """
+    peak RSS 초기화 (Linux 4.0 이상에서만 가능)
+
+    :return: 초기화 성공 여부
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryTracker:
+    """
+    단계별 메모리 peak 기록 클래스
+    enabled=False 이고 예산이 없는 경우 측정 없이 단계만 실행하므로 핸들러에 기본값으로 두어도 부하가 없다.
+    """
+    def __init__(self, enabled=False, budget=None):
+        """
+        :param enabled: 측정 여부 (tracemalloc 사용)
+        :param budget: 메모리 예산 (bytes), 단계 RSS peak가 예산을 넘으면 에러 발생 (리포트에도 표시)
+        """
+        self.enabled = enabled
+        self.budget = budget
+        self.stages = []
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, name, enforce=True):
+        """
+        단계 실행 구간의 메모리 peak 측정 (예산이 있으면 단계가 끝난 뒤 실제 RSS 로 예산 확인)
+
+        :param name: 단계명
+        :param enforce: 예산 초과 시 에러 발생 여부 (False 면 리포트에만 표시)
+        :return:
+        """
+        if not self.enabled and not self.budget:
+            yield
+            return
+        if self.enabled and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        peak_reset = reset_rss_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            rss, rss_peak = read_rss()
+            used = rss_peak if peak_reset else rss
+            over_budget = bool(self.budget and used > self.budget)
+            if self.enabled:
+                current, peak = tracemalloc.get_traced_memory()
+                self.stages.append(
+                    dict(
+                        stage=name,
+                        seconds=round(time.perf_counter() - started, 3),
+                        pyCurrentMB=round(current / MB, 1),
+                        pyPeakMB=round(peak / MB, 1),
+                        rssMB=round(rss / MB, 1),
+                        rssPeakMB=round(rss_peak / MB, 1),
+                        overBudget=over_budget,
+                    )
+                )
+        if over_budget and enforce:
+            raise ValueError(
+                f"{name} 단계 RSS {used / MB:.1f}MB 가 메모리 예산 {self.budget / MB:.0f}MB 를 넘었습니다."
+            )
+
+    def print_report(self, path=None):
+        """
+        단계별 메모리 리포트 출력 (경로 입력 시 json 파일로도 저장)
+
+        :param path: 리포트 json 파일 경로
+        :return:
+        """
+        if not self.enabled:
+            return
+        print("단계별 메모리 사용량 (MB)")
+        print(
+            f"{'stage':<26}{'py peak':>10}{'py now':>10}"
+            f"{'rss peak':>10}{'rss now':>10}{'sec':>8}"
+        )
+        for item in self.stages:
+            mark = " (예산 초과)" if item["overBudget"] else ""
+            print(
+                f"{item['stage']:<26}{item['pyPeakMB']:>10}{item['pyCurrentMB']:>10}"
+                f"{item['rssPeakMB']:>10}{item['rssMB']:>10}{item['seconds']:>8}{mark}"
+            )
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(self.stages, file, ensure_ascii=False, indent=2)
@@ -10,15 +10,151 @@ import argparse
 import json
 import os
 import calendar
+import functools
 from collections import defaultdict
 from datetime import datetime, timedelta
 import qrcode
 import bitlyshortener
 
 # import pyshorteners
+from lib.body_compressor import BodyCompressor
+from lib.http_cassette import add_cassette_arguments, attach_cassette, shorten_url
 from lib.image_handler import ImageHandler
+from lib.json_codec import BACKENDS, select_backend
+from lib.memory_tracker import MB, MemoryTracker
+from lib.payload_writer import encode_field, write_payload
 from lib.session_request import SessionRequest
 
+# pay 파라미터별 결제 수단 활성화 조합 (0: 비활성화, 1: 활성화)
+# 카드 결제는 현재 Scope Out 이므로 모두 0
+PAY_METHODS = {
+    "coinmobile": dict(
+        allowPaymentCard=0, allowPaymentBankTransfer=0, allowPaymentCoin=1, allowPaymentMobile=1
+    ),
+    "coinbank": dict(
+        allowPaymentCard=0, allowPaymentBankTransfer=1, allowPaymentCoin=1, allowPaymentMobile=0
+    ),
+    "mobile": dict(
+        allowPaymentCard=0, allowPaymentBankTransfer=0, allowPaymentCoin=0, allowPaymentMobile=1
+    ),
+    "bank": dict(
+        allowPaymentCard=0, allowPaymentBankTransfer=1, allowPaymentCoin=0, allowPaymentMobile=0
+    ),
+}
+
+
+def is_airdrop(kwargs):
+    """
+    coin 및 krw 파라미터 미입력 및 옥션이 아닐 경우 에어드롭 에디션으로 판정
+
+    :param kwargs: -k 로 입력받은 key/value 파라미터
+    :return: bool
+    """
+    return (
+        not kwargs.get("coin")
+        and not kwargs.get("krw")
+        and not kwargs.get("edition") == "auction"
+    )
+
+
+def get_sell_type(kwargs):
+    """
+    옥션(1), 에디션(2) 구분
+
+    :param kwargs: -k 로 입력받은 key/value 파라미터
+    :return: sellType
+    """
+    return 1 if kwargs.get("edition") == "auction" else 2
+
+
+def check_edition_kwargs(kwargs):  # pylint: disable=too-many-return-statements
+    """
+    -k 파라미터 유효성 검사 (README 주의 사항 및 set_pay_method, set_price, set_totalsupply 규칙)
+    main.py(update_metadata_dict), 조합 매트릭스, 생성 데몬, job 큐가 모두 같은 검사를 사용한다.
+
+    - coin, krw, totalSupply 는 숫자
+    - 옥션은 금액(coin/krw), 결제수단(pay) 파라미터 없이 생성
+    - pay 파라미터는 4가지 유형만 가능하고, 에어드롭/옥션은 pay 파라미터 없이 자동 설정
+    - pay 유형이 활성화하는 결제 수단과 입력한 금액이 맞아야 한다. (코인 결제는 coin, 모든 유형은 krw 금액 필요)
+
+    :param kwargs: -k 로 입력받은 key/value 파라미터
+    :return: 오류 메시지, 유효하면 None
+    """
+    for key in ("coin", "krw", "totalSupply"):
+        value = kwargs.get(key)
+        try:
+            if value:
+                int(value)
+        except ValueError:
+            return f"{key} 파라미터는 숫자로 입력해야 합니다: {value}"
+    pay = kwargs.get("pay")
+    if get_sell_type(kwargs) == 1 and (kwargs.get("coin") or kwargs.get("krw") or pay):
+        return "옥션은 금액/결제수단 파라미터 없이 생성해야 합니다."
+    if not pay:
+        return None
+    if pay not in PAY_METHODS:
+        return f"결제수단을 잘못 입력하셨습니다: {pay}"
+    if is_airdrop(kwargs):
+        return "에어드롭은 pay 파라미터 없이 자동 설정됩니다."
+    if bool(PAY_METHODS[pay]["allowPaymentCoin"]) != bool(kwargs.get("coin")):
+        return f"{pay} 결제수단과 coin 금액 입력이 맞지 않습니다."
+    if not kwargs.get("krw"):
+        return f"{pay} 결제수단은 krw 금액이 필요합니다."
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def load_static_data(path="./static.json"):
+    """
+    static.json 파일을 프로세스당 한 번만 읽어서 재사용 (여러 에디션을 연속 생성하는 경우 파일 I/O, 파싱 생략)
+    리턴받은 dict는 공유되므로 직접 수정하지 말고 update 등으로 복사해서 사용해야 한다.
+
+    :param path: 정적 데이터 파일 경로
+    :return: dict
+    """
+    with open(path, "r", encoding="utf-8") as stat:
+        return json.load(stat)
+
+
+@functools.lru_cache(maxsize=None)
+def load_static_fragments(path="./static.json"):
+    """
+    static.json 필드별 직렬화 결과를 프로세스당 한 번만 만들어서 재사용 (메타데이터 json 파일 기록 시 그대로 사용)
+    load_static_data 와 같은 값 객체를 들고 있으므로 값이 바뀌지 않은 필드만 골라낼 수 있다.
+
+    :param path: 정적 데이터 파일 경로
+    :return: {key: (값, '"key":value' bytes)}
+    """
+    return {
+        key: (value, encode_field(key, value)) for key, value in load_static_data(path).items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_shortener():
+    """
+    bit.ly shortener 객체를 프로세스당 한 번만 생성해서 재사용 (토큰 검증 및 축약 결과 캐시 유지)
+
+    tokens_pool: 계정별 개인키 리스트
+    (여러 키 존재 이유: 계정별로 50개만 free 제공, 랜덤하게 하나의 키를 가져와서 그 키를 통해 URL shortening 진행)
+
+    :return: bitlyshortener.Shortener
+    """
+    # customize account token
+    # tokens_pool = ["8e0124e426e702b3d859baba8782af7ea366edb9",
+    # "fc38fdde6ffd136d53c981a1076d175a75c9cf43",
+    # "6d17056c5d5e637f71207f700a8e4c84ef2db5a6",
+    # "8f5619e47825b957bcfc67bb0fe6ef8f92da3b58",
+    # "d99ce4c2ffe0b47d3b9f28d05c41fa6299b9231f"]
+    tokens_pool = [
+        "fc38fdde6ffd136d53c981a1076d175a75c9cf43",
+        "6d17056c5d5e637f71207f700a8e4c84ef2db5a6",
+        "8f5619e47825b957bcfc67bb0fe6ef8f92da3b58",
+        "d99ce4c2ffe0b47d3b9f28d05c41fa6299b9231f",
+        "57602ac16229f873da755e029fc4bc833acb78ae",
+    ]
+    return bitlyshortener.Shortener(tokens=tokens_pool, max_cache_size=256)
+
 
 class ParseKwargs(argparse.Action):
     """
@@ -42,35 +178,74 @@ class ParseKwargs(argparse.Action):
             getattr(namespace, self.dest)[key] = value
 
 
-class MetadataHandler:
+class MetadataHandler:  # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """
     실질적으로 메타데이터 핸들링하는 클래스
 
     NFT 생성에 필요한 메타데이터 개별 key마다 개별 기능 안에서 각각 업데이트하는 구조
     정적 데이터는 별도 파일에서 불러온 뒤 한꺼번에 업데이트하며 그 외 입력받을 필요가 있는 메타데이터들은 개별 기능으로 대응하였음
     """
-    def __init__(self):
+    def __init__(self, args=None, nft_id=None, http_session=None):
         """
         해당 클래스 객체를 생성하면 오늘, 내일 날짜를 기본 런타임에서 가져와 할당해준다.
         그 외 파싱된 파라미터 데이터, Admin API 요청을 위한 세션 객체, NFT ID, 메타데이터 업데이트를 위한 객체 초기화가 있다.
+
+        :param args: 파싱된 파라미터 (없으면 커맨드라인 입력을 파싱)
+        :param nft_id: 이미 확보한 NFT ID (재실행 시), 없으면 세션 객체에서 사용 가능한 ID를 조회
+        :param http_session: 여러 에디션에서 공유할 requests 세션 (매트릭스/데몬 실행 시)
+        --record / --replay 옵션이 있으면 세션에 cassette를 연결하고 NFT ID 조회부터 기록/재생한다.
         """
         self.today = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
         self.tomorrow = (datetime.utcnow() + timedelta(days=1)).strftime(
             "%Y-%m-%d %H:%M:%S"
         )
-        self.args = self.parsing()
+        self.args = args if args else self.parsing()
         self.session = SessionRequest(
-            edition=self.args.k.get("edition"), author_seller_id=self.args.k.get("id")
+            edition=self.args.k.get("edition"),
+            author_seller_id=self.args.k.get("id"),
+            addr=self.args.backoffice,
+            compressor=self.make_compressor(self.args),
+            nftid=nft_id,
+            http_session=attach_cassette(self.args, http_session),
         )
         self.nft_id = self.session.nftid
         self.jsondict = defaultdict(dict)
+        self.media = {}
+        self.memory = MemoryTracker(
+            enabled=self.args.memory_report, budget=self.memory_budget(self.args)
+        )
+        if self.args.json_backend:
+            select_backend(self.args.json_backend)
+
+    @staticmethod
+    def memory_budget(args):
+        """
+        --max-memory 옵션(MB)을 bytes 단위 메모리 예산으로 변환
+
+        :param args: 파싱된 파라미터
+        :return: 메모리 예산 (bytes), 옵션이 없으면 None
+        """
+        return args.max_memory * MB if args.max_memory else None
+
+    @staticmethod
+    def make_compressor(args):
+        """
+        --compress 옵션이 있으면 생성 요청 바디 압축 객체 생성
+
+        :param args: 파싱된 파라미터
+        :return: BodyCompressor, 옵션이 없으면 None
+        """
+        if args.compress:
+            return BodyCompressor(args.compress, args.compress_level)
+        return None
 
     @staticmethod
-    def parsing():
+    def parsing(argv=None):
         """
         입력 파라미터 파싱
         입력받는 파라미터를 key/value로 입력받거나 단순 flag 형태로 받게 처리하였음
 
+        :param argv: 파싱할 파라미터 리스트, 없으면 커맨드라인 입력을 파싱
         :return:
         """
         parser = argparse.ArgumentParser()
@@ -78,7 +253,46 @@ class MetadataHandler:
         parser.add_argument("-v", help="add video option", action="store_true")
         parser.add_argument("-i", help="add intalk only option", action="store_true")
         parser.add_argument("-o", help="add offline option", action="store_true")
-        args = parser.parse_args()
+        parser.add_argument(
+            "--backoffice", help="backoffice admin API base url (ex. local mock server)"
+        )
+        parser.add_argument(
+            "--compress", help="compress create request body", choices=["gzip", "zstd"]
+        )
+        parser.add_argument("--compress-level", help="compression level", type=int)
+        parser.add_argument(
+            "--resume", help="continue from the last completed stage", action="store_true"
+        )
+        parser.add_argument(
+            "--journal", help="stage journal file path", default="stage_journal.jsonl"
+        )
+        parser.add_argument(
+            "--memory-report", help="print per-stage memory peaks", action="store_true"
+        )
+        parser.add_argument(
+            "--draft-only", help="create as DRAFT and register in the go-live schedule",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--schedule", help="go-live schedule file path", default="golive_schedule.jsonl"
+        )
+        parser.add_argument(
+            "--probe", help="measure time until the edition is visible", action="store_true"
+        )
+        parser.add_argument("--public-base", help="public detail page base url (ex. local mock)")
+        parser.add_argument(
+            "--probe-timeout", help="max seconds to wait for visibility", type=float, default=60
+        )
+        parser.add_argument(
+            "--json-backend", help="json serializer (default: fastest installed)", choices=BACKENDS
+        )
+        parser.add_argument(
+            "--max-memory", type=int,
+            help="memory budget in MB (smaller renditions, spill to disk, fail over budget)",
+        )
+        add_cassette_arguments(parser)
+        parser.add_argument("--seed", help="random seed for media picks", type=int)
+        args = parser.parse_args(argv)
         return args
 
     def set_author_seller_id(self):
@@ -164,9 +378,7 @@ class MetadataHandler:
 
         :return:
         """
-        self.jsondict.update(
-            dict(sellType=1 if self.args.k.get("edition") == "auction" else 2)
-        )
+        self.jsondict.update(dict(sellType=get_sell_type(self.args.k)))
 
     def set_nft_id(self):
         """
@@ -244,11 +456,7 @@ class MetadataHandler:
         :return:
         """
         # coin 및 krw 파라미터 미입력 및 옥션이 아닐 경우 에어드롭 에디션 판정하여 설정
-        if (
-            not self.args.k.get("coin")
-            and not self.args.k.get("krw")
-            and not self.args.k.get("edition") == "auction"
-        ):
+        if is_airdrop(self.args.k):
             transfer_agreement = "contract_v2_airdrop"
         # 그 외에는 통합버전 양수도계약서 적용
         else:
@@ -276,53 +484,15 @@ class MetadataHandler:
 
         :return:
         """
-        if self.args.k.get("pay") == "coinmobile":
-            self.jsondict.update(
-                dict(
-                    allowPaymentCard=0,
-                    allowPaymentBankTransfer=0,
-                    allowPaymentCoin=1,
-                    allowPaymentMobile=1,
-                )
-            )
-        elif self.args.k.get("pay") == "coinbank":
-            self.jsondict.update(
-                dict(
-                    allowPaymentCard=0,
-                    allowPaymentBankTransfer=1,
-                    allowPaymentCoin=1,
-                    allowPaymentMobile=0,
-                )
-            )
-        elif self.args.k.get("pay") == "mobile":
-            self.jsondict.update(
-                dict(
-                    allowPaymentCard=0,
-                    allowPaymentBankTransfer=0,
-                    allowPaymentCoin=0,
-                    allowPaymentMobile=1,
-                )
-            )
-        elif self.args.k.get("pay") == "bank":
-            self.jsondict.update(
-                dict(
-                    allowPaymentCard=0,
-                    allowPaymentBankTransfer=1,
-                    allowPaymentCoin=0,
-                    allowPaymentMobile=0,
-                )
-            )
-        elif self.args.k.get("pay") and self.args.k.get("pay") not in [
-            "coinmobile",
-            "coinbank",
-            "mobile",
-            "bank",
-        ]:
+        pay = self.args.k.get("pay")
+        if pay in PAY_METHODS:
+            self.jsondict.update(PAY_METHODS[pay])
+        elif pay:
             raise ValueError("결제수단을 잘못 입력하셨습니다.")
         else:
             print("별도의 결제수단 입력이 없으므로 금액에 따라 자동으로 수단이 설정됩니다.")
 
-    def set_shortening_url(self):
+    def get_shortening_url(self):
         """
         에어드롭 에디션인 경우 자동으로 QR 코드를 생성해줄 수 있게 URL Shortening 해주는 기능
         bit.ly의 python 라이브러리인 bitlyshortener 패키지를 활용
@@ -330,14 +500,10 @@ class MetadataHandler:
         tokens_pool: 계정별 개인키 리스트
         (여러 키 존재 이유: 계정별로 50개만 free 제공, 랜덤하게 하나의 키를 가져와서 그 키를 통해 URL shortening 진행)
 
-        :return:
+        :return: (축약 URL, 원본 URL), 에어드롭이 아닌 경우 None
         """
         # 별도로 입력 받지 않으면 에어드롭 처리하므로 not check
-        if (
-            not self.args.k.get("coin")
-            and not self.args.k.get("krw")
-            and not self.args.k.get("edition") == "auction"
-        ):
+        if is_airdrop(self.args.k):
             # nextId = self.nft_id
             edition = self.args.k.get("edition")  # edition
 
@@ -348,45 +514,42 @@ class MetadataHandler:
             full_url = airdrop_base_url + drop_url
             intalk_link = full_url + "&intalk_only=true"
 
-            # customize account token
-            # tokens_pool = ["8e0124e426e702b3d859baba8782af7ea366edb9",
-            # "fc38fdde6ffd136d53c981a1076d175a75c9cf43",
-            # "6d17056c5d5e637f71207f700a8e4c84ef2db5a6",
-            # "8f5619e47825b957bcfc67bb0fe6ef8f92da3b58",
-            # "d99ce4c2ffe0b47d3b9f28d05c41fa6299b9231f"]
-            tokens_pool = [
-                "fc38fdde6ffd136d53c981a1076d175a75c9cf43",
-                "6d17056c5d5e637f71207f700a8e4c84ef2db5a6",
-                "8f5619e47825b957bcfc67bb0fe6ef8f92da3b58",
-                "d99ce4c2ffe0b47d3b9f28d05c41fa6299b9231f",
-                "57602ac16229f873da755e029fc4bc833acb78ae",
-            ]
-            shortener = bitlyshortener.Shortener(tokens=tokens_pool, max_cache_size=256)
-
             # bit.ly 동작 실패 시 아래 라이브러리로 활용 대체할 것
             # type_tiny = pyshorteners.Shortener()
 
             if self.args.i:
                 print("인톡클립 우선으로 에어드롭 링크가 생성됩니다.")
-                url_dict = shortener.shorten_urls_to_dict([intalk_link])
-                full_short = url_dict.get(intalk_link)
-                # tiny_short_url = type_tiny.tinyurl.short(intalk_link)
-                print(
-                    f"URL Shortening이 완료되었습니다.\n- Base URL 포함 전체 링크 축약 : {full_short}"
-                )
-                self.make_qrcode_and_download(full_short, intalk_link)
+                origin_url = intalk_link
             else:
-                # bit.ly shortening as dict
-                url_dict = shortener.shorten_urls_to_dict([full_url])
-                full_short = url_dict.get(full_url)
-                # tiny_short_url = type_tiny.tinyurl.short(full_url)
+                origin_url = full_url
+            # bit.ly shortening as dict (--record / --replay 옵션이면 축약 결과도 cassette에 기록/재생)
+            full_short = shorten_url(
+                self.args, origin_url,
+                lambda url: get_shortener().shorten_urls_to_dict([url]).get(url),
+            )
+            # tiny_short_url = type_tiny.tinyurl.short(origin_url)
+            if full_short is None and self.args.replay:
                 print(
-                    f"URL Shortening이 완료되었습니다.\n- Base URL 포함 전체 링크 축약 : {full_short}"
+                    f"cassette에 URL 축약 기록이 없어 URL 축약/QR 코드 생성을 생략합니다: {origin_url}"
                 )
-                self.make_qrcode_and_download(full_short, full_url)
+                return None
+            print(
+                f"URL Shortening이 완료되었습니다.\n- Base URL 포함 전체 링크 축약 : {full_short}"
+            )
+            return full_short, origin_url
 
-        else:
-            print("에어드롭에 해당하지 않아 에어드롭 URL 생성을 생략합니다.")
+        print("에어드롭에 해당하지 않아 에어드롭 URL 생성을 생략합니다.")
+        return None
+
+    def set_shortening_url(self):
+        """
+        에어드롭 에디션인 경우 URL Shortening 후 AOS/iOS용 QR 코드까지 생성
+
+        :return:
+        """
+        shortened = self.get_shortening_url()
+        if shortened:
+            self.make_qrcode_and_download(*shortened)
 
     def set_is_offline(self):
         """
@@ -459,9 +622,7 @@ class MetadataHandler:
 
         :return:
         """
-        with open("./static.json", "r", encoding="utf-8") as stat:
-            tempdump = json.load(stat)
-            self.jsondict.update(tempdump)
+        self.jsondict.update(load_static_data())
 
     def update_metadata_dict(self):
         """
@@ -469,6 +630,9 @@ class MetadataHandler:
 
         :return:
         """
+        reason = check_edition_kwargs(self.args.k)
+        if reason:
+            raise ValueError(reason)
         self.get_static_data_and_update()
         self.set_title()
         self.set_nft_id()
@@ -482,27 +646,80 @@ class MetadataHandler:
         self.set_is_offline()
         self.set_optional()
         self.set_pay_method()
-        self.set_image_video()
+        with self.memory.stage("set_image_video"):
+            self.set_image_video()
 
-    def write_dict_data_to_json(self):
+    def write_dict_data_to_json(self, path="senddata.json"):
         """
         클래스 객체로 저장했던 메타데이터 (dictionary)를 json 파일에 쓰는 작업
-        ensure_ascii 옵션 False로 해야 한글이 깨지지 않는다.
+        static.json 필드는 미리 직렬화해둔 bytes, 이미지/영상은 data URI bytes를 그대로 기록한다. (payload_writer 참고)
+
+        메모리 예산이 있으면 디스크에 저장된 이미지/영상을 파일에서 읽어 스트리밍 기록하고,
+        기록 이후에는 생성 요청 시 파일을 그대로 전송하므로 메모리의 메타데이터 dict, 이미지/영상 데이터를 비운다.
 
+        :param path: 메타데이터 json 파일 경로
         :return:
         """
-        with open("senddata.json", "x", encoding="utf-8") as file:
-            file.write(json.dumps(self.jsondict, ensure_ascii=False))
+        with self.memory.stage("write_dict_data_to_json"):
+            write_payload(self.jsondict, path, load_static_fragments())
+            if self.args.max_memory:
+                self.jsondict.clear()
+                self.media = {}
 
     @staticmethod
-    def remove_json_file():
+    def remove_json_file(path="senddata.json"):
         """
         테스트 전 기존 파일이 있으면 지운다. 목적은 기존 json 파일 데이터와 충돌되지 않기 위해 삭제 후 재생성을 목포로 하였음
 
+        :param path: 메타데이터 json 파일 경로
+        :return:
+        """
+        if os.path.exists(path):
+            os.remove(path)
+
+    def fetch_media(self, image_handler=None):
+        """
+        image handler 통해서 pixabay 이미지 (비디오 옵션 있는 경우 영상까지) 데이터를 받아와 객체에 저장
+
+        :param image_handler: 재사용할 ImageHandler 객체 (세션 공유), 없으면 새로 생성
+        :return:
+        """
+        if image_handler:
+            image_handler.reset_budget()
+        else:
+            image_handler = ImageHandler(
+                max_memory=self.memory_budget(self.args), seed=self.args.seed
+            )
+        attach_cassette(self.args, image_handler.session)
+        with self.memory.stage("get_all_images"):
+            self.media = {"image": image_handler.get_all_images()}
+        # 비디오 옵션 있는 경우
+        if self.args.v:
+            with self.memory.stage("get_all_videos"):
+                self.media["video"] = image_handler.get_all_videos()
+
+    def save_media(self, path):
+        """
+        받아온 이미지/영상 데이터를 캐시 파일에 저장 (재실행 시 다시 다운로드하지 않기 위함)
+
+        :param path: 캐시 파일 경로
         :return:
         """
-        if os.path.exists("senddata.json"):
-            os.remove("senddata.json")
+        cache_dir = os.path.dirname(path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.media, file)
+
+    def load_media(self, path):
+        """
+        캐시 파일에 저장된 이미지/영상 데이터를 불러와 객체에 저장
+
+        :param path: 캐시 파일 경로
+        :return:
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            self.media = json.load(file)
 
     def set_image_video(self):
         """
@@ -510,7 +727,9 @@ class MetadataHandler:
 
         :return:
         """
-        img_obj = ImageHandler().get_all_images()
+        if not self.media:
+            self.fetch_media()
+        img_obj = self.media["image"]
         self.jsondict.update(
             {
                 "mainImage": {
@@ -540,8 +759,8 @@ class MetadataHandler:
             }
         )
         # 비디오 옵션 있는 경우
-        if self.args.v:
-            video_obj = ImageHandler().get_all_videos()
+        if self.media.get("video"):
+            video_obj = self.media["video"]
             self.jsondict.update(
                 {
                     "mainVideo": {
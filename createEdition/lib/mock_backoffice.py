@@ -0,0 +1,222 @@
+"""
+로컬 검증용 백오피스 Admin API mock 서버
+
+SessionRequest가 호출하는 엔드포인트(작가/셀러 조회, NFT ID 조회, 컨트랙트 사용 여부, 생성 POST, 상태 변경 PUT, 단건 조회)와
+공개 상세 페이지(LIVE 상태만 노출)를
+동일한 경로/응답 형태로 흉내내어 실제 QA 백오피스 없이 생성 흐름을 검증할 수 있게 한다.
+생성 POST는 Content-Encoding(gzip, zstd) 및 chunked 전송을 해제한 뒤 json 파싱까지 확인한다.
+
+실행 (createEdition 폴더에서)
+$ python3 -m lib.mock_backoffice --port 8090
+$ python3 main.py --backoffice http://127.0.0.1:8090/ -k edition=eth --compress gzip
+"""
+import argparse
+import gzip
+import json
+import re
+import threading
+from http.server import ThreadingHTTPServer
+
+try:
+    import zstandard
+except ImportError:  # zstd 압축 요청 검증 시에만 필요한 모듈
+    zstandard = None
+
+from lib.http_service import JsonRequestHandler, serve_until_interrupted
+
+
+class MockBackofficeState:
+    """
+    mock 서버의 메모리 상태 (작가/셀러 목록, 작가별 다음 NFT ID, 생성된 에디션, 수신 요청 통계)
+    여러 요청 스레드에서 동시에 접근하므로 lock으로 보호한다.
+    """
+    def __init__(self, author_ids=(100, 201), seller_ids=(200, 111222)):
+        self.lock = threading.Lock()
+        self.members = {"authors": list(author_ids), "sellers": list(seller_ids)}
+        self.next_ids = {}
+        self.editions = {}
+        self.received = []
+
+    def reserve_next_id(self, edition, member_id):
+        """
+        작가/셀러별 다음 NFT ID (생성 POST가 들어오기 전까지는 같은 값을 돌려준다)
+
+        :param edition: eth | btc
+        :param member_id: 작가/셀러 ID
+        :return: 다음 NFT ID
+        """
+        with self.lock:
+            return self.next_ids.setdefault((edition, member_id), member_id * 1000 + 1)
+
+
+class MockBackofficeHandler(JsonRequestHandler):
+    """
+    백오피스 Admin API 경로별 응답 처리 클래스
+    """
+    state = MockBackofficeState()
+
+    def read_body(self):
+        """
+        요청 바디 읽기 (content-length 및 chunked 전송 모두 처리) 후 Content-Encoding 해제
+
+        :return: (원본 전송 바이트 수, 압축 해제된 바이트)
+        """
+        if self.headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            raw = b"".join(chunks)
+        else:
+            raw = self.rfile.read(int(self.headers.get("content-length", 0)))
+
+        encoding = self.headers.get("content-encoding", "").lower()
+        if encoding == "gzip":
+            return len(raw), gzip.decompress(raw)
+        if encoding == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd 요청을 검증하려면 zstandard 모듈을 설치해주세요.")
+            return len(raw), zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+        return len(raw), raw
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        작가/셀러 목록, NFT ID, 컨트랙트 사용 여부, 에디션 단건 조회, 공개 상세 페이지
+
+        :return:
+        """
+        path = self.path.lstrip("/")
+        state = self.state
+        match = re.fullmatch(r"(authors|sellers)(\?.*)?", path)
+        if match:
+            members = state.members[match.group(1)]
+            page = re.search(r"page=(\d+)", path)
+            start = (int(page.group(1)) - 1) * 10 if page else 0
+            listed = [{"id": x, "status": 3} for x in members[start:start + 10]]
+            self.send_json(200, {"count": len(members), "list": listed})
+            return
+        match = re.fullmatch(r"(eth|btc)/nftId/(\d+)", path)
+        if match:
+            nft_id = state.reserve_next_id(match.group(1), int(match.group(2)))
+            self.send_json(200, {"nftId": nft_id})
+            return
+        match = re.fullmatch(r"(eth|btc)/(\d+)/contract", path)
+        if match:
+            with state.lock:
+                existing = (match.group(1), int(match.group(2))) in state.editions
+            self.send_json(200, {"isExisting": existing})
+            return
+        match = re.fullmatch(r"(eth|btc)/detail/(\d+)", path)
+        if match:
+            # 공개 상세 페이지: LIVE 상태인 에디션만 노출
+            with state.lock:
+                edition = state.editions.get((match.group(1), int(match.group(2))))
+            if edition is None or edition["status"] != 3:
+                self.send_json(404, {"message": "not found"})
+            else:
+                self.send_json(200, {"id": edition["id"]})
+            return
+        match = re.fullmatch(r"(eth|btc)/(\d+)", path)
+        if match:
+            with state.lock:
+                edition = state.editions.get((match.group(1), int(match.group(2))))
+            if edition is None:
+                self.send_json(404, {"message": "not found"})
+            else:
+                self.send_json(200, {"id": edition["id"], "status": edition["status"]})
+            return
+        self.send_json(404, {"message": "not found"})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        NFT 생성 요청, 압축/전송 방식 통계를 기록하고 DRAFT(1) 상태로 저장
+
+        :return:
+        """
+        match = re.fullmatch(r"(eth|btc)", self.path.strip("/"))
+        if not match:
+            self.send_json(404, {"message": "not found"})
+            return
+        try:
+            wire_bytes, body = self.read_body()
+            payload = json.loads(body.decode("utf-8"))
+        except (ValueError, OSError) as error:
+            self.send_json(400, {"message": f"invalid body: {error}"})
+            return
+
+        edition, nft_id = match.group(1), int(payload.get("id", 0))
+        member_id = int(payload.get("authorID") or payload.get("sellerID") or 0)
+        state = self.state
+        with state.lock:
+            state.editions[(edition, nft_id)] = {"id": nft_id, "status": 1}
+            state.next_ids[(edition, member_id)] = nft_id + 1
+            state.received.append(
+                dict(
+                    id=nft_id,
+                    contentEncoding=self.headers.get("content-encoding", "identity"),
+                    wireBytes=wire_bytes,
+                    bodyBytes=len(body),
+                )
+            )
+        print(
+            f"[mock] {edition} {nft_id} 생성 요청 수신: "
+            f"{self.headers.get('content-encoding', 'identity')} {wire_bytes} bytes "
+            f"(해제 후 {len(body)} bytes)"
+        )
+        self.send_json(200, {"id": nft_id})
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """
+        에디션 상태 변경
+
+        :return:
+        """
+        match = re.fullmatch(r"(eth|btc)/(\d+)/status", self.path.strip("/"))
+        if not match:
+            self.send_json(404, {"message": "not found"})
+            return
+        _, body = self.read_body()
+        status = json.loads(body.decode("utf-8")).get("status")
+        key = (match.group(1), int(match.group(2)))
+        with self.state.lock:
+            edition = self.state.editions.get(key)
+            if edition is not None:
+                edition["status"] = status
+        if edition is None:
+            self.send_json(404, {"message": "not found"})
+        else:
+            self.send_json(200, {"id": key[1], "status": status})
+
+
+def run_mock_backoffice(host="127.0.0.1", port=8090):
+    """
+    mock 서버 실행 (Ctrl+C로 종료)
+
+    :param host: 바인딩 주소
+    :param port: 바인딩 포트
+    :return:
+    """
+    server = ThreadingHTTPServer((host, port), MockBackofficeHandler)
+    print(f"mock 백오피스 서버가 실행되었습니다: http://{host}:{port}/")
+    serve_until_interrupted(server)
+
+
+def main():
+    """
+    명령행 파라미터 파싱 후 mock 서버 실행
+
+    :return:
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    mock_args = parser.parse_args()
+    run_mock_backoffice(mock_args.host, mock_args.port)
+
+
+if __name__ == "__main__":
+    main()
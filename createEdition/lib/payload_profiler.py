@@ -0,0 +1,303 @@
+"""
+메타데이터 json(senddata*.json) 크기 분석 모듈
+
+생성 요청 바디를 최상위 필드별, 이미지/영상 슬롯별 직렬화 bytes로 나누어 집계하고
+같은 값이 여러 필드에 들어있는 경우를 찾는다.
+(static.json 의 salesText/salesSubText/specialOffer, mainImageHiRes/bannerImage 이미지 등)
+아래 항목별로 줄일 수 있는 bytes를 추정한다. (항목별로 원본 대비 따로 계산하므로 합산하면 중복 집계될 수 있음)
+- dedupe: 중복 값을 한 번만 전송
+- downscale: 이미지/영상을 슬롯별 최소 해상도로 축소 (픽셀 수 비율로 추정)
+- base64: 이미지/영상을 base64 대신 원본 bytes로 전송
+- nestedJson: json 문자열로 들어있는 값(agency 등)을 객체로 전송 (escape 문자 제거)
+- compression: 바디 전체 압축 (BodyCompressor로 실제 압축)
+
+여러 파일을 입력하면 파일별 분석 결과를 합산하므로 배치 전체에서 어떤 필드가 전송량을 차지하는지 확인할 수 있다.
+"""
+import hashlib
+import json
+import os
+import zlib
+
+from lib.body_compressor import BodyCompressor
+from lib.json_codec import encode
+from lib.rendition_index import SLOT_MIN_LENGTH
+
+# 이미지/영상 슬롯별 축소 기준 (bannerImage는 mainImageHiRes와 같은 이미지 사용)
+DOWNSCALE_LENGTH = dict(SLOT_MIN_LENGTH, bannerImage=SLOT_MIN_LENGTH["mainImageHiRes"])
+# 중복 값으로 집계할 최소 bytes (짧은 문자열/숫자 제외)
+DUPLICATE_MIN_BYTES = 64
+# 절감 추정 항목 (출력 순서)
+SAVINGS = ("dedupe", "downscale", "base64", "nestedJson", "compression")
+
+
+def encoded_size(value):
+    """
+    json 직렬화 bytes (write_dict_data_to_json 과 같은 json_codec 직렬화)
+
+    :param value: 메타데이터 값
+    :return: bytes 수
+    """
+    return len(encode(value))
+
+
+def split_data_uri(value):
+    """
+    data URI(base64) 문자열에서 mime, base64 부분 분리
+
+    :param value: 메타데이터 값
+    :return: (mime, base64 문자열), data URI가 아니면 None
+    """
+    if not isinstance(value, str) or not value.startswith("data:") or ";base64," not in value:
+        return None
+    mime, encoded = value[5:].split(";base64,", 1)
+    return mime, encoded
+
+
+def nested_json(value):
+    """
+    json 문자열로 들어있는 객체/배열 값 파싱
+
+    :param value: 메타데이터 값
+    :return: 파싱된 객체, json 문자열이 아니면 None
+    """
+    if not isinstance(value, str) or not value.lstrip().startswith(("{", "[")):
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return None
+
+
+def iter_payload_files(paths):
+    """
+    입력 경로에서 메타데이터 json 파일 탐색 (폴더는 하위 폴더의 senddata*.json 까지)
+
+    :param paths: 파일 또는 폴더 경로 리스트
+    :return: generator of 파일 경로
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.startswith("senddata") and name.endswith(".json"):
+                        yield os.path.join(root, name)
+        elif os.path.exists(path):
+            yield path
+
+
+def profile_payload(raw, compressor):
+    """
+    메타데이터 json 파일 하나 분석
+
+    :param raw: 메타데이터 json 파일 bytes
+    :param compressor: 바디 전체 압축에 사용할 BodyCompressor 객체
+    :return: 분석 결과 dict
+    """
+    data = json.loads(raw.decode("utf-8"))
+    fields, slots, nested, values = {}, {}, {}, {}
+    savings = dict.fromkeys(SAVINGS, 0)
+    for key, value in data.items():
+        encoded = encode(value)
+        # "key":value 형태 (구분자 "," 와 이전 형식 파일의 공백은 구조 bytes로 집계)
+        fields[key] = dict(
+            bytes=encoded_size(key) + 1 + len(encoded),
+            gzipBytes=len(zlib.compress(encoded, 6)),
+        )
+        if isinstance(value, dict) and split_data_uri(value.get("file")):
+            slots[key] = profile_slot(key, value)
+            savings["downscale"] += slots[key]["downscaleSavedBytes"]
+            savings["base64"] += slots[key]["base64Bytes"] - slots[key]["rawBytes"]
+            encoded = encode(value["file"])
+            key = f"{key}.file"
+        parsed = nested_json(value)
+        if parsed is not None:
+            nested[key] = dict(bytes=len(encoded), objectBytes=encoded_size(parsed))
+            savings["nestedJson"] += len(encoded) - nested[key]["objectBytes"]
+        if len(encoded) >= DUPLICATE_MIN_BYTES:
+            values.setdefault(hashlib.sha1(encoded).hexdigest(), []).append((key, len(encoded)))
+
+    duplicates = [
+        dict(
+            fields=[x[0] for x in group],
+            bytes=group[0][1],
+            savedBytes=group[0][1] * (len(group) - 1),
+        )
+        for group in values.values()
+        if len(group) > 1
+    ]
+    savings["dedupe"] = sum(x["savedBytes"] for x in duplicates)
+    compressor.compress_bytes(raw)
+    savings["compression"] = compressor.report["savedBytes"]
+    return dict(
+        bytes=len(raw),
+        structureBytes=len(raw) - sum(x["bytes"] for x in fields.values()),
+        compressedBytes=compressor.report["compressedBytes"],
+        compressCpuMs=compressor.report["cpuMs"],
+        fields=fields,
+        slots=slots,
+        nestedJson=nested,
+        duplicates=duplicates,
+        savings=savings,
+    )
+
+
+def profile_slot(slot, value):
+    """
+    이미지/영상 슬롯 하나 분석 (base64/원본 bytes, 최소 해상도로 축소 시 절감 bytes 추정)
+
+    :param slot: 슬롯 이름 (mainImage, mainImageHiRes, bannerImage, mainVideo, mainVideoHiRes)
+    :param value: {"file": data URI, "name", "size": {"width", "height"}}
+    :return: 분석 결과 dict
+    """
+    mime, encoded = split_data_uri(value["file"])
+    size = value.get("size") or {}
+    width, height = int(size.get("width") or 0), int(size.get("height") or 0)
+    longest, target = max(width, height), DOWNSCALE_LENGTH.get(slot)
+    saved = 0
+    if target and longest > target:
+        saved = int(len(encoded) * (1 - (target / longest) ** 2))
+    return dict(
+        mime=mime,
+        width=width,
+        height=height,
+        base64Bytes=len(encoded),
+        rawBytes=len(encoded) * 3 // 4 - (len(encoded) - len(encoded.rstrip("="))),
+        downscaleTo=target if saved else None,
+        downscaleSavedBytes=saved,
+    )
+
+
+class PayloadProfiler:
+    """
+    메타데이터 json 파일 배치 분석 클래스 (파일별 결과를 합산만 하고 파일 내용은 들고 있지 않음)
+    """
+    def __init__(self, encoding="gzip", level=None):
+        """
+        :param encoding: 바디 전체 압축 방식 (gzip | zstd)
+        :param level: 압축 레벨, 입력하지 않으면 방식별 기본 레벨 사용
+        """
+        self.compressor = BodyCompressor(encoding, level)
+        self.files = []
+        self.fields, self.slots, self.duplicates = {}, {}, {}
+        self.savings = dict.fromkeys(SAVINGS, 0)
+
+    def add(self, path):
+        """
+        파일 하나 분석 후 합산
+
+        :param path: 메타데이터 json 파일 경로
+        :return: 파일 분석 결과 dict
+        """
+        with open(path, "rb") as file:
+            result = profile_payload(file.read(), self.compressor)
+        self.files.append(
+            dict(
+                path=path,
+                bytes=result["bytes"],
+                compressedBytes=result["compressedBytes"],
+                compressCpuMs=result["compressCpuMs"],
+                savings=result["savings"],
+            )
+        )
+        for key, field in result["fields"].items():
+            total = self.fields.setdefault(key, dict(files=0, bytes=0, gzipBytes=0))
+            total["files"] += 1
+            total["bytes"] += field["bytes"]
+            total["gzipBytes"] += field["gzipBytes"]
+        for key, slot in result["slots"].items():
+            total = self.slots.setdefault(
+                key, dict(files=0, base64Bytes=0, rawBytes=0, downscaleSavedBytes=0)
+            )
+            total["files"] += 1
+            for name in ("base64Bytes", "rawBytes", "downscaleSavedBytes"):
+                total[name] += slot[name]
+        for duplicate in result["duplicates"]:
+            total = self.duplicates.setdefault(
+                " = ".join(duplicate["fields"]), dict(files=0, savedBytes=0)
+            )
+            total["files"] += 1
+            total["savedBytes"] += duplicate["savedBytes"]
+        for name in SAVINGS:
+            self.savings[name] += result["savings"][name]
+        return result
+
+    def report(self, mbps=None):
+        """
+        배치 분석 리포트
+
+        :param mbps: 업로드 대역폭 (Mbps), 입력 시 전송 시간 추정값 추가
+        :return: 리포트 dict
+        """
+        total = sum(x["bytes"] for x in self.files)
+        report = dict(
+            files=len(self.files),
+            bytes=total,
+            meanBytes=total // len(self.files) if self.files else 0,
+            compression=dict(
+                encoding=self.compressor.encoding,
+                level=self.compressor.level,
+                compressedBytes=sum(x["compressedBytes"] for x in self.files),
+                cpuMs=round(sum(x["compressCpuMs"] for x in self.files), 2),
+            ),
+            fields=dict(
+                sorted(
+                    (
+                        (key, dict(field, share=round(field["bytes"] / total, 4)))
+                        for key, field in self.fields.items()
+                    ),
+                    key=lambda x: -x[1]["bytes"],
+                )
+            ),
+            slots=self.slots,
+            duplicates=dict(sorted(self.duplicates.items(), key=lambda x: -x[1]["savedBytes"])),
+            savings={
+                name: dict(bytes=saved, ratio=round(saved / total, 4) if total else 0.0)
+                for name, saved in self.savings.items()
+            },
+            perFile=self.files,
+        )
+        if mbps:
+            report["mbps"] = mbps
+            report["uploadSeconds"] = round(total * 8 / (mbps * 1_000_000), 2)
+            for saving in report["savings"].values():
+                saving["uploadSeconds"] = round(saving["bytes"] * 8 / (mbps * 1_000_000), 2)
+        return report
+
+    @staticmethod
+    def print_report(report, top=15):
+        """
+        배치 분석 결과 출력 (필드는 bytes 상위 top 개)
+
+        :param report: 리포트 dict
+        :param top: 출력할 필드 수
+        :return:
+        """
+        mb = 1024 * 1024
+        compression = report["compression"]
+        print(
+            f"메타데이터 json {report['files']}개, 합계 {report['bytes'] / mb:.2f}MB "
+            f"(평균 {report['meanBytes'] / mb:.2f}MB), {compression['encoding']} 압축 시 "
+            f"{compression['compressedBytes'] / mb:.2f}MB (CPU {compression['cpuMs']}ms)"
+        )
+        if report.get("mbps"):
+            print(f"{report['mbps']}Mbps 기준 업로드 시간 추정 {report['uploadSeconds']}s")
+        print("필드별 bytes (합계, 비율, 필드 단독 gzip 압축 시)")
+        for key, field in list(report["fields"].items())[:top]:
+            print(
+                f"  {key}: {field['bytes']} bytes ({field['share'] * 100:.1f}%), "
+                f"gzip {field['gzipBytes']} bytes"
+            )
+        print("이미지/영상 슬롯별 bytes (base64 / 원본 / 최소 해상도 축소 시 절감 추정)")
+        for key, slot in report["slots"].items():
+            print(
+                f"  {key}: {slot['base64Bytes']} / {slot['rawBytes']} / "
+                f"{slot['downscaleSavedBytes']} bytes ({slot['files']}개 파일)"
+            )
+        print("중복 값 (같은 값이 들어있는 필드, 한 번만 전송 시 절감)")
+        for key, duplicate in report["duplicates"].items():
+            print(f"  {key}: {duplicate['savedBytes']} bytes ({duplicate['files']}개 파일)")
+        print("항목별 절감 추정 (원본 대비, 항목 간 중복 집계될 수 있음)")
+        for name, saving in report["savings"].items():
+            upload = f", 업로드 {saving['uploadSeconds']}s" if "uploadSeconds" in saving else ""
+            print(f"  {name}: {saving['bytes']} bytes ({saving['ratio'] * 100:.1f}%{upload})")
@@ -0,0 +1,148 @@
+"""
+메타데이터 json 파일 스트리밍 기록 모듈
+
+메타데이터 dict를 한 번에 json 문자열로 직렬화하지 않고 최상위 필드별 bytes를 순서대로 파일에 기록한다.
+- static.json 필드: 프로세스당 한 번만 직렬화해둔 bytes(fragments)를 그대로 기록 (값이 바뀐 필드만 다시 직렬화)
+- 이미지/영상 data URI(base64): escape 할 문자가 없으므로 직렬화하지 않고 bytes 그대로 기록
+- 메모리 예산(--max-memory)을 넘어 디스크에 저장된 이미지/영상({"spillPath", "mime"}): 파일을 청크 단위로 읽어 base64 인코딩하며 바로 기록
+  (원본 bytes, base64 문자열, json 직렬화 문자열 전체가 메모리에 동시에 올라가지 않음)
+그 외 값은 json_codec 에서 선택된 백엔드(orjson | msgspec | json)로 직렬화한다.
+"""
+import base64
+
+from lib.json_codec import encode
+
+# base64 인코딩 단위 (3의 배수여야 청크 사이에 패딩이 생기지 않음)
+CHUNK_SIZE = 3 * 256 * 1024
+OPEN_AT_KEY = b'"openAt":"'
+
+
+def is_spilled(value):
+    """
+    디스크에 저장된 이미지/영상 위치 정보인지 여부
+
+    :param value: 메타데이터 값
+    :return: bool
+    """
+    return isinstance(value, dict) and "spillPath" in value
+
+
+def is_data_uri(value):
+    """
+    이미지/영상 data URI(base64) 문자열인지 여부 (mime, base64 문자에는 json escape 대상 문자가 없음)
+
+    :param value: 메타데이터 값
+    :return: bool
+    """
+    return isinstance(value, str) and value.startswith("data:") and ";base64," in value[:64]
+
+
+def encode_field(key, value):
+    """
+    최상위 필드 하나를 '"key":value' 형태로 직렬화
+
+    :param key: 필드 이름
+    :param value: 필드 값
+    :return: bytes
+    """
+    return encode(key) + b":" + encode(value)
+
+
+def iter_spilled(spill):
+    """
+    디스크에 저장된 파일을 청크 단위로 읽어 data URI(base64) 형태로 yield
+
+    :param spill: {"spillPath": 저장 경로, "mime": mime}
+    :return: bytes generator
+    """
+    yield f"\"data:{spill['mime']};base64,".encode("ascii")
+    with open(spill["spillPath"], "rb") as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            yield base64.b64encode(chunk)
+    yield b"\""
+
+
+def iter_value(value):
+    """
+    값 하나를 직렬화한 bytes를 순서대로 yield (이미지/영상이 들어있는 dict는 필드별로 나누어 처리)
+
+    :param value: 메타데이터 값
+    :return: bytes generator
+    """
+    if is_spilled(value):
+        yield from iter_spilled(value)
+    elif is_data_uri(value):
+        # 큰 문자열을 이어붙이면서 한 번 더 복사하지 않도록 따옴표와 나누어 yield
+        yield b"\""
+        yield value.encode("ascii")
+        yield b"\""
+    elif isinstance(value, dict) and any(is_spilled(x) or is_data_uri(x) for x in value.values()):
+        yield b"{"
+        for index, (key, item) in enumerate(value.items()):
+            yield (b"," if index else b"") + encode(key) + b":"
+            yield from iter_value(item)
+        yield b"}"
+    else:
+        yield encode(value)
+
+
+def iter_payload(data, fragments=None):
+    """
+    메타데이터 dict를 json bytes로 순서대로 yield
+
+    :param data: 메타데이터 dict
+    :param fragments: 미리 직렬화한 필드 {key: (값, '"key":value' bytes)}, 값이 같은 객체인 필드만 그대로 사용
+    :return: bytes generator
+    """
+    fragments = fragments or {}
+    yield b"{"
+    for index, (key, value) in enumerate(data.items()):
+        if index:
+            yield b","
+        fragment = fragments.get(key)
+        if fragment and fragment[0] is value:
+            yield fragment[1]
+            continue
+        yield encode(key) + b":"
+        yield from iter_value(value)
+    yield b"}"
+
+
+def write_payload(data, path, fragments=None):
+    """
+    메타데이터 dict를 json 파일에 기록 (한글은 escape 하지 않고 utf-8 그대로 기록)
+
+    :param data: 메타데이터 dict
+    :param path: 메타데이터 json 파일 경로
+    :param fragments: 미리 직렬화한 필드 {key: (값, '"key":value' bytes)}
+    :return:
+    """
+    with open(path, "xb") as file:
+        for chunk in iter_payload(data, fragments):
+            file.write(chunk)
+
+
+def read_open_at(path, chunk_size=CHUNK_SIZE):
+    """
+    기록된 메타데이터 json 파일에서 오픈 시각(openAt) 값 읽기 (청크 단위로 읽으며 찾으면 바로 중단)
+    오픈 시각을 따로 저장하지 않았던 이전 job/저널을 재처리할 때 사용한다.
+
+    :param path: 메타데이터 json 파일 경로
+    :param chunk_size: 한 번에 읽을 bytes
+    :return: 오픈 시각 문자열
+    """
+    data = b""
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            data += chunk
+            index = data.find(OPEN_AT_KEY)
+            if index < 0:
+                data = data[-(len(OPEN_AT_KEY) - 1):]
+                continue
+            data = data[index + len(OPEN_AT_KEY):]
+            end = data.find(b'"')
+            if end >= 0:
+                return data[:end].decode("utf-8")
+            # 값이 다음 청크까지 이어지는 경우 키를 다시 찾도록 키부터 보관
+            data = OPEN_AT_KEY + data
+    raise ValueError(f"메타데이터 json 에서 openAt 값을 찾지 못했습니다: {path}")
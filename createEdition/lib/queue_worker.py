@@ -0,0 +1,274 @@
+"""
+job 큐 worker 모듈
+
+JobQueue에서 job을 lease 하여 단계별로 처리하는 worker 프로세스
+base64 인코딩, json 직렬화, QR 렌더링이 프로세스별로 나뉘어 실행되므로 GIL 영향 없이 코어 수만큼 처리량이 늘어난다.
+
+- build: 이미지/영상 다운로드 및 메타데이터 json 생성 (NFT ID는 아직 확보하지 않음, 작가 lock 없이 병렬 처리)
+  id 자리에는 고정 길이 자리표시 값을 기록하고 파일 내 위치를 결과에 저장한다.
+- create: 작가 lock을 잡은 상태에서 NFT ID 확보 -> json의 id 자리만 덮어쓰기 -> 생성 요청, 이후 lock 해제
+  -> LIVE 변경 (--draft-only 면 LIVE 예약 등록)
+- shorten: 에어드롭인 경우 URL 축약 및 QR 생성
+"""
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+
+import requests
+
+from lib.job_queue import JobQueue
+from lib.live_scheduler import LiveSchedule
+from lib.metadata_handler import MetadataHandler
+from lib.payload_writer import read_open_at
+from lib.session_request import SessionRequest
+from lib.shared_resources import SharedResources
+
+# build 단계에서 사용하는 임시 NFT ID (create 단계에서 작가 lock을 잡은 뒤 확보한 ID로 교체)
+PENDING_NFT_ID = -1
+# build 단계에서 메타데이터 json 의 id 값 자리에 기록하는 자리표시 값 (따옴표 포함 20 bytes)
+# create 단계에서 NFT ID를 같은 길이로 (뒤를 공백으로 채워) 덮어쓰므로 json 파일 전체를 다시 읽고 쓰지 않는다.
+ID_PLACEHOLDER = "@" * 18
+ID_SLOT = b'"id":' + json.dumps(ID_PLACEHOLDER).encode("utf-8")
+
+
+def author_key(kwargs):
+    """
+    작가 lock 키 생성 (SessionRequest와 같은 규칙으로 에디션 유형, 작가/셀러 ID 결정)
+
+    :param kwargs: -k 파라미터 dict
+    :return: "eth:100" 형태의 키
+    """
+    edition, author_seller_id = SessionRequest.resolve_author(
+        kwargs.get("edition"), kwargs.get("id")
+    )
+    return f"{edition}:{author_seller_id}"
+
+
+def find_id_slot(path, chunk_size=1024 * 1024):
+    """
+    메타데이터 json 파일에서 id 자리표시 값 위치 탐색 (청크 단위로 읽으며 찾으면 바로 중단)
+
+    :param path: 메타데이터 json 파일 경로
+    :param chunk_size: 한 번에 읽을 bytes
+    :return: 자리표시 값 시작 위치 (bytes)
+    """
+    offset, carry = 0, b""
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            data = carry + chunk
+            index = data.find(ID_SLOT)
+            if index >= 0:
+                return offset - len(carry) + index + len(b'"id":')
+            carry = data[-(len(ID_SLOT) - 1):]
+            offset += len(chunk)
+    raise ValueError(f"메타데이터 json 에서 id 자리표시 값을 찾지 못했습니다: {path}")
+
+
+def write_nft_id(path, offset, nft_id):
+    """
+    id 자리표시 값 위치에 NFT ID를 같은 길이로 덮어쓰기 (같은 위치에 다시 써도 결과가 같으므로 재처리 시에도 안전)
+
+    :param path: 메타데이터 json 파일 경로
+    :param offset: 자리표시 값 시작 위치
+    :param nft_id: NFT ID
+    :return:
+    """
+    width = len(ID_SLOT) - len(b'"id":')
+    value = str(int(nft_id)).encode("ascii")
+    if len(value) > width:
+        raise ValueError(f"NFT ID가 자리표시 값보다 깁니다: {nft_id}")
+    with open(path, "r+b") as file:
+        file.seek(offset)
+        file.write(value.ljust(width))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+class QueueWorker:
+    """
+    job 큐 worker 클래스 (프로세스 하나당 하나)
+    """
+    def __init__(self, base_args, queue_path, work_dir, lease_seconds=60, wal=True):
+        """
+        :param base_args: 공통 파라미터 (--backoffice, --compress 등, MetadataHandler.parsing 결과)
+        :param queue_path: SQLite 큐 파일 경로
+        :param work_dir: job별 메타데이터 json 저장 폴더 (여러 호스트 사용 시 공유 파일시스템)
+        :param lease_seconds: lease 만료 시간
+        :param wal: WAL 모드 사용 여부
+        """
+        self.base_args = base_args
+        self.queue_options = dict(path=queue_path, lease_seconds=lease_seconds, wal=wal)
+        self.queue = JobQueue(**self.queue_options)
+        self.work_dir = work_dir
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        # worker 프로세스 안에서 job끼리 공유하는 HTTP 세션, Pixabay ImageHandler, 작가 확인 결과
+        self.shared = SharedResources.from_args(base_args)
+
+    def job_args(self, job):
+        """
+        job 파라미터를 MetadataHandler 파라미터 형태로 변환
+
+        :param job: lease 한 job dict
+        :return: argparse.Namespace
+        """
+        args = argparse.Namespace(**vars(self.base_args))
+        args.k = dict(job["params"]["k"])
+        args.v, args.i, args.o = (bool(job["params"].get(flag)) for flag in ("v", "i", "o"))
+        return args
+
+    def build(self, job, result):
+        """
+        이미지/영상 다운로드 및 메타데이터 json 생성 (임시 NFT ID 사용)
+
+        :param job: lease 한 job dict
+        :param result: 누적 결과 dict
+        :return:
+        """
+        handler = MetadataHandler(
+            args=self.job_args(job), nft_id=PENDING_NFT_ID, http_session=self.shared.http_session
+        )
+        payload_path = os.path.join(self.work_dir, f"senddata_{job['id']:06d}.json")
+        handler.remove_json_file(payload_path)
+        handler.fetch_media(self.shared.image_handler)
+        handler.update_metadata_dict()
+        handler.jsondict["id"] = ID_PLACEHOLDER
+        # LIVE 예약 시 json 에 기록된 것과 같은 오픈 시각을 등록하도록 같이 저장 (기록 후 dict가 비워질 수 있음)
+        open_at = handler.jsondict["openAt"]
+        handler.write_dict_data_to_json(payload_path)
+        result.update(
+            payloadPath=payload_path, idOffset=find_id_slot(payload_path), openAt=open_at
+        )
+
+    def create(self, job, result):
+        """
+        NFT ID 확보 후 생성 요청, LIVE 변경 (작가 lock은 lease 시점에 획득한 상태)
+
+        생성 요청 전 확보한 ID를 먼저 저장해두고, 재처리 시 해당 ID가 이미 사용 중이면 생성 요청을 다시 보내지 않는다.
+
+        :param job: lease 한 job dict
+        :param result: 누적 결과 dict
+        :return:
+        """
+        args = self.job_args(job)
+        reqsession = SessionRequest(
+            edition=args.k.get("edition"),
+            author_seller_id=args.k.get("id"),
+            addr=args.backoffice,
+            compressor=MetadataHandler.make_compressor(args),
+            nftid=result.get("nftid"),
+            http_session=self.shared.http_session,
+        )
+        if not result.get("posted"):
+            if result.get("nftid") and reqsession.get_used_nft_id(result["nftid"])["isExisting"]:
+                print(
+                    f"[job {job['id']}] {result['nftid']} ID로 이미 생성되어 생성 요청을 생략합니다."
+                )
+            else:
+                # 생성 요청 전에 ID와 에디션 유형을 같이 저장 (teardown 에서 요청 도중 실패한 job도 정리 가능)
+                result.update(nftid=reqsession.nftid, edition=reqsession.edition)
+                self.queue.save_result(job["id"], result)
+                self.post(result, reqsession)
+                if self.shared.probe:
+                    self.shared.probe.watch(reqsession, "posted")
+            result["posted"] = True
+            self.queue.save_result(job["id"], result)
+        self.queue.release_author(job["author_key"], self.owner)
+
+        if args.draft_only:
+            open_at = result.get("openAt") or read_open_at(result["payloadPath"])
+            LiveSchedule(args.schedule).register(reqsession.edition, reqsession.nftid, open_at)
+        else:
+            reqsession.set_live()
+            if self.shared.probe:
+                self.shared.probe.watch(reqsession, "live")
+        result.update(edition=reqsession.edition, url=reqsession.nft_url)
+
+    def post(self, result, reqsession):
+        """
+        확보한 NFT ID로 메타데이터 json의 id 자리만 덮어쓴 뒤 생성 요청 (작가/셀러 ID 확인은 worker당 한 번)
+        작가 lock을 잡고 있는 구간이므로 json 파싱/직렬화 없이 id 자리(20 bytes)만 기록한다.
+
+        :param result: 누적 결과 dict
+        :param reqsession: SessionRequest 객체
+        :return:
+        """
+        self.shared.verify_author(reqsession)
+        write_nft_id(result["payloadPath"], result["idOffset"], reqsession.nftid)
+        reqsession.post_nft(result["payloadPath"], stream=bool(self.base_args.max_memory))
+
+    def shorten(self, job, result):
+        """
+        에어드롭인 경우 URL 축약 및 QR 생성
+
+        :param job: lease 한 job dict
+        :param result: 누적 결과 dict
+        :return:
+        """
+        handler = MetadataHandler(
+            args=self.job_args(job), nft_id=result["nftid"], http_session=self.shared.http_session
+        )
+        shortened = handler.get_shortening_url()
+        if shortened:
+            handler.make_qrcode_and_download(*shortened)
+            result["shortUrl"] = shortened[0]
+
+    def keep_alive(self, job, stop):
+        """
+        처리 중인 job의 lease/작가 lock 연장 (별도 스레드, SQLite 커넥션은 스레드별로 생성)
+
+        :param job: lease 한 job dict
+        :param stop: 처리 완료 시 set 되는 threading.Event
+        :return:
+        """
+        heartbeat_queue = JobQueue(**self.queue_options)
+        held_lock = job["author_key"] if job["stage"] == "create" else None
+        while not stop.wait(heartbeat_queue.lease_seconds / 3):
+            heartbeat_queue.heartbeat(job["id"], self.owner, held_lock)
+
+    def process(self, job):
+        """
+        lease 한 job의 현재 단계 처리
+
+        :param job: lease 한 job dict
+        :return:
+        """
+        stop = threading.Event()
+        threading.Thread(target=self.keep_alive, args=(job, stop), daemon=True).start()
+        result = dict(job["result"])
+        try:
+            getattr(self, job["stage"])(job, result)
+            self.queue.complete(job, result)
+            print(f"[{self.owner}] job {job['id']} {job['stage']} 완료")
+        except (ValueError, OSError, KeyError, requests.RequestException) as error:
+            self.queue.fail(job, f"{job['stage']}: {error}")
+            print(f"[{self.owner}] job {job['id']} {job['stage']} 실패: {error}")
+        finally:
+            stop.set()
+            if job["stage"] == "create":
+                self.queue.release_author(job["author_key"], self.owner)
+
+    def run(self, idle_exit=True, poll_interval=0.5):
+        """
+        job이 없을 때까지 (idle_exit=False면 계속) lease 하여 처리
+        --probe 옵션이면 종료 전에 진행 중인 노출 시간 측정을 기다린 뒤 worker 별 분포를 출력한다.
+
+        :param idle_exit: 처리할 job이 모두 끝나면 종료할지 여부
+        :param poll_interval: 가져갈 job이 없을 때 대기 시간
+        :return:
+        """
+        if not os.path.exists(self.work_dir):
+            os.makedirs(self.work_dir, exist_ok=True)
+        while True:
+            job = self.queue.lease(self.owner)
+            if job:
+                self.process(job)
+            elif idle_exit and not self.queue.has_pending:
+                break
+            else:
+                time.sleep(poll_interval)
+        if self.shared.probe and self.shared.probe.wait():
+            print(f"[{self.owner}] 노출 시간 측정 결과")
+            self.shared.probe.print_summary()
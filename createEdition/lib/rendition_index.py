@@ -0,0 +1,143 @@
+"""
+Pixabay 검색 결과(hits)의 해상도별 데이터 인덱스 모듈
+
+검색 결과에 포함된 해상도별 width, height, size(bytes) 정보만으로
+슬롯(mainImage, mainImageHiRes, mainVideo, mainVideoHiRes)마다 최소 해상도를 만족하는 가장 작은 데이터를
+미리 골라두고 (다운로드 없음), 이후 선택은 인덱스에서 바로 꺼내 쓴다.
+여러 슬롯이 같은 데이터(URL)를 고른 경우 bytes 합계와 다운로드는 한 번만 계산한다.
+"""
+import bisect
+import random
+
+# 슬롯별 최소 width (백오피스 검증 기준)
+SLOT_MIN_LENGTH = {
+    "mainImage": 1280,
+    "mainImageHiRes": 1920,
+    "mainVideo": 1280,
+    "mainVideoHiRes": 1920,
+}
+IMAGE_SLOTS = ("mainImage", "mainImageHiRes")
+VIDEO_SLOTS = ("mainVideo", "mainVideoHiRes")
+
+
+def scaled_size(width, height, limit):
+    """
+    Pixabay 축소 이미지(largeImageURL, fullHDURL)의 w/h 추정 (긴 변이 limit을 넘으면 limit에 맞춰 비율 유지 축소)
+
+    :param width: 원본 width
+    :param height: 원본 height
+    :param limit: 긴 변 최대 길이
+    :return: (width, height)
+    """
+    longest = max(width, height)
+    if longest <= limit:
+        return width, height
+    return round(width * limit / longest), round(height * limit / longest)
+
+
+def url_name(url):
+    """
+    URL에서 파일명 추출 (쿼리스트링 제외)
+
+    :param url: 이미지/영상 URL
+    :return: 파일명
+    """
+    return url.split("?")[0].rsplit("/", 1)[-1]
+
+
+def image_renditions(hit):
+    """
+    이미지 검색 결과 하나의 해상도별 데이터 리스트
+    원본(imageURL)만 bytes 정보가 있으므로 축소 이미지는 픽셀 수 비율로 bytes를 추정하고,
+    w/h 역시 추정값이므로 exact=False 로 표시한다. (다운로드 후 실제 w/h 확인 필요)
+
+    :param hit: Pixabay 이미지 검색 결과 하나
+    :return: [{"url", "width", "height", "size", "exact"}, ...]
+    """
+    width, height = hit.get("imageWidth", 0), hit.get("imageHeight", 0)
+    size = hit.get("imageSize") or 0
+    pixels = width * height or 1
+    renditions = []
+    for key, limit in (("largeImageURL", 1280), ("fullHDURL", 1920)):
+        if hit.get(key):
+            scaled_width, scaled_height = scaled_size(width, height, limit)
+            renditions.append(
+                dict(
+                    url=hit[key],
+                    width=scaled_width,
+                    height=scaled_height,
+                    size=size * scaled_width * scaled_height // pixels,
+                    exact=False,
+                )
+            )
+    if hit.get("imageURL"):
+        renditions.append(
+            dict(url=hit["imageURL"], width=width, height=height, size=size, exact=True)
+        )
+    return renditions
+
+
+def video_renditions(hit):
+    """
+    영상 검색 결과 하나의 해상도별 데이터 리스트 (large, medium, small, tiny 중 URL이 있는 것)
+
+    :param hit: Pixabay 영상 검색 결과 하나
+    :return: [{"url", "width", "height", "size", "exact"}, ...]
+    """
+    return [
+        dict(
+            url=one["url"], width=one["width"], height=one["height"], size=one.get("size") or 0,
+            exact=True,
+        )
+        for one in hit.get("videos", {}).values()
+        if one.get("url")
+    ]
+
+
+class RenditionIndex:
+    """
+    검색 결과 인덱스 클래스
+
+    entries: 모든 슬롯을 만족하는 검색 결과별 (hit, 슬롯별 선택 데이터, 선택 데이터 bytes 합계), bytes 합계 오름차순
+    """
+    def __init__(self, hits, renditions, slots, seed=None):
+        """
+        해상도(픽셀 수), bytes 순으로 정렬한 뒤 슬롯별 최소 해상도를 만족하는 첫 번째 데이터를 선택
+
+        :param hits: Pixabay 검색 결과 리스트
+        :param renditions: 검색 결과 하나의 해상도별 데이터 리스트를 리턴하는 함수 (image_renditions | video_renditions)
+        :param slots: 선택할 슬롯 (IMAGE_SLOTS | VIDEO_SLOTS)
+        :param seed: 랜덤 선택 seed (인덱스 전용 random.Random 객체 사용)
+        """
+        self.random = random.Random(seed)
+        self.entries = []
+        for hit in hits:
+            ranked = sorted(renditions(hit), key=lambda x: (x["width"] * x["height"], x["size"]))
+            picks = {
+                slot: next(
+                    (x for x in ranked if max(x["width"], x["height"]) >= SLOT_MIN_LENGTH[slot]),
+                    None,
+                )
+                for slot in slots
+            }
+            if all(picks.values()):
+                total = sum({pick["url"]: pick["size"] for pick in picks.values()}.values())
+                self.entries.append((hit, picks, total))
+        self.entries.sort(key=lambda x: x[2])
+        self.totals = [entry[2] for entry in self.entries]
+
+    def pick(self, max_bytes=None):
+        """
+        검색 결과 하나를 랜덤하게 선택
+        max_bytes 입력 시 선택 데이터 bytes 합계가 그 안에 들어오는 검색 결과 중에서 선택하고, 없으면 가장 작은 검색 결과를 선택한다.
+
+        :param max_bytes: 선택 데이터 bytes 합계 상한
+        :return: (hit, {슬롯: 선택 데이터})
+        """
+        if not self.entries:
+            raise ValueError("슬롯별 최소 해상도를 만족하는 Pixabay 검색 결과가 없습니다.")
+        count = len(self.entries)
+        if max_bytes is not None:
+            count = max(bisect.bisect_right(self.totals, max_bytes), 1)
+        hit, picks, _ = self.entries[self.random.randrange(count)]
+        return hit, picks
@@ -2,8 +2,6 @@
 백오피스 어드민 API를 통해 NFT 생성 요청 및 Admin 데이터 조회 클래스
 
 """
-import json
-
 import requests
 
 
@@ -14,21 +12,52 @@ class SessionRequest:
 
     작가 목록, 총 작가 수, 사용 가능한 NFT ID, NFT 생성 요청, HTTP request session 처리 (payload에 따라 다르게 요청)
     """
-    def __init__(self, edition="eth", author_seller_id=0):
-        self.addr = "https://qa.backoffice.admin.nftcreate.com/"
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        edition="eth",
+        author_seller_id=0,
+        addr=None,
+        *,
+        compressor=None,
+        nftid=None,
+        http_session=None,
+    ):
+        """
+        :param edition: 에디션 유형 (eth | btc | auction)
+        :param author_seller_id: 작가/셀러 ID, 입력하지 않으면 에디션별 기본 ID
+        :param addr: 백오피스 Admin API 주소, 입력하지 않으면 QA 백오피스 (로컬 mock 서버 검증 시 변경)
+        :param compressor: 생성 요청 바디 압축 객체 (BodyCompressor), 없으면 압축하지 않고 전송
+        :param nftid: 이미 확보한 NFT ID (재실행 시 저널에 기록된 ID), 없으면 사용 가능한 ID 조회
+        :param http_session: 여러 에디션에서 공유할 requests 세션 (커넥션 재사용), 없으면 새로 생성
+        """
+        self.addr = (
+            addr.rstrip("/") + "/" if addr else "https://qa.backoffice.admin.nftcreate.com/"
+        )
+        self.compressor = compressor
         self.headers = {
             "content-type": "application/json;charset=UTF-8",
             "accept": "application/json, text/plain, */*",
             "authorization": "Bearer <bearerToken>",
         }
-        self.session = requests.Session()
+        self.session = http_session if http_session else requests.Session()
         self.session.headers.update(self.headers)
-        self.edition = "eth" if edition == "auction" else edition
+        self.edition, self.author_seller_id = self.resolve_author(edition, author_seller_id)
+        self.nftid = int(nftid) if nftid else self.get_available_nft_id
+
+    @staticmethod
+    def resolve_author(edition="eth", author_seller_id=0):
+        """
+        에디션 유형에 따른 엔드포인트 구분(eth | btc) 및 작가/셀러 ID 결정
+        옥션은 eth 엔드포인트를 사용하고, ID를 입력하지 않으면 eth는 100, btc는 200을 기본 ID로 사용한다.
+
+        :param edition: 에디션 유형 (eth | btc | auction)
+        :param author_seller_id: 입력받은 작가/셀러 ID
+        :return: (eth | btc, 작가/셀러 ID)
+        """
+        edition = "eth" if edition == "auction" else edition
         if author_seller_id:
-            self.author_seller_id = int(author_seller_id)
-        else:
-            self.author_seller_id = 100 if self.edition == "eth" else 200
-        self.nftid = self.get_available_nft_id
+            return edition, int(author_seller_id)
+        return edition, 100 if edition == "eth" else 200
 
     @property
     def get_authors(self):
@@ -166,37 +195,96 @@ class SessionRequest:
 
         return response
 
-    def create_nft(self):
+    @property
+    def edition_addr(self):
         """
-        NFT ID 및 메타데이터 json 파일을 가지고 실제 NFT 생성 요청하는 기능
-        (*Backoffice Admin API를 통한 생성)
+        에디션 유형에 따른 생성/상태 변경 엔드포인트
 
-        status code 200인 케이스를 제외하면 모두 에러이므로 valueError 발생시키며 종료
+        :return: eth | btc 엔드포인트 주소
+        """
+        return self.addr + "eth" if self.edition == "eth" else self.addr + "btc"
 
-        최초 생성 시 DRAFT 상태이고 상태를 LIVE로 변경까지 진행한다.
+    @property
+    def nft_url(self):
+        """
+        생성된 에디션의 상세 페이지 링크
+
+        :return: 상세 페이지 URL
+        """
+        return f"https://qa.nftcreate.com/{self.edition}/detail/{self.nftid}"
 
+    def post_nft(self, payload_path="./senddata.json", stream=False):
+        """
+        메타데이터 json 파일을 가지고 NFT 생성 요청 (DRAFT 상태로 생성)
+
+        status code 200인 케이스를 제외하면 모두 에러이므로 valueError 발생시키며 종료
+
+        :param payload_path: 메타데이터 json 파일 경로
+        :param stream: json 파일을 메모리에 읽지 않고 파일 객체 그대로 스트리밍 전송할지 여부 (메모리 예산 사용 시)
         :return:
         """
         print(f'{self.nftid} ID로 NFT가 생성됩니다.')
-        reqaddr = (
-            self.addr + "eth"
-            if self.edition == "eth"
-            else self.addr + "btc"
-        )
-        with open("./senddata.json", "r", encoding="utf-8") as jsondata:
-            response = self.request_session(reqaddr, "POST", json.load(jsondata))
+        reqaddr = self.edition_addr
+        if self.compressor:
+            # 압축 옵션이 있으면 json 파일을 다시 파싱하지 않고 청크 단위로 압축하면서 그대로 전송
+            response = self.session.request(
+                method="POST",
+                url=reqaddr,
+                data=self.compressor.iter_file(payload_path),
+                headers={"content-encoding": self.compressor.encoding},
+            )
+            self.compressor.print_report()
+        else:
+            # json 파일을 다시 파싱/직렬화하지 않고 기록된 bytes 그대로 전송
+            with open(payload_path, "rb") as jsondata:
+                response = self.session.request(
+                    method="POST", url=reqaddr, data=jsondata if stream else jsondata.read()
+                )
 
         if response.status_code != 200:
             raise ValueError(
                 f"해당 데이터로 NFT 생성에 실패했습니다 메타데이터를 다시 확인해주세요. status_code: {response.status_code}"
             )
 
-        nft_url = f"https://qa.nftcreate.com/{self.edition}/detail/{self.nftid}"
-        reqaddr = reqaddr + f"/{self.nftid}/status"
-        datadict = {"id": self.nftid, "status": 3}
-        response = self.request_session(reqaddr, "PUT", datadict)
-        print("에디션이 라이브 상태로 변경되었습니다. 확인해보세요. " if response.status_code == 200 else None)
-        print(f"생성된 에디션 링크는 다음과 같습니다.: {nft_url}")
+    def set_live(self):
+        """
+        DRAFT 상태로 생성된 에디션을 LIVE(3) 상태로 변경
+
+        status code 200이 아니면 이후 재실행(--resume) 시 이 단계부터 다시 진행할 수 있도록 valueError 발생
+
+        :return:
+        """
+        response = self.set_status(3)
+        if response.status_code != 200:
+            raise ValueError(
+                f"에디션 {self.nftid} 상태를 LIVE로 변경하지 못했습니다. status_code: {response.status_code}"
+            )
+        print("에디션이 라이브 상태로 변경되었습니다. 확인해보세요. ")
+
+    def set_status(self, status):
+        """
+        에디션 상태 변경 요청 (1: DRAFT, 3: LIVE 등)
+
+        :param status: 변경할 상태 코드
+        :return: 응답
+        """
+        reqaddr = self.edition_addr + f"/{self.nftid}/status"
+        datadict = {"id": self.nftid, "status": status}
+        return self.request_session(reqaddr, "PUT", datadict)
+
+    def create_nft(self, payload_path="./senddata.json"):
+        """
+        NFT ID 및 메타데이터 json 파일을 가지고 실제 NFT 생성 요청하는 기능
+        (*Backoffice Admin API를 통한 생성)
+
+        최초 생성 시 DRAFT 상태이고 상태를 LIVE로 변경까지 진행한다.
+
+        :param payload_path: 메타데이터 json 파일 경로
+        :return:
+        """
+        self.post_nft(payload_path)
+        self.set_live()
+        print(f"생성된 에디션 링크는 다음과 같습니다.: {self.nft_url}")
 
     def request_session(self, url, method, payload=None):
         """
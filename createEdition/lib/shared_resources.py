@@ -0,0 +1,114 @@
+"""
+여러 에디션 생성 시 공유 자원 모듈
+
+매트릭스/데몬 실행처럼 한 프로세스에서 에디션을 연속으로 생성하는 경우,
+매번 새로 만들 필요가 없는 자원(HTTP 세션, 작가 ID 확인 결과, 이미지/영상 데이터)을 한 번만 준비해서 재사용한다.
+static.json은 load_static_data 에서 프로세스 단위로 캐시된다.
+"""
+import json
+import os
+import threading
+
+import requests
+
+from lib.http_cassette import attach_cassette
+from lib.image_handler import ImageHandler
+from lib.metadata_handler import MetadataHandler
+from lib.visibility_probe import VisibilityProbe
+
+
+class SharedResources:
+    """
+    에디션 생성 공유 자원 클래스
+
+    http_session: 백오피스 Admin API 요청용 세션 (TLS 커넥션 재사용)
+    image_handler: Pixabay 요청용 ImageHandler (세션 재사용)
+    verified_authors: 존재 여부 확인이 끝난 (에디션 유형, 작가/셀러 ID)
+    media: 필요 유형(image | video)별 이미지/영상 데이터 및 캐시 파일 경로
+    probe: 에디션 노출 시간 측정 객체 (VisibilityProbe, --probe 옵션 시)
+    """
+    def __init__(self, media_dir="media_cache", max_memory=None, seed=None):
+        """
+        :param media_dir: 공유 이미지/영상 캐시 폴더
+        :param max_memory: 이미지/영상 다운로드 시 메모리 예산 (bytes)
+        :param seed: Pixabay 검색 결과 랜덤 선택 seed
+        """
+        self.http_session = requests.Session()
+        self.image_handler = ImageHandler(
+            max_memory=max_memory, spill_dir=os.path.join(media_dir, "spill"), seed=seed
+        )
+        self.verified_authors = set()
+        self.media = {}
+        self.media_dir = media_dir
+        self.probe = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args, media_dir="media_cache"):
+        """
+        공통 파라미터에 맞춰 공유 자원 생성
+        (--max-memory 예산, --seed 랜덤 선택, --probe 측정 객체, --record / --replay cassette 연결)
+
+        :param args: 공통 파라미터 (MetadataHandler.parsing 결과)
+        :param media_dir: 공유 이미지/영상 캐시 폴더
+        :return: SharedResources
+        """
+        shared = cls(
+            media_dir=media_dir, max_memory=MetadataHandler.memory_budget(args), seed=args.seed
+        )
+        shared.probe = VisibilityProbe.from_args(args)
+        for http_session in (shared.http_session, shared.image_handler.session):
+            attach_cassette(args, http_session)
+        return shared
+
+    def verify_author(self, reqsession):
+        """
+        작가/셀러 ID 존재 여부 확인 (에디션 유형 + ID 조합별로 한 번만 조회)
+
+        :param reqsession: SessionRequest 객체
+        :return:
+        """
+        key = (reqsession.edition, reqsession.author_seller_id)
+        with self.lock:
+            if key in self.verified_authors:
+                return
+        # 작가 리스트 조회 및 작가 ID 존재 여부 조회
+        authorlist, total_count = reqsession.get_authors
+        reqsession.get_authorid_exist(authorlist, total_count)
+        with self.lock:
+            self.verified_authors.add(key)
+
+    def get_media(self, video=False):
+        """
+        비디오 옵션 여부에 맞는 공유 이미지/영상 데이터 리턴
+        이미지만 필요한 경우와 영상까지 필요한 경우 각각 한 세트씩만 다운로드하며, 이미지는 두 세트가 같이 사용한다.
+
+        :param video: 영상 데이터 필요 여부 (-v 옵션)
+        :return: (이미지/영상 데이터 dict, 캐시 파일 경로)
+        """
+        need = "video" if video else "image"
+        with self.lock:
+            self.image_handler.reset_budget()
+            if need not in self.media:
+                self.media[need] = self.fetch(need)
+            return self.media[need]
+
+    def fetch(self, need):
+        """
+        필요 유형의 이미지/영상 데이터 다운로드 후 캐시 파일 저장 (lock 안에서 호출)
+
+        :param need: image | video
+        :return: (이미지/영상 데이터 dict, 캐시 파일 경로)
+        """
+        shared = next(iter(self.media.values()), None)
+        image = shared[0]["image"] if shared else self.image_handler.get_all_images()
+        media = {"image": image}
+        if need == "video":
+            media["video"] = self.image_handler.get_all_videos()
+
+        cache_path = os.path.join(self.media_dir, f"shared_{need}.json")
+        if not os.path.exists(self.media_dir):
+            os.makedirs(self.media_dir)
+        with open(cache_path, "w", encoding="utf-8") as file:
+            json.dump(media, file)
+        return media, cache_path
@@ -0,0 +1,117 @@
+"""
+생성 단계 저널 모듈
+
+NFT 생성 흐름의 각 단계가 완료될 때마다 json line 한 줄씩 append 하여 기록한다.
+중간에 실패하거나 프로세스가 종료되어도 --resume 옵션으로 마지막 완료 단계 다음부터 이어서 진행할 수 있다.
+"""
+import json
+import os
+from datetime import datetime
+
+# 생성 흐름 단계 (순서대로 진행)
+# reserved: NFT ID 확보, media_fetched: 이미지/영상 다운로드, payload_built: 메타데이터 json 생성,
+# posted: 생성 요청(DRAFT), scheduled: LIVE 예약 등록(--draft-only), live: LIVE 상태 변경,
+# shortened: 에어드롭 URL 축약, qr_rendered: QR 코드 생성
+STAGES = (
+    "reserved",
+    "media_fetched",
+    "payload_built",
+    "posted",
+    "scheduled",
+    "live",
+    "shortened",
+    "qr_rendered",
+)
+
+
+def read_records(path, warn=False):
+    """
+    json line 파일의 기록을 순서대로 읽기
+    마지막 줄이 기록 도중 종료되어 잘린 경우 등 파싱할 수 없는 줄은 건너뛴다.
+
+    :param path: json line 파일 경로
+    :param warn: 건너뛴 줄 경고 출력 여부
+    :return: generator of dict
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                if warn:
+                    print(f"파싱할 수 없는 줄을 건너뜁니다: {path}:{number}")
+
+
+class StageJournal:
+    """
+    append-only 단계 저널 클래스
+    한 줄에 한 단계씩 {"stage": 단계명, "at": 완료 시각, ...단계별 데이터} 형태로 기록한다.
+    """
+    def __init__(self, path="stage_journal.jsonl", resume=False):
+        """
+        재실행(resume)이 아니면 기존 저널을 지우고 새로 시작, 재실행이면 기존 기록을 불러온다.
+
+        :param path: 저널 파일 경로
+        :param resume: 이어서 진행 여부
+        """
+        self.path = path
+        self.records = {}
+        if resume:
+            if not os.path.exists(path):
+                raise ValueError(f"이어서 진행할 저널 파일이 없습니다: {path}")
+            # 마지막 줄이 기록 도중 종료되어 잘린 경우는 완료되지 않은 단계로 본다.
+            for record in read_records(path):
+                self.records[record["stage"]] = record
+        else:
+            journal_dir = os.path.dirname(path)
+            if journal_dir and not os.path.exists(journal_dir):
+                os.makedirs(journal_dir)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def done(self, stage):
+        """
+        해당 단계가 완료되었는지 여부
+
+        :param stage: 단계명
+        :return: bool
+        """
+        return stage in self.records
+
+    def get(self, stage):
+        """
+        완료된 단계의 기록 데이터
+
+        :param stage: 단계명
+        :return: dict, 완료되지 않은 단계면 None
+        """
+        return self.records.get(stage)
+
+    @property
+    def last_stage(self):
+        """
+        마지막으로 완료된 단계명
+
+        :return: 단계명, 완료된 단계가 없으면 None
+        """
+        completed = [stage for stage in STAGES if stage in self.records]
+        return completed[-1] if completed else None
+
+    def record(self, stage, **data):
+        """
+        단계 완료 기록, 기록 직후 fsync 하여 프로세스가 종료되어도 남아있게 한다.
+
+        :param stage: 단계명
+        :param data: 단계별로 남길 데이터 (NFT ID, 캐시 경로 등)
+        :return:
+        """
+        if stage not in STAGES:
+            raise ValueError(f"정의되지 않은 단계입니다: {stage}")
+        record = dict(stage=stage, at=datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"), **data)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self.records[stage] = record
@@ -0,0 +1,197 @@
+"""
+생성 후 노출 시간 측정 모듈
+
+생성 요청(DRAFT) 및 LIVE 변경 이후 에디션이 실제로 조회되기까지 걸리는 시간을 측정한다.
+- draftVisible: 생성 요청 응답 -> Admin 단건 조회(/{eth|btc}/{id}) 성공
+- liveAdmin: LIVE 변경 응답 -> Admin 단건 조회 결과가 LIVE(3)
+- livePublic: LIVE 변경 응답 -> 공개 상세 페이지(/{eth|btc}/detail/{id}) 200 응답
+
+조회는 별도 스레드에서 간격을 점점 늘리며(adaptive backoff) 반복하므로 여러 에디션을 동시에 측정할 수 있고 생성 흐름을 막지 않는다.
+"""
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+
+from lib.http_cassette import cassette_session
+from lib.live_scheduler import percentile
+
+# 측정 항목 (요약 출력 순서)
+METRICS = ("draftVisible", "liveAdmin", "livePublic")
+
+
+class VisibilityProbe:
+    """
+    에디션 노출 시간 측정 클래스 (worker 스레드마다 별도 requests 세션 사용)
+    """
+    def __init__(self, public_base=None, timeout=60, workers=16, session_factory=requests.Session):
+        """
+        :param public_base: 공개 상세 페이지 주소, 입력하지 않으면 QA 서비스 (로컬 mock 서버 검증 시 변경)
+        :param timeout: 에디션별 최대 측정 시간 (초)
+        :param workers: 동시에 측정하는 최대 요청 수
+        :param session_factory: worker 스레드별 requests 세션 생성 함수 (cassette 연결 시 변경)
+        """
+        self.public_base = (
+            public_base.rstrip("/") + "/" if public_base else "https://qa.nftcreate.com/"
+        )
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, initializer=self.init_session, initargs=(session_factory,)
+        )
+        self.futures = []
+        self.results = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args):
+        """
+        --probe 옵션이 있으면 측정 객체 생성 (--record / --replay 옵션이면 조회 요청도 기록/재생)
+
+        :param args: 파싱된 파라미터
+        :return: VisibilityProbe, 옵션이 없으면 None
+        """
+        if args.probe:
+            return cls(
+                public_base=args.public_base,
+                timeout=args.probe_timeout,
+                session_factory=functools.partial(cassette_session, args),
+            )
+        return None
+
+    def init_session(self, session_factory):
+        """
+        worker 스레드 시작 시 스레드별 requests 세션 생성
+
+        :param session_factory: requests 세션 생성 함수
+        :return:
+        """
+        self.local.session = session_factory()
+
+    def watch(self, reqsession, event):
+        """
+        측정 시작 (생성 요청 또는 LIVE 변경 응답 직후 호출)
+
+        :param reqsession: 생성/상태 변경에 사용한 SessionRequest 객체
+        :param event: posted | live
+        :return:
+        """
+        started = time.perf_counter()
+        admin_url = reqsession.edition_addr + f"/{reqsession.nftid}"
+        key = (reqsession.edition, reqsession.nftid)
+        with self.lock:
+            self.results.setdefault(key, dict(edition=key[0], nftid=key[1]))
+        if event == "posted":
+            checks = [("draftVisible", (admin_url, None, reqsession.headers))]
+        else:
+            # 공개 상세 페이지에는 Admin 토큰을 보내지 않는다.
+            public_url = self.public_base + f"{reqsession.edition}/detail/{reqsession.nftid}"
+            checks = [
+                ("liveAdmin", (admin_url, 3, reqsession.headers)),
+                ("livePublic", (public_url, None, None)),
+            ]
+        # 데몬처럼 wait 없이 계속 측정하는 경우 끝난 측정은 목록에서 제외
+        self.futures = [future for future in self.futures if not future.done()]
+        for metric, target in checks:
+            self.futures.append(self.executor.submit(self.poll, key, metric, target, started))
+
+    def result(self, edition, nftid):
+        """
+        에디션 하나의 측정 결과
+
+        :param edition: eth | btc
+        :param nftid: NFT ID
+        :return: dict, 측정하지 않은 에디션이면 None
+        """
+        with self.lock:
+            result = self.results.get((edition, int(nftid)))
+            return dict(result) if result else None
+
+    def poll(self, key, metric, target, started):
+        """
+        조회 성공 시까지 반복 조회 (50ms 부터 1.5배씩 최대 2초 간격)
+
+        :param key: (에디션 유형, NFT ID)
+        :param metric: 측정 항목
+        :param target: (조회 URL, 기대 상태 코드 (없으면 200 응답만 확인), 요청 헤더 (없으면 생략))
+        :param started: 측정 기준 시각 (perf_counter)
+        :return:
+        """
+        url, status, headers = target
+        interval, attempts = 0.05, 0
+        while time.perf_counter() - started < self.timeout:
+            attempts += 1
+            try:
+                response = self.local.session.request(method="GET", url=url, headers=headers)
+                visible = response.status_code == 200
+                if visible and status is not None:
+                    # 응답이 객체가 아닌 경우(목록, 에러 문자열 등)는 아직 조회되지 않은 것으로 본다.
+                    body = response.json()
+                    visible = isinstance(body, dict) and body.get("status") == status
+            except (ValueError, requests.RequestException):
+                visible = False
+            if visible:
+                elapsed = round((time.perf_counter() - started) * 1000, 1)
+                with self.lock:
+                    self.results[key].update({f"{metric}Ms": elapsed, f"{metric}Polls": attempts})
+                return
+            time.sleep(interval)
+            interval = min(interval * 1.5, 2)
+        with self.lock:
+            self.results[key].update({f"{metric}Ms": None, f"{metric}Polls": attempts})
+
+    def wait(self):
+        """
+        진행 중인 측정이 모두 끝날 때까지 대기
+
+        :return: 에디션별 결과 리스트
+        """
+        wait(self.futures)
+        self.futures = []
+        with self.lock:
+            return [dict(result) for result in self.results.values()]
+
+    @property
+    def summary(self):
+        """
+        측정 항목별 분포 (ms), 제한 시간 안에 조회되지 않은 에디션 수
+
+        :return: dict
+        """
+        summary = {}
+        with self.lock:
+            for metric in METRICS:
+                measured = [x for x in self.results.values() if f"{metric}Polls" in x]
+                values = sorted(x[f"{metric}Ms"] for x in measured if x[f"{metric}Ms"] is not None)
+                if not measured:
+                    continue
+                summary[metric] = dict(
+                    count=len(values),
+                    timedOut=len(measured) - len(values),
+                    p50=percentile(values, 50),
+                    p90=percentile(values, 90),
+                    p99=percentile(values, 99),
+                    max=values[-1] if values else None,
+                )
+        return summary
+
+    def print_summary(self):
+        """
+        측정 항목별 분포 출력
+
+        :return: 요약 dict
+        """
+        summary = self.summary
+        labels = dict(
+            draftVisible="생성 요청 -> Admin 조회",
+            liveAdmin="LIVE 변경 -> Admin LIVE 조회",
+            livePublic="LIVE 변경 -> 상세 페이지 노출",
+        )
+        for metric, item in summary.items():
+            print(
+                f"{labels[metric]}: {item['count']}건 p50 {item['p50']}ms / p90 {item['p90']}ms / "
+                f"p99 {item['p99']}ms / max {item['max']}ms (시간 초과 {item['timedOut']}건)"
+            )
+        return summary
@@ -0,0 +1,35 @@
+"""
+    생성 엔드포인트 open-loop 부하 생성
+
+    고정(--rate) 또는 선형 증가(--rate ~ --ramp-to) 도착률로 생성 요청을 보내고,
+    예정 전송 시각 기준 지연 시간 p50/p99/p99.9, 에러율, 목표 대비 실제 처리량을 출력한다.
+    요청 바디는 템플릿 하나만 만들어두고 NFT ID만 끼워넣으며, --compress 옵션 시 부하 시작 전에 요청 수만큼 미리 압축한다.
+    동시 요청 수(--max-inflight)가 가득 찬 상태에서 예정 시각이 된 요청은 보내지 않고 누락(dropped)으로 기록한다.
+    공통 옵션(-k, -v, --backoffice, --compress 등)은 main.py 와 동일하게 입력한다.
+
+    $ python3 -m lib.mock_backoffice --port 8090
+    $ python3 loadgen.py --rate 20 --duration 30 -k edition=eth --backoffice http://127.0.0.1:8090/
+    $ python3 loadgen.py --rate 10 --ramp-to 100 --duration 60 -k edition=eth --compress gzip
+"""
+import argparse
+import json
+
+from lib.load_generator import LoadGenerator
+from lib.metadata_handler import MetadataHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", help="arrival rate (requests per second)", type=float,
+                        required=True)
+    parser.add_argument("--ramp-to", help="arrival rate at the end of the run", type=float)
+    parser.add_argument("--duration", help="run duration in seconds", type=float, default=10)
+    parser.add_argument("--max-inflight", help="max concurrent requests", type=int, default=64)
+    parser.add_argument("--report", help="report json file path", default="loadgen_report.json")
+    load_args, common_argv = parser.parse_known_args()
+
+    report = LoadGenerator(MetadataHandler.parsing(common_argv), load_args.max_inflight).run(
+        load_args.rate, load_args.duration, load_args.ramp_to
+    )
+    with open(load_args.report, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,34 @@
+"""
+    조합 테스트 매트릭스 실행
+
+    축 정의 파일을 카테시안 곱으로 펼쳐 유효한 조합만 순서대로 생성한다.
+    작가 조회, 이미지/영상 다운로드, static.json 로드는 매트릭스 전체에서 한 번씩만 수행한다.
+    공통 옵션(--backoffice, --compress, --resume 등)은 main.py 와 동일하게 입력한다.
+
+    $ python3 matrix.py matrix_axes.json --dry-run
+    $ python3 matrix.py matrix_axes.json --backoffice http://127.0.0.1:8090/
+"""
+import argparse
+import json
+
+from lib.combination_matrix import MatrixRunner, expand_matrix
+from lib.metadata_handler import MetadataHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("axes", help="matrix axis definition json file")
+    parser.add_argument("--out", help="matrix output directory", default="matrix")
+    parser.add_argument("--dry-run", help="print expanded combinations only", action="store_true")
+    matrix_args, common_argv = parser.parse_known_args()
+
+    with open(matrix_args.axes, "r", encoding="utf-8") as axes_file:
+        cells, skipped = expand_matrix(json.load(axes_file))
+    print(f"유효한 조합 {len(cells)}개, 제외된 조합 {len(skipped)}개")
+    if matrix_args.dry_run:
+        for cell in cells:
+            print(f"- -k {cell['k']} flags {cell['flags']}")
+        for cell in skipped:
+            print(f"x -k {cell['k']} flags {cell['flags']} ({cell['reason']})")
+    else:
+        MatrixRunner(MetadataHandler.parsing(common_argv), cells, matrix_args.out).run()
@@ -0,0 +1,36 @@
+"""
+    메타데이터 json(senddata*.json) 크기 분석
+
+    생성 요청 바디를 최상위 필드별, 이미지/영상 슬롯별 bytes로 나누어 집계하고 중복 값을 찾아
+    dedupe, 최소 해상도 축소, base64 제거, 중첩 json 문자열 제거, 압축 시 절감 bytes를 추정한다.
+    폴더를 입력하면 하위 폴더의 senddata*.json 파일 전체를 합산한다. (매트릭스, job 큐 worker 결과 등)
+
+    $ python3 payload_profile.py senddata.json
+    $ python3 payload_profile.py matrix queue_work --mbps 50 --compress zstd
+"""
+import argparse
+import json
+
+from lib.payload_profiler import PayloadProfiler, iter_payload_files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("payloads", nargs="+", help="metadata json files or directories")
+    parser.add_argument("--compress", help="compression to estimate", choices=["gzip", "zstd"],
+                        default="gzip")
+    parser.add_argument("--compress-level", help="compression level", type=int)
+    parser.add_argument("--mbps", help="upload bandwidth to estimate transfer time", type=float)
+    parser.add_argument("--top", help="number of fields to print", type=int, default=15)
+    parser.add_argument("--report", help="report json file path", default="payload_profile.json")
+    profile_args = parser.parse_args()
+
+    profiler = PayloadProfiler(profile_args.compress, profile_args.compress_level)
+    for path in iter_payload_files(profile_args.payloads):
+        profiler.add(path)
+    if not profiler.files:
+        parser.error("분석할 메타데이터 json 파일이 없습니다.")
+    report = profiler.report(profile_args.mbps)
+    profiler.print_report(report, profile_args.top)
+    with open(profile_args.report, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,64 @@
+"""
+    테스트 에디션 일괄 정리
+
+    이전 실행 기록(단계 저널, 매트릭스 리포트, job 큐, LIVE 예약 파일)에서 생성 요청까지 끝난 NFT ID 또는
+    작가/셀러별로 조회한 NFT ID를 DROPPED 상태로 변경한다.
+    생성 요청 전 ID 확보만 기록된 NFT ID는 목록만 출력하고, 작가/셀러 조회 결과와 같이 --scan-all --yes 로만 정리한다.
+    작가/셀러별로 조회한 ID 중 실행 기록에 없는 ID는 --scan-all 옵션이 있어야 포함하며,
+    목록을 먼저 출력하고 --yes 옵션이 없으면 상태를 변경하지 않는다.
+    처리 완료된 에디션은 로그 파일(--log)에 기록되므로 재실행 시 실패한 에디션만 다시 처리한다.
+
+    $ python3 teardown.py matrix queue.db stage_journal.jsonl --dry-run
+    $ python3 teardown.py matrix queue_work --workers 8 --rate 20
+    $ python3 teardown.py matrix --author eth:100 --scan 300 --backoffice http://127.0.0.1:8090/
+    $ python3 teardown.py --author eth:100 --author btc:200 --scan-all --yes
+"""
+import argparse
+
+from lib.edition_teardown import (
+    DROPPED_STATUS, EditionTeardown, collect_recorded, merge_scanned, scan_author
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("records", nargs="*",
+                        help="journal / report / queue files or directories of previous runs")
+    parser.add_argument("--author", action="append", default=[],
+                        help="edition:author/seller id to query (ex. eth:100)")
+    parser.add_argument("--scan", help="number of previous ids to check per author", type=int,
+                        default=100)
+    parser.add_argument("--scan-all", action="store_true",
+                        help="also drop scanned ids that are not in the records")
+    parser.add_argument("--yes", action="store_true",
+                        help="confirm dropping unrecorded scanned ids")
+    parser.add_argument("--status", help="status code to set", type=int, default=DROPPED_STATUS)
+    parser.add_argument("--workers", help="concurrent status requests", type=int, default=8)
+    parser.add_argument("--rate", help="max requests per second", type=float)
+    parser.add_argument("--log", help="teardown log file path", default="teardown_log.jsonl")
+    parser.add_argument("--backoffice",
+                        help="backoffice admin API base url (ex. local mock server)")
+    parser.add_argument("--dry-run", help="print target editions only", action="store_true")
+    teardown_args = parser.parse_args()
+
+    (targets, reserved), scanned = collect_recorded(teardown_args.records), set()
+    if reserved:
+        print(f"생성 요청 전 ID 확보만 기록된 에디션 {len(reserved)}개 (생성 여부를 알 수 없어 정리 대상에서 제외, "
+              "--author 조회 후 --scan-all --yes 로 정리)")
+        for edition, nft_id in sorted(reserved):
+            print(f"- {edition} {nft_id}")
+    for author in teardown_args.author:
+        edition, author_seller_id = author.split(":")
+        scanned |= scan_author(edition, author_seller_id, teardown_args.backoffice,
+                               teardown_args.scan)
+    targets, unrecorded = merge_scanned(targets, scanned, teardown_args.scan_all)
+    print(f"정리 대상 에디션 {len(targets)}개")
+    if teardown_args.scan_all and unrecorded and not teardown_args.yes:
+        print("실행 기록에 없는 에디션이 포함되어 있습니다. 목록 확인 후 --yes 옵션과 함께 다시 실행하세요.")
+    elif teardown_args.dry_run:
+        for edition, nft_id in sorted(targets):
+            print(f"- {edition} {nft_id}")
+    else:
+        EditionTeardown(
+            teardown_args.backoffice, teardown_args.workers, teardown_args.rate, teardown_args.log
+        ).run(targets, teardown_args.status)
@@ -0,0 +1,215 @@
+"""
+HttpCassette 재생 순서, stream 응답 기록, URL 축약 기록/재생, 검색 결과 인덱스 seed 단위 테스트
+
+$ python3 -m unittest discover -s tests
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import tempfile
+import unittest
+
+import requests
+from urllib3.response import HTTPResponse
+
+from lib.http_cassette import HttpCassette, TeeReader, shorten_url
+from lib.rendition_index import IMAGE_SLOTS, RenditionIndex, image_renditions
+
+BASE = "http://127.0.0.1:8090"
+
+
+def prepare(method, url):
+    """
+    재생 대상 요청 생성
+
+    :param method: HTTP method
+    :param url: 요청 URL
+    :return: requests.PreparedRequest
+    """
+    return requests.Request(method, url).prepare()
+
+
+class HttpCassetteReplayTest(unittest.TestCase):
+    """
+    (method, url) 별 기록 순서대로 재생, 기록을 다 쓰면 마지막 기록 반복, 기록되지 않은 요청은 연결 오류
+    """
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        entries = [
+            dict(method="GET", url=f"{BASE}/eth/nft-id", status=200, headers={}, body="1"),
+            dict(method="POST", url=f"{BASE}/eth", status=200, headers={}, body="created"),
+            dict(method="GET", url=f"{BASE}/eth/nft-id", status=200, headers={}, body="2"),
+            dict(method="GET", url=f"{BASE}/eth/nft-id", status=500, headers={}, body="3"),
+        ]
+        with open(
+            os.path.join(self.tempdir.name, "interactions.jsonl"), "w", encoding="utf-8"
+        ) as file:
+            file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+        self.cassette = HttpCassette(self.tempdir.name, "replay")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_same_request_replays_in_recorded_order(self):
+        """
+        같은 요청은 기록된 순서대로 응답한다.
+        """
+        request = prepare("GET", f"{BASE}/eth/nft-id")
+        bodies = [self.cassette.next_entry(request)["body"] for _ in range(3)]
+        self.assertEqual(bodies, ["1", "2", "3"])
+
+    def test_last_entry_repeats_when_exhausted(self):
+        """
+        기록보다 많이 요청하면 마지막 기록을 반복한다.
+        """
+        request = prepare("GET", f"{BASE}/eth/nft-id")
+        for _ in range(3):
+            self.cassette.next_entry(request)
+        entry = self.cassette.next_entry(request)
+        self.assertEqual((entry["body"], entry["status"]), ("3", 500))
+
+    def test_requests_are_ordered_per_method_and_url(self):
+        """
+        재생 순서는 (method, url) 별로 따로 진행된다.
+        """
+        post, get = prepare("POST", f"{BASE}/eth"), prepare("GET", f"{BASE}/eth/nft-id")
+        bodies = [self.cassette.next_entry(request)["body"] for request in (post, get, post)]
+        self.assertEqual(bodies, ["created", "1", "created"])
+
+    def test_unrecorded_request_raises_connection_error(self):
+        """
+        기록되지 않은 요청은 네트워크로 보내지 않고 연결 오류를 발생시킨다.
+        """
+        with self.assertRaises(requests.ConnectionError):
+            self.cassette.next_entry(prepare("GET", f"{BASE}/btc/nft-id"))
+
+
+class HttpCassetteStreamRecordTest(unittest.TestCase):
+    """
+    stream 응답 바디는 읽는 대로 파일에 기록하고, 끝까지 읽은 뒤 interactions.jsonl 에 기록
+    """
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.cassette = HttpCassette(self.tempdir.name, "record")
+        self.content = os.urandom(300 * 1024)
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response.raw = TeeReader(
+            HTTPResponse(body=io.BytesIO(self.content), preload_content=False),
+            self.cassette,
+            dict(method="GET", url=f"{BASE}/video.mp4", status=200, headers={}),
+            0.0,
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def read_entries(self):
+        """
+        기록된 interactions.jsonl 내용
+
+        :return: 기록 dict 리스트
+        """
+        with open(self.cassette.index_path, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_streamed_body_is_recorded_after_read(self):
+        """
+        청크 단위로 끝까지 읽으면 내용 해시 파일과 기록 한 줄이 남는다.
+        """
+        self.assertEqual(self.read_entries(), [])
+        read = b"".join(self.response.iter_content(chunk_size=64 * 1024))
+        entries = self.read_entries()
+        self.assertEqual(read, self.content)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["bodyRef"], hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(self.cassette.body(entries[0]), self.content)
+
+    def test_unread_stream_is_not_recorded(self):
+        """
+        바디를 읽지 않고 닫은 응답은 기록하지 않는다.
+        """
+        self.response.close()
+        self.assertEqual(self.read_entries(), [])
+
+
+class ShortenUrlTest(unittest.TestCase):
+    """
+    URL 축약 결과를 원본 URL 기준으로 기록하고, 재생 시 축약 함수를 호출하지 않고 기록된 값을 돌려준다.
+    """
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.origin_url = "https://qa.nftcreate.com/eth/detail/100001"
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def make_args(self, mode):
+        """
+        --record / --replay 옵션 파라미터
+
+        :param mode: record | replay
+        :return: argparse.Namespace
+        """
+        path = self.tempdir.name
+        return argparse.Namespace(
+            record=path if mode == "record" else None,
+            replay=path if mode == "replay" else None,
+            replay_latency=None,
+        )
+
+    def test_recorded_short_url_is_replayed_without_shortening(self):
+        """
+        기록한 축약 URL을 재생 시 그대로 돌려주고 축약 함수는 호출하지 않는다.
+        """
+        short_url = shorten_url(
+            self.make_args("record"), self.origin_url, lambda url: "https://bit.ly/x"
+        )
+        self.assertEqual(short_url, "https://bit.ly/x")
+
+        def fail(url):
+            raise AssertionError(f"재생 시 축약 함수 호출: {url}")
+
+        self.assertEqual(shorten_url(self.make_args("replay"), self.origin_url, fail), short_url)
+        self.assertIsNone(shorten_url(self.make_args("replay"), self.origin_url + "1", fail))
+
+
+class RenditionIndexSeedTest(unittest.TestCase):
+    """
+    seed 는 인덱스 전용 random.Random 객체에만 적용
+    """
+    hits = [
+        dict(imageURL=f"{BASE}/{index}.jpg", imageWidth=1920, imageHeight=1080, imageSize=index)
+        for index in range(1, 21)
+    ]
+
+    def picks(self, seed):
+        """
+        같은 seed 로 만든 인덱스에서 5번 선택한 검색 결과 URL
+
+        :param seed: seed 값
+        :return: URL 리스트
+        """
+        index = RenditionIndex(self.hits, image_renditions, IMAGE_SLOTS, seed=seed)
+        return [index.pick()[0]["imageURL"] for _ in range(5)]
+
+    def test_same_seed_picks_same_hits(self):
+        """
+        같은 seed 면 같은 순서로 선택한다.
+        """
+        self.assertEqual(self.picks(7), self.picks(7))
+
+    def test_global_random_is_untouched(self):
+        """
+        seed 를 적용해도 전역 random 상태는 바뀌지 않는다.
+        """
+        state = random.getstate()
+        self.picks(7)
+        self.assertEqual(random.getstate(), state)
+
+
+if __name__ == "__main__":
+    unittest.main()
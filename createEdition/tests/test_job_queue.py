@@ -0,0 +1,102 @@
+"""
+JobQueue lease 단위 테스트
+
+$ python3 -m unittest discover -s tests
+"""
+import os
+import tempfile
+import unittest
+
+from lib.job_queue import JobQueue
+
+PARAMS = {"k": {"edition": "eth"}, "v": False, "i": False, "o": False}
+
+
+class JobQueueLeaseTest(unittest.TestCase):
+    """
+    lease 만료 시 재처리, 최대 시도 횟수 초과 시 failed 처리, 작가 lock 대기 job 건너뛰기
+    """
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path = os.path.join(self.tempdir.name, "queue.db")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def make_queue(self, lease_seconds=60, max_attempts=3):
+        """
+        테스트용 큐 생성 (테스트 종료 시 커넥션 정리)
+
+        :param lease_seconds: lease 만료 시간, 음수면 lease 하자마자 만료
+        :param max_attempts: 단계별 최대 시도 횟수
+        :return: JobQueue
+        """
+        queue = JobQueue(self.path, lease_seconds, max_attempts)
+        self.addCleanup(queue.conn.close)
+        return queue
+
+    def test_expired_lease_is_leased_again(self):
+        """
+        heartbeat가 끊겨 만료된 lease는 다른 worker가 시도 횟수를 늘려 다시 가져간다.
+        """
+        queue = self.make_queue(lease_seconds=-1)
+        job_id = queue.enqueue(PARAMS, "eth:100")[0]
+        first = queue.lease("worker-a")
+        second = queue.lease("worker-b")
+        self.assertEqual(first["id"], job_id)
+        self.assertEqual(second["id"], job_id)
+        self.assertEqual(second["lease_owner"], "worker-b")
+        self.assertEqual(second["attempts"], 2)
+
+    def test_active_lease_is_not_leased_again(self):
+        """
+        만료되지 않은 lease는 다른 worker가 가져가지 않는다.
+        """
+        queue = self.make_queue()
+        queue.enqueue(PARAMS, "eth:100")
+        self.assertIsNotNone(queue.lease("worker-a"))
+        self.assertIsNone(queue.lease("worker-b"))
+
+    def test_expired_lease_fails_after_max_attempts(self):
+        """
+        시도 횟수를 모두 사용한 job의 lease가 만료되면 failed 로 처리하고 다시 가져가지 않는다.
+        """
+        queue = self.make_queue(lease_seconds=-1, max_attempts=2)
+        job_id = queue.enqueue(PARAMS, "eth:100")[0]
+        self.assertEqual(queue.lease("worker-a")["attempts"], 1)
+        self.assertEqual(queue.lease("worker-b")["attempts"], 2)
+        self.assertIsNone(queue.lease("worker-c"))
+        row = queue.conn.execute("SELECT state, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        self.assertEqual(row["state"], "failed")
+        self.assertIn("최대 시도 횟수", row["error"])
+        self.assertFalse(queue.has_pending)
+
+    def test_failed_attempt_keeps_error_message(self):
+        """
+        fail 로 기록한 에러 메시지는 lease 만료로 failed 처리될 때 유지된다.
+        """
+        queue = self.make_queue(lease_seconds=-1, max_attempts=2)
+        job_id = queue.enqueue(PARAMS, "eth:100")[0]
+        queue.fail(queue.lease("worker-a"), "build: timeout")
+        job = queue.lease("worker-b")
+        self.assertEqual(job["attempts"], 2)
+        self.assertIsNone(queue.lease("worker-c"))
+        row = queue.conn.execute("SELECT state, error FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        self.assertEqual((row["state"], row["error"]), ("failed", "build: timeout"))
+
+    def test_create_job_of_locked_author_is_skipped(self):
+        """
+        다른 worker가 작가 lock을 잡고 있는 create job은 건너뛰고 뒤의 job을 가져간다.
+        """
+        queue = self.make_queue()
+        locked, other = queue.enqueue(PARAMS, "eth:100")[0], queue.enqueue(PARAMS, "eth:200")[0]
+        queue.enqueue(PARAMS, "eth:100")
+        queue.conn.execute("UPDATE jobs SET stage = 'create'")
+        self.assertEqual(queue.lease("worker-a")["id"], locked)
+        # worker-a 가 eth:100 작가 lock을 잡고 있으므로 뒤에 있는 다른 작가 job을 가져간다.
+        self.assertEqual(queue.lease("worker-b")["id"], other)
+        self.assertIsNone(queue.lease("worker-b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+    job 큐 기반 다중 프로세스 생성
+
+    생성 job을 SQLite 큐에 등록한 뒤, 여러 worker 프로세스(같은 파일시스템을 공유하는 여러 호스트 포함)가 나눠서 처리한다.
+    같은 작가의 NFT ID 확보~생성 요청은 작가 lock으로 직렬 처리되고, 그 외 단계는 worker 수만큼 병렬로 처리된다.
+    공통 옵션(--backoffice, --compress 등)은 main.py 와 동일하게 입력한다.
+
+    $ python3 worker.py enqueue --count 50 -k edition=eth totalSupply=20 -v
+    $ python3 worker.py run --workers 8 --backoffice http://127.0.0.1:8090/
+    $ python3 worker.py status
+"""
+import argparse
+import multiprocessing
+import os
+
+from lib.job_queue import JobQueue
+from lib.metadata_handler import MetadataHandler, check_edition_kwargs
+from lib.queue_worker import QueueWorker, author_key
+
+
+def run_worker(common_argv, worker_args):
+    """
+    worker 프로세스 하나 실행 (multiprocessing target)
+
+    :param common_argv: 공통 파라미터 리스트
+    :param worker_args: worker.py 파라미터
+    :return:
+    """
+    QueueWorker(
+        MetadataHandler.parsing(common_argv),
+        worker_args.queue,
+        worker_args.work_dir,
+        lease_seconds=worker_args.lease,
+        wal=not worker_args.no_wal,
+    ).run(idle_exit=not worker_args.forever)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["enqueue", "run", "status"])
+    parser.add_argument("--queue", help="sqlite queue file path", default="queue.db")
+    parser.add_argument("--work-dir", help="payload directory", default="queue_work")
+    parser.add_argument("--count", help="number of jobs to enqueue", type=int, default=1)
+    parser.add_argument("--workers", help="number of worker processes", type=int,
+                        default=os.cpu_count())
+    parser.add_argument("--lease", help="lease seconds", type=int, default=60)
+    parser.add_argument("--forever", help="keep polling after queue is drained",
+                        action="store_true")
+    parser.add_argument("--no-wal", help="disable WAL (queue on network filesystem)",
+                        action="store_true")
+    queue_args, rest_argv = parser.parse_known_args()
+    queue = JobQueue(queue_args.queue, queue_args.lease, wal=not queue_args.no_wal)
+
+    if queue_args.command == "enqueue":
+        edition_args = MetadataHandler.parsing(rest_argv)
+        flags = {"v": edition_args.v, "i": edition_args.i, "o": edition_args.o}
+        reason = check_edition_kwargs(edition_args.k)
+        if reason:
+            raise ValueError(f"유효하지 않은 조합입니다: {reason}")
+        job_ids = queue.enqueue(
+            dict(k=edition_args.k, **flags), author_key(edition_args.k), queue_args.count
+        )
+        print(f"job {len(job_ids)}개 등록 완료 (ID {job_ids[0]} ~ {job_ids[-1]})")
+    elif queue_args.command == "run":
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(rest_argv, queue_args))
+            for _ in range(queue_args.workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        print(f"worker 종료, job 현황: {queue.summary}")
+    else:
+        print(f"job 현황: {queue.summary}")